@@ -0,0 +1,81 @@
+"""
+Runs benchmarks on synthetic data, no cluster is needed.
+
+Results are written as JSON, with --baseline they are compared to earlier results
+and the run fails when any of them is slower than the threshold allows.
+
+Usage:
+    python -m benchmarks --output results.json
+    python -m benchmarks --baseline results.json --threshold 10
+    python -m benchmarks --quick --only comparison transport
+"""
+import argparse
+import importlib
+import logging
+import sys
+
+from kiali_qe.utils.log import logger
+
+from benchmarks.common import compare, load_results, save_results
+
+BENCHMARKS = ('kiali_client', 'openshift_client', 'comparison', 'transport', 'entity_memory')
+
+
+def _print_result(item):
+    print('{:<36} {:<44} {:>12} {}'.format(
+        item['name'], ' '.join('{}:{}'.format(_k, _v) for _k, _v in item['params'].items()),
+        item['value'], item['unit']))
+
+
+def run(names=BENCHMARKS, quick=False):
+    """Returns list of results of given benchmark modules.
+    Args:
+        names: benchmark module names
+        quick: run smaller sizes of each benchmark
+    """
+    _results = []
+    for _name in names:
+        _module = importlib.import_module('benchmarks.{}'.format(_name))
+        for _result in (_module.run(_module.QUICK_SIZES) if quick else _module.run()):
+            _print_result(_result)
+            _results.append(_result)
+    return _results
+
+
+def report(results, baseline, threshold):
+    """ Prints comparison of results with baseline, returns number of regressions """
+    _regressions = 0
+    print('\nCompared with baseline, threshold {}%:'.format(threshold))
+    for _item, _base, _change, _regressed in compare(results, baseline, threshold):
+        _regressions += int(_regressed)
+        print('{:<10} {:<36} {:<44} {:>12} -> {:>12} {:>+8}%'.format(
+            'REGRESSION' if _regressed else 'ok', _item['name'],
+            ' '.join('{}:{}'.format(_k, _v) for _k, _v in _item['params'].items()),
+            _base, _item['value'], _change))
+    return _regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--only', nargs='+', choices=BENCHMARKS, default=list(BENCHMARKS),
+                        help='benchmarks to run')
+    parser.add_argument('--quick', action='store_true', help='run smaller sizes')
+    parser.add_argument('--output', help='file to write JSON results to')
+    parser.add_argument('--baseline', help='JSON results to compare with')
+    parser.add_argument('--threshold', type=float, default=10.0,
+                        help='allowed slowdown against baseline in percent')
+    args = parser.parse_args()
+    # clients log every created connection, keep the output for results
+    logger.setLevel(logging.INFO)
+    _results = run(args.only, quick=args.quick)
+    if args.output:
+        save_results(args.output, _results)
+    if args.baseline:
+        _regressions = report(_results, load_results(args.baseline), args.threshold)
+        if _regressions:
+            print('{} benchmark(s) regressed more than {}%'.format(_regressions, args.threshold))
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
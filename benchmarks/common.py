@@ -0,0 +1,81 @@
+import gc
+import json
+import platform
+import time
+
+from datetime import datetime
+
+RESULTS_VERSION = 1
+
+
+def result(name, params, value, unit):
+    """Returns benchmark result, lower value is always better.
+    Args:
+        name: dotted benchmark name, module first
+        params: dict of benchmark parameters, part of the result identity
+        value: measured value
+        unit: unit of the value
+    """
+    return {'name': name, 'params': params, 'value': value, 'unit': unit}
+
+
+def result_key(item):
+    """ Returns hashable identity of result, its name and parameters """
+    return (item['name'], json.dumps(item['params'], sort_keys=True))
+
+
+def best_of(func, repeat=3):
+    """Returns the fastest of repeat runs of func in seconds.
+    Args:
+        func: function without arguments
+        repeat: number of runs
+    """
+    _best = None
+    for _ in range(max(int(repeat), 1)):
+        gc.collect()
+        _start = time.perf_counter()
+        func()
+        _elapsed = time.perf_counter() - _start
+        if _best is None or _elapsed < _best:
+            _best = _elapsed
+    return _best
+
+
+def per_item(seconds, items):
+    """ Returns time per item in microseconds """
+    return round(seconds * 1000000 / max(items, 1), 3)
+
+
+def save_results(path, results):
+    _data = {'version': RESULTS_VERSION,
+             'created': datetime.now().isoformat(timespec='seconds'),
+             'python': platform.python_version(),
+             'machine': platform.machine(),
+             'results': results}
+    with open(path, 'w') as _file:
+        json.dump(_data, _file, indent=2)
+
+
+def load_results(path):
+    with open(path) as _file:
+        return json.load(_file)['results']
+
+
+def compare(results, baseline, threshold=10.0):
+    """Returns list of (result, baseline value, change in percent, regressed) of results
+    present in baseline.
+    Args:
+        results: current results
+        baseline: baseline results
+        threshold: allowed slowdown in percent before the result counts as regression
+    """
+    _baseline = {result_key(_item): _item['value'] for _item in baseline}
+    _compared = []
+    for _item in results:
+        _key = result_key(_item)
+        if _key not in _baseline:
+            continue
+        _base = _baseline[_key]
+        _change = ((_item['value'] - _base) * 100.0 / _base) if _base else 0.0
+        _compared.append((_item, _base, round(_change, 1), _change > threshold))
+    return _compared
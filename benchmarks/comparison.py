@@ -0,0 +1,112 @@
+"""
+Comparison utilities used by list page assertions.
+
+Measures kiali_qe.utils is_equal on entity lists, dict_contains on label filters
+and to_linear_string on config yaml sized sources.
+
+Usage: python -m benchmarks.comparison [--items 1000 10000]
+"""
+import argparse
+import random
+
+from kiali_qe.components.enums import HealthType
+from kiali_qe.entities.service import Service
+from kiali_qe.entities.workload import Workload
+from kiali_qe.utils import dict_contains, is_equal, to_linear_string
+
+from benchmarks.common import best_of, per_item, result
+
+SIZES = (1000, 10000)
+QUICK_SIZES = (1000,)
+NAMESPACES = 100
+SEED = 0
+
+
+def _services(count):
+    return [Service('service-{}'.format(_i), 'namespace-{}'.format(_i % NAMESPACES),
+                    istio_sidecar=True, health=HealthType.HEALTHY,
+                    labels={'app': 'app-{}'.format(_i), 'version': 'v{}'.format(_i % 3)})
+            for _i in range(count)]
+
+
+def _workloads(count):
+    return [Workload('workload-{}'.format(_i), 'namespace-{}'.format(_i % NAMESPACES),
+                     'Deployment', istio_sidecar=True,
+                     labels={'app': 'app-{}'.format(_i), 'version': 'v{}'.format(_i % 3)})
+            for _i in range(count)]
+
+
+def _shuffled(items):
+    _items = list(items)
+    random.Random(SEED).shuffle(_items)
+    return _items
+
+
+def _label_filters(count):
+    _random = random.Random(SEED)
+    return [['app:app-{}'.format(_random.randrange(count)), 'version', 'missing:value']
+            for _ in range(count)]
+
+
+def _config_source(index):
+    return {'apiVersion': 'networking.istio.io/v1alpha3', 'kind': 'VirtualService',
+            'metadata': {'name': 'config-{}'.format(index), 'namespace': 'bookinfo'},
+            'spec': {'hosts': ['reviews'],
+                     'http': [{'route': [{'destination': {'host': 'reviews',
+                                                          'subset': 'v{}'.format(_v)},
+                                          'weight': 25}] for _v in range(4)}]}}
+
+
+def measure_is_equal(count, repeat=3):
+    _results = []
+    for _name, _create in (('service', _services), ('workload', _workloads)):
+        _left = _create(count)
+        _right = _shuffled(_create(count))
+        _seconds = best_of(lambda: is_equal(_left, _right), repeat)
+        _results.append(result('comparison.is_equal.{}'.format(_name), {'items': count},
+                               per_item(_seconds, count), 'us/item'))
+    return _results
+
+
+def measure_dict_contains(count, repeat=3):
+    _labels = [{'app': 'app-{}'.format(_i), 'version': 'v{}'.format(_i % 3)}
+               for _i in range(count)]
+    _filters = _label_filters(count)
+
+    def _filter():
+        for _item_labels, _filter_list in zip(_labels, _filters):
+            dict_contains(_item_labels, _filter_list)
+            dict_contains(_item_labels, _filter_list, contains_all=True)
+    _seconds = best_of(_filter, repeat)
+    return result('comparison.dict_contains', {'items': count},
+                  per_item(_seconds, count), 'us/item')
+
+
+def measure_to_linear_string(count, repeat=3):
+    _sources = [_config_source(_i) for _i in range(count)]
+    _seconds = best_of(lambda: [to_linear_string(_source) for _source in _sources], repeat)
+    return result('comparison.to_linear_string', {'items': count},
+                  per_item(_seconds, count), 'us/item')
+
+
+def run(sizes=SIZES, repeat=3):
+    """ Returns list of measure results of all comparison utilities for given sizes """
+    _results = []
+    for _count in sizes:
+        _results.extend(measure_is_equal(_count, repeat))
+        _results.append(measure_dict_contains(_count, repeat))
+        _results.append(measure_to_linear_string(_count, repeat))
+    return _results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--items', type=int, nargs='+', default=list(SIZES))
+    args = parser.parse_args()
+    for _result in run(args.items):
+        print('{:<34} items:{:<8} {:>10} {}'.format(
+            _result['name'], _result['params']['items'], _result['value'], _result['unit']))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""
+Memory footprint of list page entities.
+
+Builds UI, REST and OC copies of synthetic Service, Workload, Application and IstioConfig
+lists, as assert_all_items keeps them, and reports allocated bytes per item.
+
+Usage: python -m benchmarks.entity_memory [--items 10000 100000]
+"""
+import argparse
+import gc
+import tracemalloc
+
+from kiali_qe.components.enums import HealthType
+from kiali_qe.entities.applications import Application
+from kiali_qe.entities.istio_config import IstioConfig
+from kiali_qe.entities.service import Service
+from kiali_qe.entities.workload import Workload
+
+from benchmarks.common import result
+
+SIZES = (10000, 100000)
+QUICK_SIZES = (10000,)
+SOURCES = ('UI', 'REST', 'OC')
+NAMESPACES = 100
+APPS_PER_NAMESPACE = 20
+
+
+def _text(value):
+    # every source parses its own copy of the strings, do not let literals be shared
+    return ''.join(list(value))
+
+
+def _labels(index):
+    return {_text('app'): _text('app-{}'.format(index % APPS_PER_NAMESPACE)),
+            _text('version'): _text('v{}'.format(index % 3 + 1))}
+
+
+def _create_items(entity, count):
+    _items = []
+    for _index in range(count):
+        _name = _text('{}-{}'.format(entity, _index))
+        _namespace = _text('namespace-{}'.format(_index % NAMESPACES))
+        if entity == 'service':
+            _items.append(Service(_name, _namespace, istio_sidecar=True,
+                                  labels=_labels(_index), health=HealthType.HEALTHY))
+        elif entity == 'workload':
+            _items.append(Workload(_name, _namespace, _text('Deployment'), istio_sidecar=True,
+                                   labels=_labels(_index), health=HealthType.HEALTHY))
+        elif entity == 'application':
+            _items.append(Application(_name, _namespace, istio_sidecar=True,
+                                      labels=_labels(_index), health=HealthType.HEALTHY))
+        else:
+            _items.append(IstioConfig(_name, _namespace, _text('VirtualService')))
+    return _items
+
+
+def measure(entity, count):
+    """Returns dict with allocated bytes of UI, REST and OC copies of count items.
+    Args:
+        entity: one of service, workload, application, istio_config
+        count: number of items in each copy
+    """
+    gc.collect()
+    tracemalloc.start()
+    _before = tracemalloc.get_traced_memory()[0]
+    _copies = [_create_items(entity, count) for _ in SOURCES]
+    gc.collect()
+    _total = tracemalloc.get_traced_memory()[0] - _before
+    tracemalloc.stop()
+    del _copies
+    return result('entity_memory.{}'.format(entity),
+                  {'items': count, 'copies': len(SOURCES)},
+                  round(float(_total) / (count * len(SOURCES)), 1), 'bytes/item')
+
+
+def run(sizes=SIZES):
+    """ Returns list of measure results of all entities for given sizes """
+    _results = []
+    for _count in sizes:
+        for _entity in ('service', 'workload', 'application', 'istio_config'):
+            _results.append(measure(_entity, _count))
+    return _results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--items', type=int, nargs='+', default=list(SIZES))
+    args = parser.parse_args()
+    for _result in run(args.items):
+        print('{:<34} items:{:<8} {:>10} {}'.format(
+            _result['name'], _result['params']['items'], _result['value'], _result['unit']))
+
+
+if __name__ == '__main__':
+    main()
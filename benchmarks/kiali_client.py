@@ -0,0 +1,77 @@
+"""
+Throughput of KialiExtendedClient list methods.
+
+Runs the client against local KialiStandInServer with SyntheticMesh of given number
+of namespaces and reports the time per listed item.
+
+Usage: python -m benchmarks.kiali_client [--namespaces 10 100 1000]
+"""
+import argparse
+
+from kiali_qe.components.enums import OverviewPageType
+from kiali_qe.rest.kiali_api import KialiExtendedClient
+from kiali_qe.rest.standin import KialiStandInServer
+from kiali_qe.rest.synthetic import SyntheticMesh
+from kiali_qe.rest.transport import KialiTransport
+
+from benchmarks.common import best_of, per_item, result
+
+SIZES = (10, 100, 1000)
+QUICK_SIZES = (10, 100)
+APPS = 5
+VERSIONS = 2
+
+LIST_METHODS = {
+    'service_list': lambda client: client.service_list(),
+    'application_list': lambda client: client.application_list(),
+    'workload_list': lambda client: client.workload_list(),
+    'istio_config_list': lambda client: client.istio_config_list(),
+    'overview_list': lambda client: client.overview_list(
+        overview_type=OverviewPageType.APPS),
+}
+
+
+def create_client(server):
+    """ Returns KialiExtendedClient of the stand-in server, as configured for the tests """
+    return KialiExtendedClient(hostname=server.hostname,
+                               scheme='http',
+                               auth_type='no-auth',
+                               swagger_address=server.swagger_address,
+                               bulk_health=True,
+                               transport=KialiTransport())
+
+
+def measure(client, method, namespaces, repeat=3):
+    _items = len(LIST_METHODS[method](client))
+    _seconds = best_of(lambda: LIST_METHODS[method](client), repeat)
+    return result('kiali_client.{}'.format(method),
+                  {'namespaces': namespaces, 'apps': APPS, 'versions': VERSIONS},
+                  per_item(_seconds, _items), 'us/item')
+
+
+def run(sizes=SIZES, repeat=3):
+    """ Returns list of measure results of all list methods for given namespace counts """
+    _results = []
+    for _namespaces in sizes:
+        _mesh = SyntheticMesh(namespaces=_namespaces, apps=APPS, versions=VERSIONS)
+        with KialiStandInServer(mesh=_mesh) as _server:
+            _client = create_client(_server)
+            for _method in LIST_METHODS:
+                _results.append(measure(_client, _method, _namespaces,
+                                        repeat=1 if _namespaces >= 1000 else repeat))
+            _client.transport.close()
+    return _results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--namespaces', type=int, nargs='+', default=list(SIZES))
+    args = parser.parse_args()
+    for _result in run(args.namespaces):
+        print('{:<34} namespaces:{:<6} {:>10} {}'.format(
+            _result['name'], _result['params']['namespaces'], _result['value'],
+            _result['unit']))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""
+De-duplication of OpenshiftExtendedClient workload and application lists.
+
+Runs the client against synthetic cluster, see benchmarks.synthetic, and reports
+the time per listed item. Cluster responses are prepared upfront, only the client
+side processing is measured.
+
+Usage: python -m benchmarks.openshift_client [--namespaces 10 100 1000]
+"""
+import argparse
+
+from benchmarks.common import best_of, per_item, result
+from benchmarks.synthetic import create_cluster, create_openshift_client
+
+SIZES = (10, 100, 1000)
+QUICK_SIZES = (10, 100)
+APPS = 5
+VERSIONS = 2
+
+LIST_METHODS = {
+    'workload_list': lambda client: client.workload_list(),
+    'application_list': lambda client: list(client.application_list()),
+}
+
+
+def measure(client, method, namespaces, repeat=3):
+    _items = len(LIST_METHODS[method](client))
+    _seconds = best_of(lambda: LIST_METHODS[method](client), repeat)
+    return result('openshift_client.{}'.format(method),
+                  {'namespaces': namespaces, 'apps': APPS, 'versions': VERSIONS},
+                  per_item(_seconds, _items), 'us/item')
+
+
+def run(sizes=SIZES, repeat=3):
+    """ Returns list of measure results of all list methods for given namespace counts """
+    _results = []
+    for _namespaces in sizes:
+        _client = create_openshift_client(
+            create_cluster(namespaces=_namespaces, apps=APPS, versions=VERSIONS))
+        for _method in LIST_METHODS:
+            _results.append(measure(_client, _method, _namespaces,
+                                    repeat=1 if _namespaces >= 1000 else repeat))
+    return _results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--namespaces', type=int, nargs='+', default=list(SIZES))
+    args = parser.parse_args()
+    for _result in run(args.namespaces):
+        print('{:<34} namespaces:{:<6} {:>10} {}'.format(
+            _result['name'], _result['params']['namespaces'], _result['value'],
+            _result['unit']))
+
+
+if __name__ == '__main__':
+    main()
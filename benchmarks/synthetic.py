@@ -0,0 +1,103 @@
+"""
+Synthetic OpenShift cluster served through a fake dynamic client,
+for running OpenshiftExtendedClient without cluster.
+"""
+from unittest import mock
+
+from kubernetes.client.rest import ApiException
+from kubernetes.dynamic.resource import ResourceInstance
+from openshift.dynamic.exceptions import NotFoundError
+
+from kiali_qe.rest import openshift_api
+from kiali_qe.rest.openshift_api import OpenshiftExtendedClient
+from kiali_qe.rest.synthetic import SyntheticMesh
+
+
+def create_cluster(namespaces=10, apps=10, versions=2, pods=2, seed=0):
+    """Returns dict of kind to list of k8s object dicts of SyntheticMesh.
+    Args:
+        namespaces: number of namespaces
+        apps: number of applications per namespace
+        versions: number of workloads per application
+        pods: number of pods per workload
+        seed: random seed of the mesh
+    """
+    _mesh = SyntheticMesh(namespaces=namespaces, apps=apps, versions=versions, pods=pods,
+                          seed=seed)
+    _cluster = {}
+    for _namespace in _mesh.namespaces:
+        for _object in _mesh.k8s_objects(_namespace):
+            _cluster.setdefault(_object['kind'], []).append(_object)
+    return _cluster
+
+
+class SyntheticResource(object):
+    """
+    Dynamic client resource answering get calls from synthetic objects.
+    Responses are parsed once and reused, calls measure the client side only.
+
+    Args:
+        kind: resource kind
+        items: list of k8s object dicts of the kind
+    """
+
+    def __init__(self, kind, items):
+        self.kind = kind
+        self._items = items
+        self._namespaces = {}
+        self._names = {}
+        for _item in items:
+            _namespace = _item['metadata'].get('namespace')
+            self._namespaces.setdefault(_namespace, []).append(_item)
+            self._names[(_namespace, _item['metadata']['name'])] = _item
+        self._lists = {}
+        self._instances = {}
+
+    def __repr__(self):
+        return "{}({}, items={})".format(type(self).__name__, self.kind, len(self._items))
+
+    def _list(self, namespace):
+        if namespace not in self._lists:
+            self._lists[namespace] = ResourceInstance(None, {
+                'kind': '{}List'.format(self.kind), 'apiVersion': 'v1',
+                'items': self._items if namespace is None
+                else self._namespaces.get(namespace, [])})
+        return self._lists[namespace]
+
+    def get(self, name=None, namespace=None, **kwargs):
+        if name is None:
+            return self._list(namespace)
+        if (namespace, name) not in self._names:
+            raise NotFoundError(ApiException(status=404, reason='Not Found'))
+        if (namespace, name) not in self._instances:
+            self._instances[(namespace, name)] = ResourceInstance(
+                None, self._names[(namespace, name)])
+        return self._instances[(namespace, name)]
+
+
+class SyntheticDynamicClient(object):
+    """
+    Dynamic client of synthetic cluster, unknown kinds have no objects.
+
+    Args:
+        cluster: dict of kind to list of k8s object dicts, see create_cluster
+    """
+
+    def __init__(self, cluster):
+        self.cluster = cluster
+        self.version = {'kubernetes': {'gitVersion': 'synthetic'}}
+        self.resources = self
+        self._resources = {}
+
+    def get(self, kind, api_version='v1', **kwargs):
+        if kind not in self._resources:
+            self._resources[kind] = SyntheticResource(kind, self.cluster.get(kind, []))
+        return self._resources[kind]
+
+
+def create_openshift_client(cluster):
+    """ Returns OpenshiftExtendedClient of synthetic cluster, see create_cluster """
+    with mock.patch.object(openshift_api.config, 'new_client_from_config'), \
+            mock.patch.object(openshift_api, 'DynamicClient',
+                              return_value=SyntheticDynamicClient(cluster)):
+        return OpenshiftExtendedClient()
@@ -0,0 +1,94 @@
+"""
+Request overhead of Kiali REST client with and without KialiTransport.
+
+Sends sequential getStatus requests to local KialiStandInServer over https with
+self-signed certificate, once with a new session, hence a new TLS handshake,
+per request as kiali-client does, once through pooled keep-alive session.
+
+Usage: python -m benchmarks.transport [--requests 200]
+"""
+import argparse
+import os
+import shutil
+import ssl
+import subprocess
+import tempfile
+import urllib3
+
+from kiali_qe.rest.kiali_api import KialiExtendedClient
+from kiali_qe.rest.standin import KialiStandInServer
+from kiali_qe.rest.synthetic import SyntheticMesh
+from kiali_qe.rest.transport import KialiTransport
+
+from benchmarks.common import best_of, result
+
+SIZES = (200,)
+QUICK_SIZES = (50,)
+
+
+def self_signed_context():
+    """ Returns server side ssl.SSLContext with certificate generated by openssl """
+    _directory = tempfile.mkdtemp(prefix='kiali-standin-')
+    _cert = os.path.join(_directory, 'cert.pem')
+    _key = os.path.join(_directory, 'key.pem')
+    try:
+        subprocess.run(['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes',
+                        '-keyout', _key, '-out', _cert, '-days', '1', '-subj', '/CN=127.0.0.1'],
+                       check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        _context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        _context.load_cert_chain(_cert, _key)
+    finally:
+        shutil.rmtree(_directory)
+    return _context
+
+
+def _client(server, swagger, transport):
+    return KialiExtendedClient(hostname=server.hostname,
+                               scheme=server.scheme,
+                               verify=False,
+                               auth_type='no-auth',
+                               swagger_address=swagger.swagger_address,
+                               transport=transport)
+
+
+def measure(server, swagger, transport, count, repeat=3):
+    _kiali = _client(server, swagger, transport)
+
+    def _send():
+        for _ in range(count):
+            _kiali.get_response('getStatus')
+    _seconds = best_of(_send, repeat)
+    if transport is not None:
+        transport.close()
+    return result('transport.{}'.format('pooled' if transport else 'session_per_request'),
+                  {'requests': count, 'scheme': server.scheme},
+                  round(_seconds * 1000 / count, 3), 'ms/request')
+
+
+def run(sizes=SIZES, repeat=3):
+    """ Returns list of measure results with and without transport for given request counts """
+    # certificate is not verified, as by the tests against Kiali
+    urllib3.disable_warnings(category=urllib3.exceptions.InsecureRequestWarning)
+    _results = []
+    _mesh = SyntheticMesh(namespaces=1, apps=1)
+    # kiali-client fetches swagger with verification, from the plain http stand-in
+    with KialiStandInServer(mesh=_mesh) as _swagger, \
+            KialiStandInServer(mesh=_mesh, ssl_context=self_signed_context()) as _server:
+        for _count in sizes:
+            _results.append(measure(_server, _swagger, None, _count, repeat))
+            _results.append(measure(_server, _swagger, KialiTransport(), _count, repeat))
+    return _results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, nargs='+', default=list(SIZES))
+    args = parser.parse_args()
+    for _result in run(args.requests):
+        print('{:<34} requests:{:<6} {:>10} {}'.format(
+            _result['name'], _result['params']['requests'], _result['value'],
+            _result['unit']))
+
+
+if __name__ == '__main__':
+    main()
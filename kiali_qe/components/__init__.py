@@ -3,7 +3,11 @@ import re
 
 from widgetastic.widget import Checkbox, TextInput, Widget, Text
 from selenium.webdriver.common.keys import Keys
-from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    StaleElementReferenceException,
+    WebDriverException
+)
 from kiali_qe.components.enums import (
     HelpMenuEnum,
     ApplicationVersionEnum,
@@ -55,8 +59,8 @@ from kiali_qe.entities.applications import (
     ApplicationHealth
 )
 from kiali_qe.entities.overview import Overview
-from time import sleep
 from kiali_qe.utils.log import logger
+from kiali_qe.utils.conf import env as cfg
 from wait_for import wait_for
 from kiali_qe.utils import (
     get_validation,
@@ -89,6 +93,145 @@ def wait_to_spinner_disappear(browser, timeout='20s', very_quiet=True, silent_fa
 
 POPOVER = './/*[contains(@class, "tippy-popper")]'
 
+TOAST_NOTIFICATIONS = '//ul[contains(@class, "pf-c-alert-group")]//li'
+
+
+def get_wait_timeout(name, default):
+    """ Returns the timeout of named wait from selenium.waits configuration """
+    return cfg.selenium.waits[name] or default
+
+
+def wait_displayed_element(browser, locator, parent='/', timeout=None):
+    """Waits until an element of locator is displayed, e.g. a tooltip popover.
+    Does not fail on timeout, the following lookup of the element does.
+    """
+    wait_for(
+        lambda: len(browser.elements(locator=locator, parent=parent,
+                                     check_visibility=True)) > 0,
+        timeout=timeout or get_wait_timeout('tooltip', 3),
+        delay=0.1, very_quiet=True, silent_failure=True)
+
+
+def wait_not_displayed_element(browser, locator=POPOVER, parent='/', timeout=None):
+    """Waits until no element of locator is displayed, e.g. a closed tooltip popover.
+    Does not fail on timeout.
+    """
+    wait_for(
+        lambda: len(browser.elements(locator=locator, parent=parent,
+                                     check_visibility=True)) == 0,
+        timeout=timeout or get_wait_timeout('tooltip_close', 2),
+        delay=0.1, very_quiet=True, silent_failure=True)
+
+
+def wait_notifications_disappear(browser, timeout=None):
+    """ Waits until toast notifications, which can block buttons, disappear """
+    wait_not_displayed_element(browser, locator=TOAST_NOTIFICATIONS,
+                               timeout=timeout or get_wait_timeout('notifications', 10))
+
+
+def wait_document_ready(browser, timeout=None):
+    wait_for(
+        lambda: browser.execute_script('return document.readyState;') == 'complete',
+        timeout=timeout or get_wait_timeout('document_ready', 20),
+        delay=0.1, very_quiet=True, silent_failure=True)
+
+
+def wait_count_stable(browser, locator, parent='/', timeout=None, polls=3):
+    """Waits until the number of elements of locator, e.g. list rows,
+    stays the same in given number of consecutive polls.
+    Does not fail on timeout.
+    """
+    _counts = []
+
+    def _is_stable():
+        _counts.append(len(browser.elements(locator=locator, parent=parent)))
+        return len(_counts) >= polls and len(set(_counts[-polls:])) == 1
+    wait_for(
+        _is_stable,
+        timeout=timeout or get_wait_timeout('count_stable', 5),
+        delay=0.1, very_quiet=True, silent_failure=True)
+
+
+# health icon classes in the order of priority
+HEALTH_ICON_CLASSES = [
+    ('icon-healthy', HealthType.HEALTHY),
+    ('icon-failure', HealthType.FAILURE),
+    ('icon-degraded', HealthType.DEGRADED),
+    ('icon-idle', HealthType.IDLE),
+    ('icon-na', HealthType.NA)
+]
+
+# health icon svg path prefixes in the order of priority, used in tabs
+HEALTH_ICON_PATHS = [
+    ('M504', HealthType.HEALTHY),
+    ('M512', HealthType.FAILURE),
+    ('M569', HealthType.DEGRADED),
+    ('M520', HealthType.NA)
+]
+
+# returns given attribute of all the elements matching the css selector under the element
+# arguments: element, css selector, attribute name
+ICON_ATTRIBUTES_SCRIPT = """
+var attribute = arguments[2];
+return Array.prototype.map.call(arguments[0].querySelectorAll(arguments[1]), function (el) {
+    return el.getAttribute(attribute) || '';
+});
+"""
+
+# reads all the list rows in one call, the same data as ListView*.items read per element
+# arguments: root element, rows xpath, API icon title, missing sidecar text, health classes
+LIST_ROWS_SCRIPT = """
+var root = arguments[0], rowsXpath = arguments[1], apiTitle = arguments[2],
+    missingSidecar = arguments[3], healthClasses = arguments[4];
+function text(el) {
+    return el ? (el.innerText || el.textContent || '').trim() : '';
+}
+function has(el, selector) {
+    return el.querySelector(selector) !== null;
+}
+function ownText(el) {
+    for (var k = 0; k < el.childNodes.length; k++) {
+        if (el.childNodes[k].nodeType === Node.TEXT_NODE) {
+            return el.childNodes[k].nodeValue.replace(/\\s+/g, ' ').trim();
+        }
+    }
+    return '';
+}
+var rows = document.evaluate(rowsXpath, root, null,
+                             XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+var result = [];
+for (var i = 0; i < rows.snapshotLength; i++) {
+    var row = rows.snapshotItem(i);
+    var cols = [];
+    var tds = row.getElementsByTagName('td');
+    for (var j = 0; j < tds.length; j++) {
+        var td = tds[j];
+        var link = td.querySelector('[class*="virtualitem_definition_link"]');
+        var anchor = td.querySelector('a');
+        cols.push({
+            text: text(td),
+            link: link ? text(link) : null,
+            href: anchor ? anchor.href : null,
+            badges: Array.prototype.map.call(td.querySelectorAll('[class*="pf-c-badge"]'), text),
+            valid: has(td, '[style*="color: rgb(62, 134, 53)"]'),
+            not_valid: has(td, '[style*="danger"]'),
+            warning: has(td, '[style*="warning"]')
+        });
+    }
+    result.push({
+        cols: cols,
+        missing_sidecar: Array.prototype.some.call(row.querySelectorAll('span'), function (el) {
+            return ownText(el) === missingSidecar;
+        }),
+        health: healthClasses.filter(function (c) {
+            return has(row, '[class*="' + c + '"]');
+        }),
+        api_icon: has(row, 'img[title*="' + apiTitle + '"]')
+    });
+}
+return result;
+"""
+
 
 class Button(Widget):
     ROOT = '//button'
@@ -1962,7 +2105,7 @@ class NavBar(Widget):
         statuses = {}
         try:
             self.browser.move_to_element(locator=self.NAVBAR_MASTHEAD, parent=self.ROOT)
-            sleep(0.5)
+            wait_displayed_element(self.browser, POPOVER)
             masthead_items = self.browser.elements(
                 locator=POPOVER + '//ul//div[contains(@class, "pf-m-gutter")]',
                 parent='/')
@@ -1974,7 +2117,7 @@ class NavBar(Widget):
             pass
         finally:
             self.browser.send_keys_to_focused_element(Keys.ESCAPE)
-            sleep(0.5)
+            wait_not_displayed_element(self.browser)
             return statuses
 
 
@@ -2120,7 +2263,7 @@ class ViewAbstract(Widget):
         result = []
         try:
             self.browser.move_to_element(locator='.//svg/path', parent=element)
-            sleep(1.5)
+            wait_displayed_element(self.browser, POPOVER)
             _texts = self.browser.element(
                 locator=(POPOVER),
                 parent='/').text.split('\n')
@@ -2131,7 +2274,7 @@ class ViewAbstract(Widget):
             pass
         finally:
             self.browser.send_keys_to_focused_element(Keys.ESCAPE)
-            sleep(0.5)
+            wait_not_displayed_element(self.browser)
             return result
 
     def click_more_labels(self, parent):
@@ -2178,34 +2321,24 @@ class ViewAbstract(Widget):
         return not len(self.browser.elements(
                 parent=element, locator=self.MISSING_ICON_SIDECAR)) > 0
 
+    def _health_from_icons(self, values, icons=HEALTH_ICON_CLASSES):
+        """Returns HealthType of the highest priority icon found in values.
+        Args:
+            values: icon attribute values, e.g. class names
+            icons: list of (attribute value part, HealthType) in the order of priority
+        """
+        for _icon, _health in icons:
+            for _value in values:
+                if _icon in _value:
+                    return _health
+        return None
+
     def _get_item_health(self, element):
-        _healthy = len(self.browser.elements(
-            parent=element,
-            locator='.//*[contains(@class, "icon-healthy")]')) > 0
-        _not_healthy = len(self.browser.elements(
-            parent=element,
-            locator='.//*[contains(@class, "icon-failure")]')) > 0
-        _degraded = len(self.browser.elements(
-            parent=element,
-            locator='.//*[contains(@class, "icon-degraded")]')) > 0
-        _idle = len(self.browser.elements(
-            parent=element,
-            locator='.//*[contains(@class, "icon-idle")]')) > 0
-        _not_available = len(self.browser.elements(
-            parent=element,
-            locator='.//*[contains(@class, "icon-na")]')) > 0
-        _health = None
-        if _healthy:
-            _health = HealthType.HEALTHY
-        elif _not_healthy:
-            _health = HealthType.FAILURE
-        elif _degraded:
-            _health = HealthType.DEGRADED
-        elif _idle:
-            _health = HealthType.IDLE
-        elif _not_available:
-            _health = HealthType.NA
-        return _health
+        """ Returns HealthType of the health icon under element, reads all icons in one call """
+        return self._health_from_icons(
+            self.browser.execute_script(
+                ICON_ATTRIBUTES_SCRIPT, element, '[class*="icon-"]', 'class'),
+            HEALTH_ICON_CLASSES)
 
 
 class ListViewAbstract(ViewAbstract):
@@ -2245,6 +2378,8 @@ class ListViewAbstract(ViewAbstract):
     CONFIG_TABS_PARENT = './/ul[contains(@class, "pf-c-tabs__list")]'
     CONFIG_TAB_OVERVIEW = './/button[@id="pf-tab-0-basic-tabs"]'
     GRAPH_OVERVIEW_MENU = GRAPH_ROOT + '//button'
+    REQUEST_STATUSES = ('.//*[contains(text(), "Pod Status") or '
+                        'contains(text(), "Traffic Status")]/../..')
 
     def __init__(self, parent, locator=None, logger=None):
         Widget.__init__(self, parent, logger=logger)
@@ -2265,7 +2400,35 @@ class ListViewAbstract(ViewAbstract):
         return self.browser.is_displayed(self.ROOT)
 
     def _item_namespace(self, cell):
-        return cell.text.replace('NS', '').strip()
+        return self._namespace_from_text(cell.text)
+
+    def _namespace_from_text(self, text):
+        return text.replace('NS', '').strip()
+
+    def _get_rows_data(self):
+        """Returns data of all the list rows read by one script call,
+        None when batched extraction is disabled or the script fails.
+        """
+        if not cfg.selenium.batched_extraction:
+            return None
+        try:
+            return self.browser.execute_script(
+                LIST_ROWS_SCRIPT, self, self.ITEMS,
+                ItemIconType.API_DOCUMENTATION.text, self.MISSING_SIDECAR_TEXT,
+                [_class for _class, _health in HEALTH_ICON_CLASSES])
+        except (WebDriverException, NoSuchElementException) as e:
+            logger.debug('Batched extraction failed, reading items by elements: {}'.format(e))
+            return None
+
+    def _row_validation(self, cols):
+        return get_validation(any(_col['valid'] for _col in cols),
+                              any(_col['not_valid'] for _col in cols),
+                              any(_col['warning'] for _col in cols))
+
+    def _row_columns(self, index):
+        """ Returns column elements of the row, used for tooltips in batched extraction """
+        return self.browser.elements(
+            self.ITEM_COL, parent=self.browser.elements(self.ITEMS, parent=self)[index])
 
     def _get_service_endpoints(self, element):
         result = []
@@ -2277,35 +2440,8 @@ class ListViewAbstract(ViewAbstract):
         return result
 
     def _get_details_health(self):
-        _health_parent = self.browser.element(locator=self.NAME_PROPERTY,
-                                              parent=self.DETAILS_ROOT)
-        _healthy = len(self.browser.elements(
-            parent=_health_parent,
-            locator='.//*[contains(@class, "icon-healthy")]')) > 0
-        _not_healthy = len(self.browser.elements(
-            parent=_health_parent,
-            locator='.//*[contains(@class, "icon-failure")]')) > 0
-        _degraded = len(self.browser.elements(
-            parent=_health_parent,
-            locator='.//*[contains(@class, "icon-degraded")]')) > 0
-        _idle = len(self.browser.elements(
-            parent=_health_parent,
-            locator='.//*[contains(@class, "icon-idle")]')) > 0
-        _not_available = len(self.browser.elements(
-            parent=_health_parent,
-            locator='.//*[contains(@class, "icon-na")]')) > 0
-        _health = None
-        if _healthy:
-            _health = HealthType.HEALTHY
-        elif _not_healthy:
-            _health = HealthType.FAILURE
-        elif _degraded:
-            _health = HealthType.DEGRADED
-        elif _idle:
-            _health = HealthType.IDLE
-        elif _not_available:
-            _health = HealthType.NA
-        return _health
+        return self._get_item_health(self.browser.element(locator=self.NAME_PROPERTY,
+                                                          parent=self.DETAILS_ROOT))
 
     def _get_item_config_status(self, element):
         return ConfigurationStatus(
@@ -2362,14 +2498,14 @@ class ListViewAbstract(ViewAbstract):
         statuses = []
         try:
             self.browser.move_to_element(locator='.//*[contains(@class, "icon")]', parent=element)
-            sleep(0.5)
+            wait_displayed_element(self.browser, self.REQUEST_STATUSES, parent=self.locator)
             statuses = self._get_request_statuses()
         except (NoSuchElementException, StaleElementReferenceException):
             # skip errors caused by browser delays, this health will be ignored
             pass
         finally:
             self.browser.send_keys_to_focused_element(Keys.ESCAPE)
-            sleep(0.5)
+            wait_not_displayed_element(self.browser)
             return statuses
 
     def _get_additional_details_icon(self):
@@ -2410,8 +2546,7 @@ class ListViewAbstract(ViewAbstract):
     def _get_request_statuses(self):
         try:
             return self.browser.element(
-                locator=('.//*[contains(text(), "Pod Status") or ' +
-                         'contains(text(), "Traffic Status")]/../..'),
+                locator=self.REQUEST_STATUSES,
                 parent=self.locator).text.split('\n')
         except (NoSuchElementException, StaleElementReferenceException):
             return []
@@ -2521,7 +2656,7 @@ class ListViewAbstract(ViewAbstract):
                 try:
                     self.browser.move_to_element(
                         locator='.//*[contains(@style, "color")]', parent=columns[0])
-                    sleep(0.5)
+                    wait_displayed_element(self.browser, POPOVER)
                     message = self.browser.text(
                         locator=('.//*[contains(@class, "tippy-popper")]'),
                         parent='/').strip()
@@ -2530,7 +2665,7 @@ class ListViewAbstract(ViewAbstract):
                     pass
                 finally:
                     self.browser.send_keys_to_focused_element(Keys.ESCAPE)
-                    sleep(0.2)
+                    wait_not_displayed_element(self.browser)
             if message:
                 _messages.append(message)
         return _messages
@@ -2546,14 +2681,15 @@ class ListViewAbstract(ViewAbstract):
         return _label_keys
 
     def _get_item_labels(self, element):
-        _label_dict = {}
-        _labels = self.browser.elements(
+        return self._labels_from_texts(get_texts_of_elements(self.browser.elements(
             parent=element,
-            locator='.//*[contains(@class, "pf-c-badge")]')
-        if _labels:
-            for _label in _labels:
-                _label_key, _label_value = _label.text.split(':')
-                _label_dict[_label_key] = _label_value.strip()
+            locator='.//*[contains(@class, "pf-c-badge")]')))
+
+    def _labels_from_texts(self, texts):
+        _label_dict = {}
+        for _text in texts:
+            _label_key, _label_value = _text.split(':')
+            _label_dict[_label_key] = _label_value.strip()
         return _label_dict
 
     def _get_details_labels(self):
@@ -2584,7 +2720,7 @@ class ListViewAbstract(ViewAbstract):
             self.browser.move_to_element(
                 locator='.//div[contains(@class, "pf-c-card__body")]//div[@id="labels_info"]',
                 parent=element)
-            sleep(1.5)
+            wait_displayed_element(self.browser, POPOVER)
             labels_text = self.browser.element(
                 locator=(POPOVER),
                 parent='/').text
@@ -2597,7 +2733,7 @@ class ListViewAbstract(ViewAbstract):
             pass
         finally:
             self.browser.send_keys_to_focused_element(Keys.ESCAPE)
-            sleep(0.5)
+            wait_not_displayed_element(self.browser)
             return _label_dict
 
     def _get_details_selectors(self):
@@ -2660,6 +2796,7 @@ class ListViewAbstract(ViewAbstract):
     @property
     def all_items(self):
         self.browser.refresh()
+        wait_document_ready(self.browser)
         wait_displayed(self)
         wait_to_spinner_disappear(self.browser)
         return self.items
@@ -2868,6 +3005,25 @@ class ListViewApplications(ListViewAbstract):
 
     @property
     def items(self):
+        _rows = self._get_rows_data()
+        if _rows is None:
+            return self._items_by_elements()
+        _items = []
+        for index, _row in enumerate(_rows):
+            _cols = _row['cols']
+            _application = Application(
+                name=_cols[1]['link'], namespace=self._namespace_from_text(_cols[2]['text']),
+                istio_sidecar=not _row['missing_sidecar'],
+                health=self._health_from_icons(_row['health']),
+                application_status=(self._get_application_health(
+                    element=self._row_columns(index)[0])
+                                    if self._is_tooltip_visible(index=index,
+                                                                number=len(_rows)) else None),
+                labels=self._labels_from_texts(_cols[3]['badges']))
+            _items.append(_application)
+        return _items
+
+    def _items_by_elements(self):
         _items = []
         _elements = self.browser.elements(self.ITEMS, parent=self)
         for index, el in enumerate(_elements):
@@ -2963,6 +3119,28 @@ class ListViewWorkloads(ListViewAbstract):
 
     @property
     def items(self):
+        _rows = self._get_rows_data()
+        if _rows is None:
+            return self._items_by_elements()
+        _items = []
+        for index, _row in enumerate(_rows):
+            _cols = _row['cols']
+            _name = _cols[1]['link']
+            _workload = Workload(
+                name=_name, namespace=self._namespace_from_text(_cols[2]['text']),
+                workload_type=_cols[3]['text'],
+                istio_sidecar=not _row['missing_sidecar'],
+                labels=self._labels_from_texts(_cols[4]['badges']),
+                health=self._health_from_icons(_row['health']),
+                icon=ItemIconType.API_DOCUMENTATION if _row['api_icon'] else None,
+                workload_status=(self._get_workload_health(
+                    name=_name, element=self._row_columns(index)[0])
+                                 if self._is_tooltip_visible(index=index,
+                                                             number=len(_rows)) else None))
+            _items.append(_workload)
+        return _items
+
+    def _items_by_elements(self):
         _items = []
         _elements = self.browser.elements(self.ITEMS, parent=self)
         for index, el in enumerate(_elements):
@@ -3053,6 +3231,28 @@ class ListViewServices(ListViewAbstract):
 
     @property
     def items(self):
+        _rows = self._get_rows_data()
+        if _rows is None:
+            return self._items_by_elements()
+        _items = []
+        for index, _row in enumerate(_rows):
+            _cols = _row['cols']
+            _service = Service(
+                name=_cols[1]['link'],
+                namespace=self._namespace_from_text(_cols[2]['text']),
+                istio_sidecar=not _row['missing_sidecar'],
+                health=self._health_from_icons(_row['health']),
+                service_status=(self._get_service_health(element=self._row_columns(index)[0])
+                                if self._is_tooltip_visible(index=index,
+                                                            number=len(_rows)) else None),
+                icon=ItemIconType.API_DOCUMENTATION if _row['api_icon'] else None,
+                config_status=ConfigurationStatus(self._row_validation([_cols[4]]),
+                                                  _cols[4]['href']),
+                labels=self._labels_from_texts(_cols[3]['badges']))
+            _items.append(_service)
+        return _items
+
+    def _items_by_elements(self):
         _items = []
         _elements = self.browser.elements(self.ITEMS, parent=self)
         for index, el in enumerate(_elements):
@@ -3110,6 +3310,21 @@ class ListViewIstioConfig(ListViewAbstract):
 
     @property
     def items(self):
+        _rows = self._get_rows_data()
+        if _rows is None:
+            return self._items_by_elements()
+        _items = []
+        for _row in _rows:
+            _cols = _row['cols']
+            _config = IstioConfig(name=_cols[0]['link'],
+                                  namespace=self._namespace_from_text(_cols[1]['text']),
+                                  object_type=_cols[2]['text'],
+                                  validation=self._row_validation(_cols),
+                                  config_link=_cols[3]['href'])
+            _items.append(_config)
+        return _items
+
+    def _items_by_elements(self):
         _items = []
         for el in self.browser.elements(self.ITEMS, parent=self):
             # get rule name and namespace
@@ -3432,28 +3647,10 @@ class TabViewAbstract(ViewAbstract):
         return self.locator
 
     def _get_item_health(self, element):
-        _healthy = len(self.browser.elements(
-            parent=element,
-            locator='.//*[contains(@d, "M504")]')) > 0
-        _not_healthy = len(self.browser.elements(
-            parent=element,
-            locator='.//*[contains(@d, "M512")]')) > 0
-        _degraded = len(self.browser.elements(
-            parent=element,
-            locator='.//*[contains(@d, "M569")]')) > 0
-        _not_available = len(self.browser.elements(
-            parent=element,
-            locator='.//*[contains(@d, "M520")]')) > 0
-        _health = None
-        if _healthy:
-            _health = HealthType.HEALTHY
-        elif _not_healthy:
-            _health = HealthType.FAILURE
-        elif _degraded:
-            _health = HealthType.DEGRADED
-        elif _not_available:
-            _health = HealthType.NA
-        return _health
+        return self._health_from_icons(
+            self.browser.execute_script(
+                ICON_ATTRIBUTES_SCRIPT, element, '[d]', 'd'),
+            HEALTH_ICON_PATHS)
 
 
 class TrafficView(TabViewAbstract):
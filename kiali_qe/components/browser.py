@@ -1,15 +1,49 @@
+import functools
+
 from widgetastic.browser import Browser
 from selenium.common.exceptions import NoSuchElementException
 
 
+def _profiled(name):
+    """ Returns Browser method name, profiled when the browser has a profiler """
+    _method = getattr(Browser, name)
+
+    @functools.wraps(_method)
+    def _wrapper(self, *args, **kwargs):
+        if self.profiler is None:
+            return _method(self, *args, **kwargs)
+        with self.profiler.command(name):
+            return _method(self, *args, **kwargs)
+    return _wrapper
+
+
 class KialiBrowser(Browser):
 
     def __init__(
             self, selenium, kiali_version,
-            plugin_class=None, logger=None, extra_objects=None):
+            plugin_class=None, logger=None, extra_objects=None, profiler=None):
+        # profiler attaches to every selenium set, also the one set by Browser
+        self.profiler = profiler
         Browser.__init__(self, selenium, plugin_class=None, logger=None, extra_objects=None)
         self.kiali_version = kiali_version
 
+    @property
+    def selenium(self):
+        return self._selenium
+
+    @selenium.setter
+    def selenium(self, selenium):
+        self._selenium = selenium
+        if self.profiler is not None:
+            self.profiler.attach(selenium)
+
+    element = _profiled('element')
+    elements = _profiled('elements')
+    text = _profiled('text')
+    click = _profiled('click')
+    move_to_element = _profiled('move_to_element')
+    execute_script = _profiled('execute_script')
+
     @property
     def product_version(self):
         return self.kiali_version
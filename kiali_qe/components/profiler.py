@@ -0,0 +1,138 @@
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import widgetastic
+from widgetastic.widget import Widget
+
+# widgetastic wraps widget methods by logging decorators, their frames are skipped
+_WIDGETASTIC_DIR = os.path.dirname(widgetastic.__file__)
+
+
+class CommandStats(object):
+    """
+    Calls, WebDriver round trips and seconds of one call stack.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.round_trips = 0
+        self.seconds = 0.0
+
+    def __repr__(self):
+        return "{}(calls={}, round_trips={}, seconds={:.3f})".format(
+            type(self).__name__, self.calls, self.round_trips, self.seconds)
+
+
+class CommandProfiler(object):
+    """
+    Counts WebDriver round trips and their latency per calling widget method.
+    Every round trip is attributed to the stack of widget methods calling it,
+    e.g. ListViewServices.items;DropDown.options;text, ending with the outermost
+    profiled browser method or with the raw selenium command when it was called directly.
+    """
+
+    def __init__(self):
+        self.stats = OrderedDict()
+        self._local = threading.local()
+
+    def __repr__(self):
+        return "{}(stacks={}, round_trips={})".format(
+            type(self).__name__, len(self.stats),
+            sum(_stats.round_trips for _stats in self.stats.values()))
+
+    def _stats(self, stack):
+        if stack not in self.stats:
+            self.stats[stack] = CommandStats()
+        return self.stats[stack]
+
+    def _widget_stack(self):
+        """ Returns tuple of widget methods on the call stack, outermost first """
+        _stack = []
+        _frame = sys._getframe(2)
+        while _frame is not None:
+            _name = _frame.f_code.co_name
+            if not _name.startswith('__') and 'self' in _frame.f_code.co_varnames and \
+                    not (_name == 'wrapped' and
+                         _frame.f_code.co_filename.startswith(_WIDGETASTIC_DIR)):
+                _self = _frame.f_locals.get('self')
+                if isinstance(_self, Widget):
+                    _method = '{}.{}'.format(type(_self).__name__, _name)
+                    if not _stack or _stack[-1] != _method:
+                        _stack.append(_method)
+            _frame = _frame.f_back
+        return tuple(reversed(_stack))
+
+    @contextmanager
+    def command(self, name):
+        """ Profiles with block as browser command name, nested commands are part of it """
+        if getattr(self._local, 'stack', None) is not None:
+            yield
+            return
+        self._local.stack = self._widget_stack() + (name,)
+        _start = time.perf_counter()
+        try:
+            yield
+        finally:
+            _stats = self._stats(self._local.stack)
+            _stats.calls += 1
+            _stats.seconds += time.perf_counter() - _start
+            self._local.stack = None
+
+    def attach(self, selenium):
+        """Counts round trips of selenium WebDriver, once per driver.
+        Args:
+            selenium: WebDriver instance, all its and its elements' commands go through execute
+        """
+        if getattr(selenium, '_command_profiler', None) is self:
+            return
+        _execute = type(selenium).execute.__get__(selenium)
+
+        def _profiled_execute(driver_command, params=None):
+            _start = time.perf_counter()
+            try:
+                return _execute(driver_command, params)
+            finally:
+                _seconds = time.perf_counter() - _start
+                _stack = getattr(self._local, 'stack', None)
+                if _stack is None:
+                    # called outside of profiled browser methods
+                    _stats = self._stats(self._widget_stack() + (
+                        'selenium.{}'.format(driver_command),))
+                    _stats.calls += 1
+                    _stats.seconds += _seconds
+                else:
+                    _stats = self._stats(_stack)
+                _stats.round_trips += 1
+
+        selenium.execute = _profiled_execute
+        selenium._command_profiler = self
+
+    def reset(self):
+        self.stats = OrderedDict()
+
+    def folded(self, root=None):
+        """Returns lines of folded stacks with round trips count, input of flame graph tools.
+        Args:
+            root: frame prepended to every stack, e.g. test name
+        """
+        _lines = []
+        for _stack, _stats in self.stats.items():
+            if _stats.round_trips:
+                _frames = ((root,) if root else ()) + _stack
+                _lines.append('{} {}'.format(';'.join(_frames), _stats.round_trips))
+        return _lines
+
+    def report(self, count=10):
+        """ Returns lines of count stacks with most round trips """
+        _total = sum(_stats.round_trips for _stats in self.stats.values())
+        _lines = ['WebDriver round trips: {}, seconds: {:.2f}'.format(
+            _total, sum(_stats.seconds for _stats in self.stats.values()))]
+        for _stack, _stats in sorted(self.stats.items(), key=lambda _item: _item[1].round_trips,
+                                     reverse=True)[:count]:
+            _lines.append('{:>7} trips {:>5} calls {:>9.1f}ms  {}'.format(
+                _stats.round_trips, _stats.calls, _stats.seconds * 1000, ';'.join(_stack)))
+        return _lines
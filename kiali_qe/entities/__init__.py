@@ -1,12 +1,64 @@
 import math
+import sys
+import weakref
+from itertools import product
 from kiali_qe.components.enums import HealthType
 
 
 ERROR_RATIO_ABS_TOTAL = 0.09
 
 
+class Labels(dict):
+    """
+    Immutable labels mapping shared by all entities with the same labels.
+    Use Labels.shared, UI, REST and OC copies of the same item then keep single instance.
+    """
+
+    __slots__ = ('__weakref__',)
+
+    _pool = weakref.WeakValueDictionary()
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("'{}' object is immutable".format(type(self).__name__))
+
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = _readonly
+
+    def __hash__(self):
+        return hash(frozenset(self.items()))
+
+    def __reduce__(self):
+        return (type(self), (dict(self),))
+
+    @classmethod
+    def shared(cls, labels):
+        """Returns shared Labels instance equal to given dict.
+        Args:
+            labels: dict of labels, returned as is when it is not a dict of hashable values
+        """
+        if not isinstance(labels, dict) or isinstance(labels, cls):
+            return labels
+        try:
+            _key = frozenset(
+                (sys.intern(_k), sys.intern(_v) if isinstance(_v, str) else _v)
+                for _k, _v in labels.items())
+        except TypeError:
+            return labels
+        _labels = cls._pool.get(_key)
+        if _labels is None:
+            _labels = cls(_key)
+            cls._pool[_key] = _labels
+        return _labels
+
+
 class EntityBase(object):
 
+    __slots__ = ()
+
+    @staticmethod
+    def _intern(value):
+        """ Returns interned string, repeated namespace and type values then share one object """
+        return sys.intern(value) if type(value) is str else value
+
     def is_in(self, items):
         for item in items:
             if self.is_equal(item):
@@ -16,6 +68,41 @@ class EntityBase(object):
     def is_equal(self, item):
         raise NotImplementedError('Should be implemented on sub class')
 
+    def canonical(self, advanced_check=True):
+        """Returns hashable form of the fields is_equal compares exactly.
+        Items which are equal have the same canonical form, the opposite is not granted,
+        is_equal still decides between items of the same form.
+        None means the entity has no canonical form and is compared item by item.
+        Args:
+            advanced_check: form for is_equal with advanced_check
+        """
+        return None
+
+    def canonical_neighbours(self, advanced_check=True):
+        """Returns canonical forms of all items this one can be equal to.
+        Overridden by entities compared with tolerance, which canonical form is a bucket.
+        """
+        return [self.canonical(advanced_check)]
+
+    @staticmethod
+    def _freeze(value):
+        """ Returns hashable copy of dict and list values """
+        if isinstance(value, dict):
+            return frozenset((_k, EntityBase._freeze(_v)) for _k, _v in value.items())
+        if isinstance(value, (list, tuple, set)):
+            return tuple(EntityBase._freeze(_v) for _v in value)
+        return value
+
+    @staticmethod
+    def _ratio_bucket(ratio):
+        return int(math.floor(ratio / ERROR_RATIO_ABS_TOTAL))
+
+    @classmethod
+    def _ratio_neighbours(cls, name, *ratios):
+        """ Returns buckets of ratios and buckets next to them, where close ratios can fall """
+        return [(name,) + _buckets for _buckets in product(
+            *[(_b - 1, _b, _b + 1) for _b in map(cls._ratio_bucket, ratios)])]
+
     @classmethod
     def _get_error_ratio(cls, error_ratios):
         _ratio = 0.0
@@ -34,6 +121,8 @@ class EntityBase(object):
 
 class Requests(EntityBase):
 
+    __slots__ = ('errorRatio',)
+
     def __init__(self, errorRatio):
         self.errorRatio = errorRatio
 
@@ -55,6 +144,12 @@ class Requests(EntityBase):
         else:
             return HealthType.DEGRADED
 
+    def canonical(self, advanced_check=True):
+        return ('Requests', self._ratio_bucket(self.errorRatio))
+
+    def canonical_neighbours(self, advanced_check=True):
+        return self._ratio_neighbours('Requests', self.errorRatio)
+
     def is_equal(self, other):
         return isinstance(other, Requests)\
          and math.isclose(self.errorRatio,
@@ -64,6 +159,8 @@ class Requests(EntityBase):
 
 class AppRequests(EntityBase):
 
+    __slots__ = ('inboundErrorRatio', 'outboundErrorRatio')
+
     def __init__(self, inboundErrorRatio, outboundErrorRatio):
         self.inboundErrorRatio = inboundErrorRatio
         self.outboundErrorRatio = outboundErrorRatio
@@ -89,6 +186,15 @@ class AppRequests(EntityBase):
         else:
             return HealthType.DEGRADED
 
+    def canonical(self, advanced_check=True):
+        return ('AppRequests',
+                self._ratio_bucket(self.inboundErrorRatio),
+                self._ratio_bucket(self.outboundErrorRatio))
+
+    def canonical_neighbours(self, advanced_check=True):
+        return self._ratio_neighbours(
+            'AppRequests', self.inboundErrorRatio, self.outboundErrorRatio)
+
     def is_equal(self, other):
         return isinstance(other, AppRequests)\
             and math.isclose(self.inboundErrorRatio,
@@ -101,6 +207,8 @@ class AppRequests(EntityBase):
 
 class DeploymentStatus(EntityBase):
 
+    __slots__ = ('name', 'replicas', 'available')
+
     def __init__(self, name, replicas, available):
         self.name = name
         self.replicas = replicas
@@ -122,6 +230,9 @@ class DeploymentStatus(EntityBase):
         else:
             return HealthType.FAILURE
 
+    def canonical(self, advanced_check=True):
+        return ('DeploymentStatus', self.name, self.replicas, self.available)
+
     def is_equal(self, other):
         return isinstance(other, DeploymentStatus)\
          and self.name == other.name\
@@ -131,12 +242,15 @@ class DeploymentStatus(EntityBase):
 
 class TrafficItem(EntityBase):
 
+    __slots__ = ('name', 'status', 'object_type', 'request_type', 'rps', 'success_rate',
+                 'bound_traffic_type')
+
     def __init__(self, status, name, object_type, request_type, rps, success_rate,
                  bound_traffic_type):
         self.name = name
         self.status = status
-        self.object_type = object_type
-        self.request_type = request_type
+        self.object_type = self._intern(object_type)
+        self.request_type = self._intern(request_type)
         self.rps = rps
         self.success_rate = success_rate
         self.bound_traffic_type = bound_traffic_type
@@ -161,6 +275,8 @@ class TrafficItem(EntityBase):
 
 class ConfigurationStatus(EntityBase):
 
+    __slots__ = ('validation', 'link')
+
     def __init__(self, validation, link=None):
         self.validation = validation
         self.link = link
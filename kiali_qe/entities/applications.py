@@ -1,10 +1,12 @@
-from kiali_qe.entities import EntityBase, DeploymentStatus, AppRequests
+from kiali_qe.entities import EntityBase, DeploymentStatus, AppRequests, Labels
 from kiali_qe.components.enums import HealthType
 from kiali_qe.utils import is_equal
 
 
 class ApplicationHealth(EntityBase):
 
+    __slots__ = ('deployment_statuses', 'requests')
+
     def __init__(self, deployment_statuses, requests):
         self.deployment_statuses = deployment_statuses
         self.requests = requests
@@ -79,14 +81,16 @@ class ApplicationHealth(EntityBase):
 
 class Application(EntityBase):
 
+    __slots__ = ('name', 'namespace', 'istio_sidecar', 'health', 'application_status', 'labels')
+
     def __init__(self, name, namespace, istio_sidecar=None, health=None,
                  application_status=None, labels={}):
         self.name = name
-        self.namespace = namespace
+        self.namespace = self._intern(namespace)
         self.istio_sidecar = istio_sidecar
         self.health = health
         self.application_status = application_status
-        self.labels = labels
+        self.labels = Labels.shared(labels)
 
     def __str__(self):
         return 'name:{}, namespace:{}, sidecar:{}, health:{}, labels:{}'.format(
@@ -98,11 +102,17 @@ class Application(EntityBase):
             repr(self.istio_sidecar), repr(self.health), repr(self.labels))
 
     def __hash__(self):
-        return (hash(self.name) ^ hash(self.namespace) ^ hash(self.istio_sidecar))
+        return hash(self.canonical(advanced_check=False))
 
     def __eq__(self, other):
         return self.is_equal(other, advanced_check=True)
 
+    def canonical(self, advanced_check=True):
+        _basic = ('Application', self.name, self.namespace)
+        if not advanced_check:
+            return _basic
+        return _basic + (self.health, self._freeze(self.labels))
+
     def is_equal(self, other, advanced_check=True):
         # basic check
         if not isinstance(other, Application):
@@ -184,6 +194,8 @@ class ApplicationDetails(EntityBase):
 
 class AppWorkload(EntityBase):
 
+    __slots__ = ('name', 'istio_sidecar')
+
     def __init__(self, name, istio_sidecar=False):
         self.name = name
         self.istio_sidecar = istio_sidecar
@@ -201,7 +213,10 @@ class AppWorkload(EntityBase):
         return self.is_equal(other)
 
     def __hash__(self):
-        return (hash(self.name) ^ hash(self.istio_sidecar))
+        return hash(self.canonical())
+
+    def canonical(self, advanced_check=True):
+        return ('AppWorkload', self.name)
 
     def is_equal(self, other, advanced_check=True):
         # basic check
@@ -4,11 +4,13 @@ from kiali_qe.utils import is_equal
 
 class IstioConfig(EntityBase):
 
+    __slots__ = ('name', 'namespace', 'object_type', 'validation', 'config_link')
+
     def __init__(self, name, namespace, object_type, validation=None,
                  config_link=None):
         self.name = name
-        self.namespace = namespace
-        self.object_type = object_type
+        self.namespace = self._intern(namespace)
+        self.object_type = self._intern(object_type)
         self.validation = validation
         self.config_link = config_link
 
@@ -25,7 +27,13 @@ class IstioConfig(EntityBase):
         return self.is_equal(other, advanced_check=True)
 
     def __hash__(self):
-        return (hash(self.name) ^ hash(self.namespace) ^ hash(self.object_type))
+        return hash(self.canonical(advanced_check=False))
+
+    def canonical(self, advanced_check=True):
+        _basic = ('IstioConfig', self.name, self.namespace)
+        if not advanced_check:
+            return _basic
+        return _basic + (self.object_type, self.validation)
 
     def is_equal(self, other, advanced_check=True):
         # basic check
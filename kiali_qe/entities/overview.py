@@ -1,16 +1,19 @@
-from kiali_qe.entities import EntityBase
+from kiali_qe.entities import EntityBase, Labels
 from kiali_qe.components.enums import MeshWideTLSType
 
 
 class Overview(EntityBase):
 
+    __slots__ = ('overview_type', 'namespace', 'items', 'config_status', 'unhealthy', 'healthy',
+                 'degraded', 'na', 'idle', 'tls_type', 'labels')
+
     def __init__(self, overview_type, namespace, items,
                  config_status=None,
                  healthy=0, unhealthy=0, degraded=0, na=0, idle=0,
                  tls_type=MeshWideTLSType.DISABLED,
                  labels={}):
         self.overview_type = overview_type
-        self.namespace = namespace
+        self.namespace = self._intern(namespace)
         self.items = items
         self.config_status = config_status
         self.unhealthy = unhealthy
@@ -19,7 +22,7 @@ class Overview(EntityBase):
         self.na = na
         self.idle = idle
         self.tls_type = tls_type
-        self.labels = labels
+        self.labels = Labels.shared(labels)
 
     def __str__(self):
         return 'overview_type:{}, namespace:{}, items:{}, \
@@ -1,10 +1,12 @@
-from kiali_qe.entities import EntityBase, Requests
+from kiali_qe.entities import EntityBase, Labels, Requests
 from kiali_qe.components.enums import HealthType
 from kiali_qe.utils import is_equal as compare_lists, is_equal
 
 
 class ServiceHealth(EntityBase):
 
+    __slots__ = ('requests',)
+
     def __init__(self, requests):
         self.requests = requests
 
@@ -56,6 +58,9 @@ class Service(EntityBase):
         health: health status
     """
 
+    __slots__ = ('name', 'namespace', 'istio_sidecar', 'labels', 'health', 'service_status',
+                 'config_status', 'icon')
+
     def __init__(self, name, namespace, istio_sidecar=None,
                  labels={}, health=None,
                  service_status=None,
@@ -66,9 +71,9 @@ class Service(EntityBase):
         if namespace is None:
             raise KeyError("'namespace' should not be 'None'")
         self.name = name
-        self.namespace = namespace
+        self.namespace = self._intern(namespace)
         self.istio_sidecar = istio_sidecar
-        self.labels = labels
+        self.labels = Labels.shared(labels)
         self.health = health
         self.service_status = service_status
         self.config_status = config_status
@@ -87,11 +92,17 @@ class Service(EntityBase):
             repr(self.istio_sidecar), repr(self.labels), repr(self.health))
 
     def __hash__(self):
-        return (hash(self.name) ^ hash(self.namespace) ^ hash(self.istio_sidecar))
+        return hash(self.canonical(advanced_check=False))
 
     def __eq__(self, other):
         return self.is_equal(other, advanced_check=True)
 
+    def canonical(self, advanced_check=True):
+        _basic = ('Service', self.name, self.namespace)
+        if not advanced_check:
+            return _basic
+        return _basic + (self.health, self._freeze(self.labels), self.icon)
+
     def is_equal(self, other, advanced_check=True):
         # basic check
         if not isinstance(other, Service):
@@ -127,6 +138,12 @@ class ServiceDetails(EntityBase):
         health: health status
     """
 
+    __slots__ = ('name', 'istio_sidecar', 'health', 'created_at', 'service_type',
+                 'resource_version', 'ip', 'ports', 'labels', 'selectors', 'service_status',
+                 'endpoints', 'validations', 'icon', 'workloads_number', 'istio_configs_number',
+                 'istio_configs', 'virtual_services', 'destination_rules', 'workloads',
+                 'applications', 'traffic_tab', 'inbound_metrics', 'traces_tab')
+
     def __init__(self, name, created_at, service_type,
                  resource_version, ip, ports,
                  labels={}, selectors={},
@@ -143,8 +160,8 @@ class ServiceDetails(EntityBase):
         self.resource_version = resource_version
         self.ip = ip
         self.ports = ports
-        self.labels = labels
-        self.selectors = selectors
+        self.labels = Labels.shared(labels)
+        self.selectors = Labels.shared(selectors)
         self.service_status = service_status
         self.endpoints = endpoints
         self.validations = validations
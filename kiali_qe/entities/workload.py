@@ -1,18 +1,21 @@
-from kiali_qe.entities import EntityBase, DeploymentStatus, AppRequests
+from kiali_qe.entities import EntityBase, DeploymentStatus, AppRequests, Labels
 from kiali_qe.components.enums import HealthType
 
 
 class Workload(EntityBase):
 
+    __slots__ = ('name', 'namespace', 'workload_type', 'istio_sidecar', 'labels', 'health', 'icon',
+                 'workload_status')
+
     def __init__(self, name, namespace, workload_type,
                  istio_sidecar=None, labels={}, health=None,
                  icon=None,
                  workload_status=None):
         self.name = name
-        self.namespace = namespace
-        self.workload_type = workload_type
+        self.namespace = self._intern(namespace)
+        self.workload_type = self._intern(workload_type)
         self.istio_sidecar = istio_sidecar
-        self.labels = labels
+        self.labels = Labels.shared(labels)
         self.health = health
         self.icon = icon
         self.workload_status = workload_status
@@ -32,7 +35,13 @@ class Workload(EntityBase):
         return self.is_equal(other, advanced_check=True)
 
     def __hash__(self):
-        return (hash(self.name) ^ hash(self.namespace) ^ hash(self.workload_type))
+        return hash(self.canonical(advanced_check=False))
+
+    def canonical(self, advanced_check=True):
+        _basic = ('Workload', self.name, self.namespace, self.workload_type)
+        if not advanced_check:
+            return _basic
+        return _basic + (self.health, self.icon, self._freeze(self.labels))
 
     def is_equal(self, other, advanced_check=True):
         # basic check
@@ -158,6 +167,8 @@ class WorkloadDetails(EntityBase):
 
 class WorkloadPod(EntityBase):
 
+    __slots__ = ('name', 'status', 'podIP')
+
     def __init__(self, name, status=None, podIP=None):
         self.name = name
         self.status = status
@@ -193,6 +204,8 @@ class WorkloadPod(EntityBase):
 
 class WorkloadHealth(EntityBase):
 
+    __slots__ = ('workload_status', 'requests')
+
     def __init__(self, workload_status, requests):
         self.workload_status = workload_status
         self.requests = requests
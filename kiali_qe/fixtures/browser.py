@@ -8,38 +8,129 @@ from selenium.common.exceptions import WebDriverException
 from selenium.webdriver.remote.remote_connection import RemoteConnection
 
 from kiali_qe.components.browser import KialiBrowser
+from kiali_qe.components.profiler import CommandProfiler
 from kiali_qe.fixtures.zalenium import set_browser, update_suite_status
+from kiali_qe.utils import worker_id
 from kiali_qe.utils.conf import env as cfg
+from kiali_qe.utils.driver_pool import DriverPool, quit_quietly
 from kiali_qe.utils.log import logger
+from kiali_qe.utils.path import log_path
+
+LOCAL = 'local'
+
+# DriverPool of this worker, started once its tests are collected
+_driver_pool = None
+
+
+def _start_driver_pool():
+    global _driver_pool
+    if _driver_pool is None:
+        _driver_pool = DriverPool(_create_selenium,
+                                  spares=cfg.selenium.pool.spares,
+                                  workers=cfg.selenium.pool.workers,
+                                  keep_alive=cfg.selenium.pool.keep_alive or None).start()
+    return _driver_pool
+
+
+def pytest_collection_finish(session):
+    # sessions are created while the tests before the first UI test run
+    if any('browser' in getattr(_item, 'fixturenames', ()) for _item in session.items):
+        _start_driver_pool()
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if _driver_pool is not None:
+        _driver_pool.close()
 
 
 @pytest.fixture(scope='session')
-def browser(kiali_client):
-    selenium = _get_selenium()
-    selenium.maximize_window()
-    logger.debug('Launching kiali instance: {}'.format(cfg.kiali.hostname))
-    if cfg.kiali.auth_type == 'oauth':
-        selenium.get(
-            'https://{}/#access_token={}&expires_in=86400&scope=user%3Afull&token_type=Bearer'
-                .format(cfg.kiali.hostname, cfg.kiali.token))
-    else:
-        selenium.get(
-            'https://{}'.format(cfg.kiali.hostname))
+def driver_pool():
+    """ Returns DriverPool of this worker, started when the tests were collected """
+    return _start_driver_pool()
+
+
+@pytest.fixture(scope='session')
+def browser(kiali_client, driver_pool):
+    selenium = driver_pool.acquire(timeout=cfg.selenium.pool.timeout or None)
     logger.debug('Launching kiali browser')
+    profiler = None
+    if cfg.selenium.profiler.enabled:
+        profiler = CommandProfiler()
+        # tests append their stacks to it
+        open(_profile_path(), 'w').close()
     # load KialiBrowser
     kiali_browser = KialiBrowser(
         selenium, logger=logger,
-        kiali_version=cfg.kiali.version)
+        kiali_version=cfg.kiali.version,
+        profiler=profiler)
     # ugly hack to pass browser object to zalenium fixtures
     # needs to remove this global assignment
     set_browser(kiali_browser)
     yield kiali_browser
     # update suite status on zalenium
     update_suite_status()
-    kiali_browser.selenium.quit()
+    quit_quietly(kiali_browser.selenium)
+
+
+@pytest.fixture(autouse=True)
+def browser_health(request):
+    """ Replaces dead web driver session of the browser before each test using it """
+    if not cfg.selenium.pool.health_check or 'browser' not in request.fixturenames:
+        return
+    _browser = request.getfixturevalue('browser')
+    _pool = request.getfixturevalue('driver_pool')
+    if not _pool.health_check(_browser.selenium):
+        _browser.selenium = _pool.replace(_browser.selenium)
+
+
+@pytest.fixture(autouse=True)
+def webdriver_profile(request):
+    """ Logs and writes WebDriver round trips of each test using the browser when profiled """
+    if not cfg.selenium.profiler.enabled or 'browser' not in request.fixturenames:
+        yield
+        return
+    _profiler = request.getfixturevalue('browser').profiler
+    _profiler.reset()
+    yield
+    for _line in _profiler.report(cfg.selenium.profiler.top or 10):
+        logger.info(_line)
+    with open(_profile_path(), 'a') as _file:
+        for _line in _profiler.folded(root=request.node.nodeid):
+            _file.write(_line + '\n')
+
+
+def _profile_path():
+    # each xdist worker writes its own file
+    _name = cfg.selenium.profiler.filename or 'webdriver_profile'
+    if worker_id() != 'master':
+        _name = '{}-{}'.format(_name, worker_id())
+    if not log_path.exists():
+        log_path.ensure(dir=True)
+    return log_path.join('{}.folded'.format(_name)).strpath
+
+
+def _create_selenium():
+    """ Returns new web driver with Kiali loaded, raises WebDriverException when it fails """
+    selenium = _get_selenium()
+    if selenium is None:
+        raise WebDriverException('Failed to create web driver')
+    if cfg.selenium.mode != LOCAL:
+        # headless local browser has no screen to maximize to, its size is set in options
+        selenium.maximize_window()
+    logger.debug('Launching kiali instance: {}'.format(cfg.kiali.hostname))
+    if cfg.kiali.auth_type == 'oauth':
+        selenium.get(
+            'https://{}/#access_token={}&expires_in=86400&scope=user%3Afull&token_type=Bearer'
+                .format(cfg.kiali.hostname, cfg.kiali.token))
+    else:
+        selenium.get(
+            'https://{}'.format(cfg.kiali.hostname))
+    return selenium
 
 
 def _get_selenium():
+    if cfg.selenium.mode == LOCAL:
+        return _get_local_driver()
     # load desired_capabilities
     capabilities = {}
     for key, value in cfg.selenium.capabilities.items():
@@ -87,14 +178,54 @@ def _get_driver(capabilities):
     return driver
 
 
+def _get_local_driver():
+    logger.debug('Creating local web driver')
+    start_time = datetime.now()
+    _kwargs = {'options': _get_browser_options()}
+    if cfg.selenium.local.driver_path:
+        _kwargs['executable_path'] = cfg.selenium.local.driver_path
+    if cfg.selenium.capabilities.browserName == "chrome":
+        driver = webdriver.Chrome(**_kwargs)
+    else:
+        driver = webdriver.Firefox(capabilities={'acceptInsecureCerts': True},
+                                   log_path=log_path.join('geckodriver.log').strpath,
+                                   **_kwargs)
+    _delta = datetime.now() - start_time
+    logger.debug('Local web driver created successfully. Time taken: {} ms'.format(
+        int(_delta.total_seconds() * 1000)))
+    return driver
+
+
 def _get_browser_options():
+    _local = cfg.selenium.mode == LOCAL
     if cfg.selenium.capabilities.browserName == "chrome":
         chrome_options = webdriver.ChromeOptions()
         chrome_options.add_argument("--incognito")
         chrome_options.add_argument('--ignore-certificate-errors')
         chrome_options.add_experimental_option('w3c', False)
+        if _local:
+            chrome_options.set_headless(cfg.selenium.local.headless)
+            chrome_options.add_argument('--window-size={}'.format(
+                cfg.selenium.local.window_size or '1920,1080'))
+            chrome_options.add_argument('--disable-gpu')
+            chrome_options.add_argument('--disable-dev-shm-usage')
+            if cfg.selenium.local.lightweight:
+                chrome_options.add_argument('--blink-settings=imagesEnabled=false')
+                chrome_options.add_argument('--force-prefers-reduced-motion')
+                chrome_options.add_experimental_option(
+                    'prefs', {'profile.managed_default_content_settings.images': 2})
         return chrome_options
     else:
         firefox_options = webdriver.FirefoxOptions()
         firefox_options.set_preference("browser.privatebrowsing.autostart", True)
+        if _local:
+            firefox_options.set_headless(cfg.selenium.local.headless)
+            _width, _height = (cfg.selenium.local.window_size or '1920,1080').split(',')
+            firefox_options.add_argument('--width={}'.format(_width))
+            firefox_options.add_argument('--height={}'.format(_height))
+            if cfg.selenium.local.lightweight:
+                firefox_options.set_preference('permissions.default.image', 2)
+                firefox_options.set_preference('image.animation_mode', 'none')
+                firefox_options.set_preference('ui.prefersReducedMotion', 1)
+                firefox_options.set_preference('toolkit.cosmeticAnimations.enabled', False)
         return firefox_options
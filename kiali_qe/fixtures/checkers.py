@@ -1,21 +1,66 @@
+import os
 import pytest
 
+from kiali_qe.utils.conf import env as cfg
 from kiali_qe.utils.log import logger
+from kiali_qe.utils.namespace_pool import NamespacePool, default_lock_dir
+from kiali_qe.utils.path import project_path
 
 DEFAULT_BOOKINFO_NAMESPACE = 'bookinfo'
+CRUD_MARKER_PREFIX = 'p_crud'
+
+
+@pytest.fixture(scope='session')
+def namespace_pool(openshift_client):
+    """ Returns NamespacePool when cfg.namespace_pool.enabled, None otherwise """
+    if not cfg.namespace_pool.enabled:
+        return None
+    _template = None
+    if cfg.namespace_pool.template:
+        _template = os.path.join(project_path.strpath, cfg.namespace_pool.template)
+    _pool = NamespacePool(
+        openshift_client,
+        base=cfg.namespace_pool.base or DEFAULT_BOOKINFO_NAMESPACE,
+        size=cfg.namespace_pool.size or 1,
+        max_size=cfg.namespace_pool.max_size,
+        template=_template,
+        lock_dir=cfg.namespace_pool.lock_dir or default_lock_dir(cfg.kiali.hostname),
+        timeout=cfg.namespace_pool.timeout or 600,
+        delay=cfg.namespace_pool.delay or 1.0,
+        reset=cfg.namespace_pool.reset)
+    logger.debug('Namespace pool: {}'.format(_pool))
+    return _pool
 
 
 @pytest.fixture
-def pick_namespace(openshift_client):
+def pick_namespace(request, openshift_client, namespace_pool):
+    _leases = {}
+    # only tests of p_crud groups change their namespace, the others share it
+    _shared = not any(_marker.name.startswith(CRUD_MARKER_PREFIX)
+                      for _marker in request.node.iter_markers())
+
+    def _release():
+        for _lease in _leases.values():
+            namespace_pool.release(_lease)
+
+    request.addfinalizer(_release)
 
     def _pick_namespace(name):
         """
-        Checks if required namespace exists, if not it picks the default namespace to
-        run test against and logs warning.
+        Leases required namespace of the pool to this test and releases it after the test.
+        The lease is exclusive for tests marked by p_crud groups, shared otherwise,
+        exclusive lease may get a clone from the pool template instead.
+        For namespace out of the pool, checks if required namespace exists, if not it picks
+        the default namespace to run test against and logs warning.
 
         :param name: name of required namespace
-        :returns: name of required namespace if exists, default namespace otherwise
+        :returns: name of namespace to run test against
         """
+        if namespace_pool is not None and name in namespace_pool:
+            if name not in _leases:
+                _leases[name] = namespace_pool.lease(name, owner=request.node.nodeid,
+                                                     shared=_shared)
+            return _leases[name].namespace
         if openshift_client.namespace_exists(name):
             logger.debug('{} namespace is available'.format(name))
             return name
@@ -3,7 +3,10 @@ import collections
 import attr
 import pytest
 
-from kiali_qe.utils import log
+from kiali_qe.utils import log, worker_id
+from kiali_qe.utils.conf import env as cfg
+from kiali_qe.utils.path import log_path
+from kiali_qe.utils.timing import test_timing
 
 #: A dict of tests, and their state at various test phases
 test_tracking = collections.defaultdict(dict)
@@ -25,6 +28,8 @@ def pytest_runtest_setup(item):
     logger().info(
         log.format_marker(_format_nodeid(item.nodeid), mark="-"),
         extra={'source_file': path, 'source_lineno': lineno})
+    # steps timed inside the test are recorded against it
+    test_timing.start(_format_nodeid(item.nodeid, False))
     yield
 
 
@@ -46,7 +51,10 @@ class LogExtraData(object):
         #      test_tracking['test_name']['teardown'] = 'failed'
         yield
         test_tracking[_format_nodeid(report.nodeid, False)][report.when] = report.outcome
+        test_timing.phase(_format_nodeid(report.nodeid, False), report.when, report.duration)
         if report.when == 'teardown':
+            if test_timing.current == _format_nodeid(report.nodeid, False):
+                test_timing.stop()
             path, lineno, domaininfo = report.location  # @UnusedVariable
             test_status = _test_status(_format_nodeid(report.nodeid, False))
             logger().info(log.format_marker('{} result: {}'.format(
@@ -78,6 +86,28 @@ def pytest_sessionfinish(session, exitstatus):
     summary = ', '.join(results)
     logger().info(log.format_marker('Finished test run', mark='='))
     logger().info(log.format_marker(str(summary), mark='='))
+    if cfg.logging.timing.enabled and test_timing.tests:
+        _save_timing(session.config.pluginmanager.get_plugin('terminalreporter'))
+
+
+def _save_timing(terminal=None):
+    # each xdist worker writes its own files, the master one has phases of all tests
+    _name = cfg.logging.timing.filename or 'timing'
+    if worker_id() != 'master':
+        _name = '{}-{}'.format(_name, worker_id())
+    if not log_path.exists():
+        log_path.ensure(dir=True)
+    test_timing.save_json(log_path.join('{}.json'.format(_name)).strpath)
+    test_timing.save_csv(log_path.join('{}.csv'.format(_name)).strpath)
+    _lines = test_timing.summary(cfg.logging.timing.slowest or 10) + [
+        'Test timing written to {}'.format(log_path.join('{}.json'.format(_name)).strpath)]
+    for _line in _lines:
+        logger().info(_line)
+    # xdist workers have no terminal, their files are summarized in the log only
+    if terminal is not None:
+        terminal.write_sep('=', 'test timing')
+        for _line in _lines:
+            terminal.write_line(_line)
 
 
 def _test_status(test_name):
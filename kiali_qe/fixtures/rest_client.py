@@ -1,22 +1,116 @@
 import json
+import os
 import pytest
 
+from kiali_qe.rest.cache import ResponseCache
+from kiali_qe.rest.cassette import Cassette, RECORD, REPLAY
 from kiali_qe.rest.kiali_api import KialiExtendedClient
+from kiali_qe.rest.standin import KialiStandInServer
+from kiali_qe.rest.synthetic import SyntheticMesh
+from kiali_qe.rest.transport import KialiTransport
 from kiali_qe.rest.openshift_api import OpenshiftExtendedClient
+from kiali_qe.rest.stats import RestStats
+from kiali_qe.utils import worker_id
 from kiali_qe.utils.conf import env as cfg
 from kiali_qe.utils.log import logger
+from kiali_qe.utils.path import log_path, project_path
 
 
 @pytest.fixture(scope='session')
-def kiali_client():
+def kiali_standin():
+    """ Yields local Kiali stand-in server when cfg.kiali.standin.enabled, None otherwise """
+    if not cfg.kiali.standin.enabled:
+        yield None
+        return
+    _server = KialiStandInServer(
+        mesh=SyntheticMesh(namespaces=cfg.kiali.standin.namespaces,
+                           apps=cfg.kiali.standin.apps,
+                           versions=cfg.kiali.standin.versions,
+                           error_ratio=cfg.kiali.standin.error_ratio,
+                           seed=cfg.kiali.standin.seed),
+        latency=cfg.kiali.standin.latency)
+    _server.start()
+    yield _server
+    _server.stop()
+
+
+@pytest.fixture(scope='session')
+def cassette():
+    """ Yields Cassette of cfg.cassette.mode 'record' or 'replay', None otherwise """
+    if cfg.cassette.mode not in (RECORD, REPLAY):
+        yield None
+        return
+    _cassette = Cassette(os.path.join(project_path.strpath, cfg.cassette.path),
+                         mode=cfg.cassette.mode,
+                         timing=cfg.cassette.timing)
+    yield _cassette
+    if _cassette.recording:
+        _cassette.save()
+
+
+@pytest.fixture(scope='session')
+def rest_stats():
+    """ Yields RestStats of Kiali and OpenShift clients when cfg.rest_stats.enabled,
+    None otherwise, the stats are logged and written to log/ at the end of the session """
+    if not cfg.rest_stats.enabled:
+        yield None
+        return
+    _stats = RestStats()
+    yield _stats
+    for _line in _stats.summary(cfg.rest_stats.top or 15):
+        logger.info(_line)
+    # each xdist worker writes its own file
+    _name = cfg.rest_stats.filename or 'rest_stats'
+    if worker_id() != 'master':
+        _name = '{}-{}'.format(_name, worker_id())
+    if not log_path.exists():
+        log_path.ensure(dir=True)
+    _stats.save_json(log_path.join('{}.json'.format(_name)).strpath)
+
+
+@pytest.fixture(scope='session')
+def kiali_client(kiali_standin, cassette, rest_stats):
+    _client = _get_kiali_client(kiali_standin, cassette, rest_stats)
+    yield _client
+    if _client.response_cache is not None:
+        logger.info('Kiali response cache: {}'.format(_client.response_cache.stats()))
+    if _client.transport is not None:
+        _client.transport.close()
+
+
+def _get_kiali_client(standin=None, cassette=None, rest_stats=None):
     logger.debug('Creating kiali rest client')
-    logger.debug('Kiali hostname: {}'.format(cfg.kiali.hostname))
-    _client = KialiExtendedClient(hostname=cfg.kiali.hostname,
-                                  username=cfg.kiali.username,
-                                  password=cfg.kiali.password,
-                                  auth_type=cfg.kiali.auth_type,
-                                  token=cfg.kiali.token,
-                                  swagger_address=cfg.kiali.swagger_address)
+    _connection = {'hostname': cfg.kiali.hostname,
+                   'username': cfg.kiali.username,
+                   'password': cfg.kiali.password,
+                   'auth_type': cfg.kiali.auth_type,
+                   'token': cfg.kiali.token,
+                   'swagger_address': cfg.kiali.swagger_address}
+    if standin is not None:
+        _connection.update({'hostname': standin.hostname,
+                            'scheme': standin.scheme,
+                            'auth_type': 'no-auth',
+                            'swagger_address': standin.swagger_address})
+    logger.debug('Kiali hostname: {}'.format(_connection['hostname']))
+    _cache = None
+    if cfg.kiali.response_cache.enabled:
+        _cache = ResponseCache(size=cfg.kiali.response_cache.size,
+                               ttl=cfg.kiali.response_cache.ttl,
+                               method_ttl=cfg.kiali.response_cache.method_ttl.toDict())
+    _transport = None
+    if cfg.kiali.transport.enabled:
+        _transport = KialiTransport(pool_size=cfg.kiali.transport.pool_size,
+                                    retries=cfg.kiali.transport.retries,
+                                    backoff_factor=cfg.kiali.transport.backoff_factor,
+                                    connect_timeout=cfg.kiali.transport.connect_timeout,
+                                    read_timeout=cfg.kiali.transport.read_timeout)
+    _client = KialiExtendedClient(health_workers=cfg.kiali.health_workers,
+                                  bulk_health=cfg.kiali.bulk_health,
+                                  response_cache=_cache,
+                                  transport=_transport,
+                                  cassette=cassette,
+                                  rest_stats=rest_stats,
+                                  **_connection)
     # update kiali version details
     _response = _client.get_response('getStatus')
     _status = _response['status']
@@ -34,13 +128,13 @@ def kiali_client():
 
 
 @pytest.fixture(scope='session')
-def openshift_client():
+def openshift_client(kiali_standin, cassette, rest_stats):
     if cfg.kiali.skip_oc:
         logger.debug('Skipping Openshift rest client because of cfg.kiali.skip_oc')
         # TODO Temporary solution as OC client does not support OCP4
-        return kiali_client()
+        return _get_kiali_client(kiali_standin, cassette, rest_stats)
     else:
         logger.debug('Creating Openshift rest client')
-        _client = OpenshiftExtendedClient()
+        _client = OpenshiftExtendedClient(cassette=cassette, rest_stats=rest_stats)
         logger.info('Openshift versions:\n{}'.format(json.dumps(_client.version, indent=2)))
         return _client
@@ -1,5 +1,6 @@
 import pytest
 
+from kiali_qe.utils.conf import env as cfg
 from kiali_qe.utils.log import logger
 
 ZALENIUM_MESSAGE = 'zaleniumMessage'
@@ -45,6 +46,9 @@ def _update_cookie(name, value):
 
 
 def _update_zalenium_cookie(test_status, test_name=None):
+    # local browser is not recorded, cookies would only cost a command per test phase
+    if cfg.selenium.mode == 'local':
+        return
     if test_status == 'start':
         _update_cookie(ZALENIUM_MESSAGE, '[T] Start: {}'.format(test_name))
     elif test_status == 'passed':
@@ -0,0 +1,194 @@
+import copy
+import os
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+
+import yaml
+from openshift.dynamic.exceptions import (
+    ConflictError,
+    DynamicApiError,
+    NotFoundError,
+    ResourceNotFoundError
+)
+
+from kiali_qe.utils.log import logger
+
+CREATED = 'created'
+CONFIGURED = 'configured'
+DELETED = 'deleted'
+NOT_FOUND = 'not found'
+FAILED = 'failed'
+
+# kinds other documents may depend on, applied before and deleted after the rest
+FIRST_KINDS = ('Namespace', 'CustomResourceDefinition')
+
+_documents_cache = {}
+_documents_lock = threading.Lock()
+
+
+def load_documents(yaml_file):
+    """Returns list of documents of multi-document yaml file.
+    The file is parsed once, again only when it changes on disk.
+    Returned documents are shared, do not modify them.
+    Args:
+        yaml_file: path of the yaml file
+    """
+    _key = (os.path.abspath(yaml_file), os.path.getmtime(yaml_file))
+    with _documents_lock:
+        if _key not in _documents_cache:
+            with open(yaml_file) as _file:
+                _documents_cache[_key] = [_document for _document in yaml.safe_load_all(_file)
+                                          if _document]
+        return _documents_cache[_key]
+
+
+class ApplyResult(object):
+    """
+    Result of applying or deleting one object.
+
+    Args:
+        kind: object kind
+        name: object name
+        namespace: object namespace, None for cluster scoped objects
+        action: one of created, configured, deleted, not found, failed
+        error: error summary when action is failed
+        resource_version: resource version of created or configured object
+    """
+
+    def __init__(self, kind, name, namespace, action, error=None, resource_version=None):
+        self.kind = kind
+        self.name = name
+        self.namespace = namespace
+        self.action = action
+        self.error = error
+        self.resource_version = resource_version
+
+    def __repr__(self):
+        return "{}({}/{}, namespace={}, {}{})".format(
+            type(self).__name__, self.kind, self.name, self.namespace, self.action,
+            ', {}'.format(self.error) if self.error else '')
+
+    @property
+    def ok(self):
+        return self.action != FAILED
+
+
+class ApplyEngine(object):
+    """
+    Applies and deletes yaml documents through OpenshiftExtendedClient dynamic client,
+    without oc process. Documents are sent in parallel, Namespace and
+    CustomResourceDefinition documents are applied first and deleted last.
+    Apply creates the object, an existing object is merge patched with the document.
+
+    Args:
+        openshift_client: OpenshiftExtendedClient instance
+        workers: number of parallel requests
+    """
+
+    def __init__(self, openshift_client, workers=8):
+        self.openshift_client = openshift_client
+        self.workers = max(int(workers or 1), 1)
+
+    def __repr__(self):
+        return "{}(workers={})".format(type(self).__name__, self.workers)
+
+    def _documents(self, source):
+        return load_documents(source) if isinstance(source, str) else list(source)
+
+    def _run(self, func, documents, namespace, first):
+        """Returns results of func(resource, document, namespace) in documents order.
+        Args:
+            func: function applying or deleting one document
+            documents: list of documents
+            namespace: namespace of documents without one
+            first: True runs FIRST_KINDS documents before the others, False after them
+        """
+        _early = [_d for _d in documents if _d.get('kind') in FIRST_KINDS]
+        _late = [_d for _d in documents if _d.get('kind') not in FIRST_KINDS]
+        _results = {}
+        for _wave in ([_early, _late] if first else [_late, _early]):
+            # resource discovery is resolved here, only the object calls go to the threads
+            _calls = []
+            for _document in _wave:
+                try:
+                    _calls.append((self.openshift_client._resource(
+                        kind=_document['kind'], api_version=_document.get('apiVersion', 'v1')),
+                        _document))
+                except ResourceNotFoundError as e:
+                    _name, _namespace = self._target(_document, namespace)
+                    _results[id(_document)] = ApplyResult(
+                        _document['kind'], _name, _namespace, FAILED, str(e))
+            _workers = min(self.workers, len(_calls))
+            if _workers > 1:
+                with ThreadPoolExecutor(max_workers=_workers) as _executor:
+                    _wave_results = list(_executor.map(
+                        lambda _call: func(_call[0], _call[1], namespace), _calls))
+            else:
+                _wave_results = [func(_resource, _document, namespace)
+                                 for _resource, _document in _calls]
+            for _call, _result in zip(_calls, _wave_results):
+                _results[id(_call[1])] = _result
+        return [_results[id(_document)] for _document in documents]
+
+    def _target(self, document, namespace):
+        _metadata = document.get('metadata') or {}
+        if document.get('kind') in FIRST_KINDS:
+            return _metadata.get('name'), None
+        return _metadata.get('name'), _metadata.get('namespace') or namespace
+
+    def _apply_document(self, resource, document, namespace):
+        _name, _namespace = self._target(document, namespace)
+        _body = copy.deepcopy(document)
+        if _namespace:
+            _body['metadata']['namespace'] = _namespace
+        try:
+            try:
+                _response = resource.create(body=_body, namespace=_namespace)
+                _action = CREATED
+            except ConflictError:
+                _response = resource.patch(body=_body, name=_name, namespace=_namespace,
+                                           content_type='application/merge-patch+json')
+                _action = CONFIGURED
+        except (DynamicApiError, ResourceNotFoundError) as e:
+            _error = e.summary() if isinstance(e, DynamicApiError) else str(e)
+            return ApplyResult(document['kind'], _name, _namespace, FAILED, _error)
+        _metadata = getattr(_response, 'metadata', None)
+        return ApplyResult(document['kind'], _name, _namespace, _action,
+                           resource_version=_metadata.resourceVersion if _metadata else None)
+
+    def _delete_document(self, resource, document, namespace):
+        _name, _namespace = self._target(document, namespace)
+        try:
+            resource.delete(name=_name, namespace=_namespace)
+            _action = DELETED
+        except NotFoundError:
+            _action = NOT_FOUND
+        except (DynamicApiError, ResourceNotFoundError) as e:
+            _error = e.summary() if isinstance(e, DynamicApiError) else str(e)
+            return ApplyResult(document['kind'], _name, _namespace, FAILED, _error)
+        return ApplyResult(document['kind'], _name, _namespace, _action)
+
+    def apply(self, source, namespace=None):
+        """Returns list of ApplyResult, one per document.
+        Args:
+            source: yaml file path or list of documents
+            namespace: namespace of documents without one
+        """
+        _results = self._run(self._apply_document, self._documents(source), namespace,
+                             first=True)
+        logger.debug('Applied {}: {}'.format(source if isinstance(source, str) else 'documents',
+                                             _results))
+        return _results
+
+    def delete(self, source, namespace=None):
+        """Returns list of ApplyResult, one per document, missing objects are not failures.
+        Args:
+            source: yaml file path or list of documents
+            namespace: namespace of documents without one
+        """
+        _results = self._run(self._delete_document, self._documents(source), namespace,
+                             first=False)
+        logger.debug('Deleted {}: {}'.format(source if isinstance(source, str) else 'documents',
+                                             _results))
+        return _results
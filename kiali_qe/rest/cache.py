@@ -0,0 +1,95 @@
+import copy
+import threading
+import time
+
+from collections import OrderedDict
+
+
+class ResponseCache(object):
+    """
+    Thread safe LRU cache of REST responses with per-method time to live.
+
+    Args:
+        size: maximum number of cached responses, the least recently used is dropped first
+        ttl: default time to live of a response in seconds, 0 disables caching
+        method_ttl: dict of method_name: ttl overriding the default one
+    """
+
+    def __init__(self, size=1024, ttl=5, method_ttl={}):
+        self.size = size
+        self.ttl = ttl
+        self.method_ttl = dict(method_ttl)
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return "{}(size={}, ttl={}, hits={}, misses={})".format(
+            type(self).__name__, self.size, self.ttl, self.hits, self.misses)
+
+    @staticmethod
+    def key(method_name, path=None, params=None):
+        """ Returns hashable cache key of given request """
+        return (method_name,
+                tuple(sorted(path.items())) if path else (),
+                tuple(sorted(params.items())) if params else ())
+
+    def get_ttl(self, method_name):
+        return self.method_ttl.get(method_name, self.ttl)
+
+    def get(self, key):
+        """Returns (True, response) when key is cached and not expired, (False, None) otherwise.
+        The response is a copy, callers may change it.
+        """
+        with self._lock:
+            if key not in self._items:
+                self.misses += 1
+                return False, None
+            _expires, _response = self._items[key]
+            if _expires <= time.monotonic():
+                del self._items[key]
+                self.misses += 1
+                return False, None
+            self._items.move_to_end(key)
+            self.hits += 1
+        return True, copy.deepcopy(_response)
+
+    def put(self, key, response):
+        """ Caches copy of response, the caller keeps its own """
+        _ttl = self.get_ttl(key[0])
+        if not _ttl or _ttl <= 0:
+            return
+        _response = copy.deepcopy(response)
+        with self._lock:
+            self._items[key] = (time.monotonic() + _ttl, _response)
+            self._items.move_to_end(key)
+            while len(self._items) > self.size:
+                self._items.popitem(last=False)
+
+    def invalidate(self, namespace=None):
+        """Drops cached responses affected by a change in namespace.
+        Responses without namespace in path (e.g. namespaceList) are always dropped.
+        Args:
+            namespace: changed namespace, None drops everything
+        """
+        with self._lock:
+            for _key in list(self._items.keys()):
+                _namespace = dict(_key[1]).get('namespace')
+                if namespace is None or _namespace is None or _namespace == namespace:
+                    del self._items[_key]
+                    self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def stats(self):
+        """ Returns dict of cache counters """
+        _total = self.hits + self.misses
+        return {'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(float(self.hits) / _total, 3) if _total else 0.0,
+                'invalidations': self.invalidations,
+                'size': len(self._items)}
@@ -0,0 +1,250 @@
+import gzip
+import importlib
+import json
+import os
+import threading
+import time
+
+from collections import defaultdict, deque
+
+from kiali_qe.utils.log import logger
+
+RECORD = 'record'
+REPLAY = 'replay'
+
+TIMING_ORIGINAL = 'original'
+TIMING_FAST = 'fast'
+
+# type of OpenShift dynamic client results in cassettes which do not record it
+RESOURCE_INSTANCE = 'kubernetes.dynamic.resource.ResourceInstance'
+
+
+class CassetteError(Exception):
+    pass
+
+
+class CassetteResponse(object):
+    """
+    Replayed http response with the part of requests.Response api used by the clients.
+
+    Args:
+        status_code: http status code
+        text: response body
+    """
+
+    def __init__(self, status_code, text):
+        self.status_code = status_code
+        self.text = text
+
+    def __repr__(self):
+        return "{}({})".format(type(self).__name__, self.status_code)
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    @property
+    def content(self):
+        return self.text.encode('utf-8')
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class KialiCodec(object):
+    """ Converts Kiali requests.Response to recorded data and back """
+
+    @staticmethod
+    def encode(response):
+        return {'status_code': response.status_code, 'text': response.text}
+
+    @staticmethod
+    def decode(data):
+        return CassetteResponse(data['status_code'], data['text'])
+
+    @staticmethod
+    def encode_error(error):
+        # connection errors are not part of the recorded traffic
+        return None
+
+    @staticmethod
+    def decode_error(data):
+        return CassetteError(data)
+
+
+class OpenshiftCodec(object):
+    """ Converts OpenShift dynamic client results and api errors to recorded data and back """
+
+    @staticmethod
+    def encode(result):
+        if hasattr(result, 'to_dict'):
+            # openshift and kubernetes versions differ in the instance type the client returns
+            return {'instance': result.to_dict(),
+                    'type': '{}.{}'.format(type(result).__module__, type(result).__name__)}
+        return {'value': result}
+
+    @staticmethod
+    def decode(data):
+        if 'instance' in data:
+            _module, _name = data.get('type', RESOURCE_INSTANCE).rsplit('.', 1)
+            return getattr(importlib.import_module(_module), _name)(None, data['instance'])
+        return data['value']
+
+    @staticmethod
+    def encode_error(error):
+        from openshift.dynamic import exceptions
+        if not isinstance(error, Exception) or \
+                getattr(exceptions, type(error).__name__, None) is not type(error):
+            return None
+        return {'type': type(error).__name__,
+                'status': getattr(error, 'status', None),
+                'reason': getattr(error, 'reason', None),
+                'body': getattr(error, 'body', None),
+                'message': str(error)}
+
+    @staticmethod
+    def decode_error(data):
+        from kubernetes.client.rest import ApiException
+        from openshift.dynamic import exceptions
+        if data['status'] is not None:
+            _error = ApiException(status=data['status'], reason=data['reason'])
+            _error.body = data['body']
+            return exceptions.api_exception(_error)
+        return getattr(exceptions, data['type'])(data['message'])
+
+
+class Cassette(object):
+    """
+    Recorded REST traffic of Kiali and OpenShift clients.
+    In record mode every call is passed through and stored, save writes a gzip compressed file.
+    In replay mode calls are answered from the file without any network,
+    same calls are answered in recorded order.
+
+    Args:
+        path: cassette file path
+        mode: 'record' or 'replay'
+        timing: 'original' sleeps recorded duration of each call on replay, 'fast' does not
+    """
+
+    def __init__(self, path, mode=REPLAY, timing=TIMING_FAST):
+        if mode not in (RECORD, REPLAY):
+            raise ValueError("Cassette mode should be '{}' or '{}', got '{}'".format(
+                RECORD, REPLAY, mode))
+        self.path = path
+        self.mode = mode
+        self.timing = timing
+        self.interactions = []
+        self._started = time.monotonic()
+        self._replay = defaultdict(deque)
+        self._lock = threading.Lock()
+        if self.replaying:
+            self.load()
+
+    def __repr__(self):
+        return "{}({}, mode={}, timing={}, interactions={})".format(
+            type(self).__name__, repr(self.path), self.mode, self.timing,
+            len(self.interactions))
+
+    @property
+    def recording(self):
+        return self.mode == RECORD
+
+    @property
+    def replaying(self):
+        return self.mode == REPLAY
+
+    @staticmethod
+    def key(*args):
+        """ Returns string key of request arguments, independent of dict ordering """
+        return json.dumps(args, sort_keys=True, default=str)
+
+    def load(self):
+        with gzip.open(self.path, 'rt') as _file:
+            self.interactions = json.load(_file)['interactions']
+        for _interaction in self.interactions:
+            self._replay[_interaction['key']].append(_interaction)
+        logger.debug('Loaded cassette {}'.format(self))
+
+    def save(self):
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with self._lock:
+            _data = {'version': 1, 'interactions': list(self.interactions)}
+        with gzip.open(self.path, 'wt') as _file:
+            json.dump(_data, _file)
+        logger.debug('Saved cassette {}'.format(self))
+
+    def _next(self, key):
+        with self._lock:
+            _queue = self._replay.get(key)
+            if not _queue:
+                raise CassetteError('Request is not recorded in {}: {}'.format(self.path, key))
+            # the last recorded answer stays for any further same calls
+            return _queue.popleft() if len(_queue) > 1 else _queue[0]
+
+    def play(self, key, func, codec):
+        """Returns result of func, recorded or replayed under key.
+        Args:
+            key: request key, see Cassette.key
+            func: function sending the request
+            codec: KialiCodec or OpenshiftCodec converting the result to recorded data
+        """
+        if self.replaying:
+            _interaction = self._next(key)
+            if self.timing == TIMING_ORIGINAL:
+                time.sleep(_interaction['elapsed'])
+            if 'error' in _interaction:
+                raise codec.decode_error(_interaction['error'])
+            return codec.decode(_interaction['response'])
+        _interaction = {'key': key, 'started': round(time.monotonic() - self._started, 6)}
+        _start = time.monotonic()
+        try:
+            _result = func()
+        except Exception as e:
+            _error = codec.encode_error(e)
+            if _error is not None:
+                _interaction['elapsed'] = round(time.monotonic() - _start, 6)
+                _interaction['error'] = _error
+                with self._lock:
+                    self.interactions.append(_interaction)
+            raise
+        _interaction['elapsed'] = round(time.monotonic() - _start, 6)
+        _interaction['response'] = codec.encode(_result)
+        with self._lock:
+            self.interactions.append(_interaction)
+        return _result
+
+
+class CassetteResource(object):
+    """
+    OpenShift dynamic resource which get, create, patch, replace and delete calls
+    go through cassette. The resource itself is looked up only when a call is sent.
+
+    Args:
+        cassette: Cassette instance
+        kind: resource kind
+        api_version: resource api version
+        resolve: function returning the dynamic resource
+    """
+
+    VERBS = ('get', 'create', 'patch', 'replace', 'delete')
+
+    def __init__(self, cassette, kind, api_version, resolve):
+        self._cassette = cassette
+        self.kind = kind
+        self.api_version = api_version
+        self._resolve = resolve
+
+    def __repr__(self):
+        return "{}({}, {})".format(type(self).__name__, self.kind, self.api_version)
+
+    def __getattr__(self, name):
+        if name not in self.VERBS:
+            raise AttributeError(name)
+
+        def _call(**kwargs):
+            return self._cassette.play(
+                Cassette.key('openshift', self.kind, self.api_version, name, kwargs),
+                lambda: getattr(self._resolve(), name)(**kwargs),
+                OpenshiftCodec)
+        return _call
@@ -1,7 +1,11 @@
 import json
+import time
 
+from concurrent.futures import ThreadPoolExecutor
 from selenium.common.exceptions import NoSuchElementException
 from kiali.client import KialiClient
+from kiali_qe.rest.cassette import Cassette, KialiCodec
+from kiali_qe.rest.stats import KIALI
 from kiali_qe.components.enums import (
     IstioConfigObjectType as OBJECT_TYPE,
     IstioConfigValidation,
@@ -39,6 +43,8 @@ from kiali_qe.entities.applications import (
 from kiali_qe.entities.overview import Overview
 from kiali_qe.utils import to_linear_string, dict_to_params
 from kiali_qe.utils.date import from_rest_to_ui
+from kiali_qe.utils.convergence import wait_converged
+from kiali_qe.utils.conf import env as cfg
 from kiali_qe.utils.log import logger
 
 
@@ -63,9 +69,44 @@ ISTIO_CONFIG_TYPES = {'DestinationRule': 'destinationrules',
                       'ServiceRole': 'serviceroles',
                       'ServiceRoleBinding': 'servicerolebindings'}
 
+NAMESPACE_HEALTH_TYPES = {'app': ApplicationHealth,
+                          'service': ServiceHealth,
+                          'workload': WorkloadHealth}
+
 
 class KialiExtendedClient(KialiClient):
 
+    def __init__(self, health_workers=1, bulk_health=False, response_cache=None,
+                 transport=None, cassette=None, rest_stats=None, **kwargs):
+        """
+        Args:
+            health_workers: number of parallel per-item health requests in list methods,
+                1 keeps them sequential
+            bulk_health: fetch health of list items with one request per namespace,
+                items missing in the namespace health are fetched one by one
+            response_cache: ResponseCache instance for get_response, None disables caching
+            transport: KialiTransport instance sharing one keep-alive session,
+                None keeps a new session per request
+            cassette: Cassette instance recording or replaying all requests,
+                replaying client does not connect to Kiali at all
+            rest_stats: RestStats instance recording calls sent to Kiali, None disables it
+            kwargs: passed to KialiClient
+        """
+        self.cassette = cassette
+        if cassette is not None and cassette.replaying:
+            self.swagger_parser = None
+            self.api_connector = None
+            transport = None
+        else:
+            super(KialiExtendedClient, self).__init__(**kwargs)
+        self.transport = transport
+        if transport is not None:
+            transport.install(self.api_connector)
+        self.health_workers = max(int(health_workers or 1), 1)
+        self.bulk_health = bulk_health
+        self.response_cache = response_cache
+        self.rest_stats = rest_stats
+
     def namespace_list(self):
         """ Returns list of namespaces """
         entities = []
@@ -104,12 +145,18 @@ class KialiExtendedClient(KialiClient):
         for _namespace in namespace_list:
             _data = self.get_response('serviceList', path={'namespace': _namespace})
             _services = _data['services']
+            # services without sidecar have no health, keep them out of the namespace health
+            _healths = self._list_health(
+                _namespace, 'service',
+                [_service_rest['name'] if _service_rest['istioSidecar'] else None
+                 for _service_rest in _services],
+                self.get_service_health,
+                [{'namespace': _namespace,
+                  'service_name': _service_rest['name'],
+                  'istioSidecar': _service_rest['istioSidecar']}
+                 for _service_rest in _services])
             # update all the services to our custom entity
-            for _service_rest in _services:
-                _service_health = self.get_service_health(
-                    namespace=_namespace,
-                    service_name=_service_rest['name'],
-                    istioSidecar=_service_rest['istioSidecar'])
+            for _service_rest, _service_health in zip(_services, _healths):
                 _service = Service(
                     namespace=_namespace,
                     name=_service_rest['name'],
@@ -187,10 +234,13 @@ class KialiExtendedClient(KialiClient):
             _data = self.get_response('appList', path={'namespace': _namespace})
             _applications = _data['applications']
             if _applications:
-                for _application_rest in _applications:
-                    _app_health = self.get_app_health(
-                            namespace=_namespace,
-                            app_name=_application_rest['name'])
+                _healths = self._list_health(
+                    _namespace, 'app',
+                    [_application_rest['name'] for _application_rest in _applications],
+                    self.get_app_health,
+                    [{'namespace': _namespace, 'app_name': _application_rest['name']}
+                     for _application_rest in _applications])
+                for _application_rest, _app_health in zip(_applications, _healths):
                     _application = Application(
                         namespace=_namespace,
                         name=_application_rest['name'],
@@ -217,10 +267,13 @@ class KialiExtendedClient(KialiClient):
             _data = self.get_response('workloadList', path={'namespace': _namespace})
             _workloads = _data['workloads']
             if _workloads:
-                for _workload_rest in _workloads:
-                    _workload_health = self.get_workload_health(
-                        namespace=_namespace,
-                        workload_name=_workload_rest['name'])
+                _healths = self._list_health(
+                    _namespace, 'workload',
+                    [_workload_rest['name'] for _workload_rest in _workloads],
+                    self.get_workload_health,
+                    [{'namespace': _namespace, 'workload_name': _workload_rest['name']}
+                     for _workload_rest in _workloads])
+                for _workload_rest, _workload_health in zip(_workloads, _healths):
                     _workload = Workload(
                         namespace=_namespace,
                         name=_workload_rest['name'],
@@ -779,6 +832,30 @@ class KialiExtendedClient(KialiClient):
         else:
             return None
 
+    def get_namespace_health(self, namespace, health_type,
+                             time_interval=TimeIntervalRestParam.LAST_MINUTE.text):
+        """Returns Health of all items of given type in Namespace as dict of name: health.
+        Returns empty dict when namespace health is not available.
+        Args:
+            namespace: namespace name
+            health_type: 'app', 'service' or 'workload'
+            time_interval: The rate interval used for fetching error rate
+        """
+        try:
+            _health_data = self.get_response(method_name='namespaceHealth',
+                                             path={'namespace': namespace},
+                                             params={'type': health_type,
+                                                     'rateInterval': time_interval})
+        except Exception as e:
+            logger.warning('Namespace health of {} in {} is not available: {}'.format(
+                health_type, namespace, e))
+            return {}
+        if not isinstance(_health_data, dict) or 'error' in _health_data:
+            return {}
+        _health_class = NAMESPACE_HEALTH_TYPES[health_type]
+        return {_name: _health_class.get_from_rest(_health)
+                for _name, _health in _health_data.items() if _health}
+
     def get_istio_config_validation(self, namespace, object_type, object_name):
         """Returns Validation of Istio Config.
         Args:
@@ -791,9 +868,12 @@ class KialiExtendedClient(KialiClient):
                                            namespace=namespace,
                                            object_type=object_type,
                                            object=object_name)
-        if _health_data:
-            if len(_health_data['checks']) > 0:
-                if 'error' in set(check['severity'] for check in _health_data['checks']):
+        return self._validation_type(_health_data)
+
+    def _validation_type(self, validation):
+        if validation:
+            if len(validation['checks']) > 0:
+                if 'error' in set(check['severity'] for check in validation['checks']):
                     return IstioConfigValidation.NOT_VALID
                 else:
                     return IstioConfigValidation.WARNING
@@ -802,6 +882,65 @@ class KialiExtendedClient(KialiClient):
         else:
             return IstioConfigValidation.NA
 
+    def istio_config_observed(self, namespace, object_type, object_name):
+        """Returns (resource version, validation) of istio config as Kiali sees it now,
+        (None, None) when Kiali does not know the config. Response cache is not used.
+        Args:
+            namespace: namespace where istio config is located
+            object_type: kind of istio config, e.g. VirtualService
+            object_name: name of istio config
+        """
+        _data = self._request('istioConfigDetails',
+                              path={'namespace': namespace,
+                                    'object_type': ISTIO_CONFIG_TYPES[object_type],
+                                    'object': object_name},
+                              params={'validate': 'true'}).json()
+        if not isinstance(_data, dict) or 'error' in _data:
+            return None, None
+        _resource_version = None
+        for _value in _data.values():
+            if isinstance(_value, dict) and \
+                    (_value.get('metadata') or {}).get('name') == object_name:
+                _resource_version = _value['metadata'].get('resourceVersion')
+                break
+        return _resource_version, _data.get('validation')
+
+    def wait_istio_config_validation(self, namespace, object_type, object_name,
+                                     resource_version=None, stable_polls=None, timeout=None):
+        """Returns IstioConfigValidation of istio config once Kiali converged on it:
+        it reports the config at resource_version, when given, and the same validation
+        in stable_polls consecutive polls.
+        Args:
+            namespace: namespace where istio config is located
+            object_type: kind of istio config, e.g. VirtualService
+            object_name: name of istio config
+            resource_version: resource version of the applied config
+            stable_polls: default is kiali.convergence.stable_polls
+            timeout: seconds, default is kiali.convergence.timeout
+        """
+        def _is_observed(observed):
+            _version, _validation = observed
+            if _version is None and _validation is None:
+                # not known to Kiali yet
+                return False
+            if resource_version is None:
+                return True
+            if str(_version).isdigit() and str(resource_version).isdigit():
+                return int(_version) >= int(resource_version)
+            return _version == resource_version
+
+        _, _validation = wait_converged(
+            lambda: self.istio_config_observed(namespace, object_type, object_name),
+            condition=_is_observed,
+            stable_polls=stable_polls or cfg.kiali.convergence.stable_polls or 1,
+            timeout=timeout or cfg.kiali.convergence.timeout or 60,
+            delay=cfg.kiali.convergence.delay or 0.2,
+            max_delay=cfg.kiali.convergence.max_delay or 2.0,
+            message='validation of {} {}/{}'.format(object_type, namespace, object_name))
+        # config changed outside of this client, drop cached responses of the namespace
+        self._invalidate_cache({'namespace': namespace})
+        return self._validation_type(_validation)
+
     def get_istio_config_messages(self, namespace, object_type, object_name):
         """Returns Validation Messages of Istio Config.
         Args:
@@ -898,32 +1037,132 @@ class KialiExtendedClient(KialiClient):
             _selectors = object_rest['selectors']
         return _selectors
 
+    def _list_health(self, namespace, health_type, names, func, calls):
+        """Returns health of list items, in the same order as names.
+        Takes it from the namespace health when bulk_health is set,
+        items which are not found there are fetched by func.
+        Args:
+            namespace: namespace name
+            health_type: 'app', 'service' or 'workload'
+            names: item names, None forces the per-item request
+            func: per-item health method
+            calls: list of kwargs dicts for func, one per name
+        """
+        _bulk = self.get_namespace_health(namespace, health_type) \
+            if self.bulk_health and len(names) > 0 else {}
+        _healths = [_bulk.get(_name) for _name in names]
+        _missing = [_i for _i, _name in enumerate(names) if _name not in _bulk]
+        for _i, _health in zip(_missing, self._fetch_all(func, [calls[_i] for _i in _missing])):
+            _healths[_i] = _health
+        return _healths
+
+    def _fetch_all(self, func, calls):
+        """Returns results of func for each kwargs dict in calls, in the same order.
+        Runs up to health_workers calls in parallel.
+        Every call is completed even if some of them fail,
+        the failures are logged and the first one is raised afterwards.
+        Args:
+            func: client method to call
+            calls: list of kwargs dicts
+        """
+        if self.health_workers <= 1 or len(calls) <= 1:
+            return [func(**_kwargs) for _kwargs in calls]
+        with ThreadPoolExecutor(max_workers=min(self.health_workers, len(calls))) as _executor:
+            _futures = [_executor.submit(func, **_kwargs) for _kwargs in calls]
+        _results = []
+        _error = None
+        for _kwargs, _future in zip(calls, _futures):
+            try:
+                _results.append(_future.result())
+            except Exception as e:
+                logger.error('{} failed for {}: {}'.format(func.__name__, _kwargs, e))
+                _error = _error or e
+                _results.append(None)
+        if _error:
+            raise _error
+        return _results
+
+    def _request(self, method_name, path=None, params=None, http_method='GET', data=None):
+        """ Sends the request, through cassette when it is set """
+        def _send():
+            return super(KialiExtendedClient, self).request(
+                method_name=method_name, path=path, params=params,
+                http_method=http_method, data=data)
+
+        def _measured_send():
+            _endpoint = '{} {}'.format(http_method, method_name)
+            _start = time.perf_counter()
+            try:
+                _response = _send()
+            except Exception:
+                self.rest_stats.record(KIALI, _endpoint, time.perf_counter() - _start,
+                                       error=True)
+                raise
+            self.rest_stats.record(KIALI, _endpoint, time.perf_counter() - _start,
+                                   len(_response.content or b''),
+                                   error=_response.status_code >= 400)
+            return _response
+
+        _network = _send if self.rest_stats is None else _measured_send
+        if self.cassette is None:
+            return _network()
+        return self.cassette.play(
+            Cassette.key('kiali', method_name, path, params, http_method, data),
+            _network, KialiCodec)
+
     def get_response(self, method_name, path=None, params=None):
-        return super(KialiExtendedClient, self).request(method_name=method_name, path=path,
-                                                        params=params).json()
+        if self.response_cache is None:
+            return self._request(method_name=method_name, path=path, params=params).json()
+        _key = self.response_cache.key(method_name, path, params)
+        _found, _response = self.response_cache.get(_key)
+        if not _found:
+            _response = self._request(method_name=method_name, path=path, params=params).json()
+            self.response_cache.put(_key, _response)
+        elif self.rest_stats is not None:
+            self.rest_stats.record_cached(KIALI, 'GET {}'.format(method_name))
+        return _response
+
+    def _invalidate_cache(self, path):
+        self.invalidate_cache(path.get('namespace'))
+
+    def invalidate_cache(self, namespace=None):
+        """Drops cached responses affected by a change of namespace made without this client,
+        e.g. by OpenshiftExtendedClient.apply_yaml.
+        Args:
+            namespace: changed namespace, None drops everything
+        """
+        if self.response_cache is not None:
+            self.response_cache.invalidate(namespace)
 
     def post_response(self, method_name, data, **kwargs):
-        return super(KialiExtendedClient, self).request(
+        _response = self._request(
             method_name=method_name,
             path=kwargs,
             http_method="POST",
             data=json.dumps(data))
+        self._invalidate_cache(kwargs)
+        return _response
 
     def patch_response(self, method_name, data, **kwargs):
-        return super(KialiExtendedClient, self).request(
+        _response = self._request(
             method_name=method_name,
             path=kwargs,
             http_method="PATCH",
             data=json.dumps(data))
+        self._invalidate_cache(kwargs)
+        return _response
 
     def delete_response(self, method_name, **kwargs):
-        return super(KialiExtendedClient, self).request(
+        _response = self._request(
             method_name=method_name,
             path=kwargs,
             http_method="DELETE")
+        self._invalidate_cache(kwargs)
+        return _response
 
     def get_validation(self, method_name, **kwargs):
-        response = super(KialiExtendedClient, self).request(
+        # not cached, validations change as soon as a config is applied
+        response = self._request(
             method_name=method_name,
             path=kwargs,
             params={'validate': 'true'}).json()
@@ -1,4 +1,7 @@
 import re
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from kubernetes import config
 from openshift.dynamic import DynamicClient
 from openshift.dynamic.exceptions import NotFoundError
@@ -8,6 +11,8 @@ from kiali_qe.components.enums import (
     IstioConfigObjectType
 )
 from kiali_qe.entities import DeploymentStatus
+from kiali_qe.rest.apply import CREATED, ApplyEngine
+from kiali_qe.rest.cassette import Cassette, CassetteResource, OpenshiftCodec
 from kiali_qe.entities.istio_config import IstioConfig, IstioConfigDetails
 from kiali_qe.entities.service import Service, ServiceDetails
 from kiali_qe.entities.workload import (
@@ -22,7 +27,7 @@ from kiali_qe.entities.applications import (
     AppWorkload,
     ApplicationHealth
 )
-from kiali_qe.utils import dict_contains, to_linear_string
+from kiali_qe.utils import dict_contains
 from kiali_qe.utils.date import from_rest_to_ui
 from kiali_qe.utils.log import logger
 from kiali_qe.utils.conf import env as cfg
@@ -64,15 +69,44 @@ ISTIO_SYSTEM = "istio-system"
 
 class OpenshiftExtendedClient(object):
 
-    def __init__(self):
-        self._k8s_client = config.new_client_from_config()
-        self._dyn_client = DynamicClient(self._k8s_client)
+    def __init__(self, cassette=None, rest_stats=None):
+        """
+        Args:
+            cassette: Cassette instance recording or replaying all resource calls,
+                replaying client does not connect to the cluster at all
+            rest_stats: RestStats instance recording calls sent to the cluster,
+                None disables it
+        """
+        self.cassette = cassette
+        self.rest_stats = rest_stats
+        if cassette is not None and cassette.replaying:
+            self._k8s_client = None
+            self._dyn_client = None
+        else:
+            self._k8s_client = config.new_client_from_config()
+            if rest_stats is not None:
+                # resource get, create, delete and discovery calls all go through it
+                rest_stats.measure_api_client(self._k8s_client)
+            self._dyn_client = DynamicClient(self._k8s_client)
+        # pods and configs indexed per namespace, kept only inside index_scope
+        self._pod_indexes = {}
+        self._config_indexes = {}
+        self._index_depth = 0
+        # (kind, name, namespace) of istio configs created by this client, in creation order
+        self.created_configs = []
 
     @property
     def version(self):
-        return self._dyn_client.version
+        if self.cassette is None:
+            return self._dyn_client.version
+        return self.cassette.play(Cassette.key('openshift', 'version'),
+                                  lambda: self._dyn_client.version, OpenshiftCodec)
 
     def _resource(self, kind, api_version='v1'):
+        if self.cassette is not None:
+            return CassetteResource(
+                self.cassette, kind, api_version,
+                lambda: self._dyn_client.resources.get(kind=kind, api_version=api_version))
         return self._dyn_client.resources.get(kind=kind, api_version=api_version)
 
     @property
@@ -200,6 +234,17 @@ class OpenshiftExtendedClient(object):
         except NotFoundError:
             return False
 
+    def create_namespace(self, namespace, labels={}):
+        """Creates namespace, returns list of ApplyResult.
+        Args:
+            namespace: name of the namespace
+            labels: namespace labels, e.g. istio-injection
+        """
+        logger.debug('Creating namespace: {}'.format(namespace))
+        return ApplyEngine(self).apply([{'apiVersion': 'v1', 'kind': 'Namespace',
+                                         'metadata': {'name': namespace,
+                                                      'labels': dict(labels)}}])
+
     def application_list(self, namespaces=[]):
         """ Returns list of applications """
         result_dict = {}
@@ -273,47 +318,45 @@ class OpenshiftExtendedClient(object):
         """ Returns list of workloads
             Order of showing/hiding priority is: Deployments, ReplicaSets, Pods
         """
-        full_list = []
         filtered_list = []
-        for _key, _value in WORKLOAD_TYPES.items():
-            full_list.extend(self._workload_list(_value, _key,
-                                                 namespaces=namespaces))
+        _raw_lists = self._get_raw_items(list(WORKLOAD_TYPES.values()), namespaces=namespaces)
+        full_list = []
+        for _key, _raw_items in zip(WORKLOAD_TYPES.keys(), _raw_lists):
+            full_list.extend(self._to_workloads(_raw_items, _key))
 
-        deployment_names = [_item.name + _item.namespace for _item in full_list if
-                            _item.workload_type == WorkloadType.DEPLOYMENT.text]
+        # owners are matched by name and namespace, keep them hashed
+        deployment_names = set([(_item.name, _item.namespace) for _item in full_list if
+                                _item.workload_type == WorkloadType.DEPLOYMENT.text])
 
-        replicaset_names = [_item.name + _item.namespace for _item in full_list if
-                            _item.workload_type == WorkloadType.REPLICA_SET.text]
+        replicaset_names = set([(_item.name, _item.namespace) for _item in full_list if
+                                _item.workload_type == WorkloadType.REPLICA_SET.text])
 
         for _item in full_list:
-            _workload_name = self._get_workload_name(_item)
             if _item.workload_type == WorkloadType.REPLICA_SET.text:
-                if _workload_name + _item.namespace not in deployment_names:
-                    filtered_list.append(Workload(
-                                            name=_workload_name,
-                                            namespace=_item.namespace,
-                                            workload_type=_item.workload_type,
-                                            istio_sidecar=_item.istio_sidecar,
-                                            labels=_item.labels,
-                                            health=_item.health,
-                                            workload_status=_item.workload_status))
+                _workload_name = self._get_workload_name(_item)
+                if (_workload_name, _item.namespace) not in deployment_names:
+                    filtered_list.append(self._renamed_workload(_item, _workload_name))
             elif _item.workload_type in [WorkloadType.POD.text,
                                          WorkloadType.JOB.text]:
-                if _workload_name + _item.namespace not in replicaset_names and\
-                        _workload_name + _item.namespace not in deployment_names:
-                    filtered_list.append(Workload(
-                                            name=_workload_name,
-                                            namespace=_item.namespace,
-                                            workload_type=_item.workload_type,
-                                            istio_sidecar=_item.istio_sidecar,
-                                            labels=_item.labels,
-                                            health=_item.health,
-                                            workload_status=_item.workload_status))
+                _workload_name = self._get_workload_name(_item)
+                if (_workload_name, _item.namespace) not in replicaset_names and\
+                        (_workload_name, _item.namespace) not in deployment_names:
+                    filtered_list.append(self._renamed_workload(_item, _workload_name))
             else:
                 filtered_list.append(_item)
 
         return filtered_list
 
+    def _renamed_workload(self, workload, name):
+        return Workload(
+            name=name,
+            namespace=workload.namespace,
+            workload_type=workload.workload_type,
+            istio_sidecar=workload.istio_sidecar,
+            labels=workload.labels,
+            health=workload.health,
+            workload_status=workload.workload_status)
+
     def _workload_list(self, attribute_name, workload_type,
                        namespaces=[]):
         """ Returns list of workload
@@ -323,19 +366,12 @@ class OpenshiftExtendedClient(object):
             namespace: Namespace of the workload, optional
             workload_names: Names of the workloads, optional
         """
+        return self._to_workloads(
+            self._get_raw_items([attribute_name], namespaces=namespaces)[0], workload_type)
+
+    def _to_workloads(self, raw_items, workload_type):
         items = []
-        _raw_items = []
-        if len(namespaces) > 0:
-            # update items
-            for _namespace in namespaces:
-                _response = getattr(self, attribute_name).get(namespace=_namespace)
-                if hasattr(_response, 'items'):
-                    _raw_items.extend(_response.items)
-        else:
-            _response = getattr(self, attribute_name).get()
-            if hasattr(_response, 'items'):
-                _raw_items.extend(_response.items)
-        for _item in _raw_items:
+        for _item in raw_items:
             # update all the workloads to our custom entity
             _workload = Workload(
                 name=_item.metadata.name,
@@ -347,6 +383,38 @@ class OpenshiftExtendedClient(object):
             items.append(_workload)
         return items
 
+    def _get_raw_items(self, attribute_names, namespaces=[]):
+        """ Returns list of raw item lists, one per attribute name, in the same order.
+        All the (resource, namespace) list calls run in parallel.
+        Args:
+            attribute_names: the attributes of class for getting resources
+            namespaces: Namespaces of the resources, optional, all namespaces by default
+        """
+        # resource discovery is resolved here, only the list calls go to the threads
+        _resources = [getattr(self, _attribute_name) for _attribute_name in attribute_names]
+        _calls = []
+        for _index, _resource in enumerate(_resources):
+            if len(namespaces) > 0:
+                for _namespace in namespaces:
+                    _calls.append((_index, _resource, {'namespace': _namespace}))
+            else:
+                _calls.append((_index, _resource, {}))
+
+        def _get(call):
+            _response = call[1].get(**call[2])
+            return _response.items if hasattr(_response, 'items') else []
+
+        _workers = min(max(int(cfg.openshift.workers or 1), 1), len(_calls))
+        if _workers > 1:
+            with ThreadPoolExecutor(max_workers=_workers) as _executor:
+                _responses = list(_executor.map(_get, _calls))
+        else:
+            _responses = [_get(_call) for _call in _calls]
+        _raw_lists = [[] for _resource in _resources]
+        for _call, _items in zip(_calls, _responses):
+            _raw_lists[_call[0]].extend(_items)
+        return _raw_lists
+
     def _get_workload_status(self, item):
         if item.status.availableReplicas:
             _workload_status = DeploymentStatus(
@@ -409,7 +477,7 @@ class OpenshiftExtendedClient(object):
             return ''
 
     def _concat_labels(self, dict1, dict2):
-        result = dict1
+        result = dict(dict1)
         for _key, _value in dict2.items():
             if _key in result:
                 values = result[_key].split(',')
@@ -483,17 +551,93 @@ class OpenshiftExtendedClient(object):
         return items
 
     def get_workload_pods(self, namespace, workload_name):
-        _raw_items = []
-        _filtered_items = []
+        return list(self._get_pod_index(namespace)['workload'].get(workload_name, []))
+
+    def get_label_pods(self, namespace, label_name, label_value):
+        """ Returns the list of pods having the label in namespace """
+        return list(self._get_pod_index(namespace)['label'].get((label_name, label_value), []))
+
+    @contextmanager
+    def index_scope(self):
+        """ Reuses one pod and config list call per namespace inside the scope,
+        scopes can be nested """
+        self._index_depth += 1
+        try:
+            yield self
+        finally:
+            self._index_depth -= 1
+            if self._index_depth == 0:
+                self.invalidate_pod_index()
+                self.invalidate_config_index()
+
+    def invalidate_pod_index(self, namespace=None):
+        """ Drops the pod index of namespace, or of all namespaces when it is None """
+        if namespace is None:
+            self._pod_indexes.clear()
+        else:
+            self._pod_indexes.pop(namespace, None)
+
+    def _get_pod_index(self, namespace):
+        """ Returns pods of namespace indexed by workload name and by (label, value) """
+        if namespace in self._pod_indexes:
+            return self._pod_indexes[namespace]
+        _index = {'workload': defaultdict(list), 'label': defaultdict(list)}
         _response = getattr(self, WORKLOAD_TYPES['Pod']).get(namespace=namespace)
-        if hasattr(_response, 'items'):
-            _raw_items.extend(_response.items)
-        for _item in _raw_items:
-            if self._get_workload_name(_item.metadata) == workload_name:
-                _filtered_items.append(WorkloadPod(
-                    name=_item.metadata.name,
-                    podIP=_item.status.podIP))
-        return _filtered_items
+        for _item in (_response.items if hasattr(_response, 'items') else []):
+            _pod = WorkloadPod(
+                name=_item.metadata.name,
+                podIP=_item.status.podIP)
+            _index['workload'][self._get_workload_name(_item.metadata)].append(_pod)
+            for _label in dict(_item.metadata.labels if _item.metadata.labels else {}).items():
+                _index['label'][_label].append(_pod)
+        if self._index_depth > 0:
+            self._pod_indexes[namespace] = _index
+        return _index
+
+    def invalidate_config_index(self, namespace=None):
+        """ Drops the config index of namespace, or of all namespaces when it is None """
+        if namespace is None:
+            self._config_indexes.clear()
+        else:
+            for _key in [_k for _k in self._config_indexes if _k[0] == namespace]:
+                del self._config_indexes[_key]
+
+    def _get_config_index(self, namespace, object_type):
+        """ Returns configs of object_type in namespace,
+        indexed by host and by (selector label, value) """
+        if (namespace, object_type) in self._config_indexes:
+            return self._config_indexes[(namespace, object_type)]
+        _index = {'items': [], 'host': defaultdict(list), 'label': defaultdict(list)}
+        for _item in self._get_raw_items([CONFIG_TYPES[object_type]], namespaces=[namespace])[0]:
+            _config = IstioConfig(name=_item.metadata.name,
+                                  namespace=_item.metadata.namespace,
+                                  object_type=_item.kind)
+            _index['items'].append(_config)
+            for _host in set(self._get_config_hosts(_item.spec)):
+                _index['host'][_host].append(_config)
+            _selector = _item.spec.selector if _item.spec else None
+            _labels = _selector.matchLabels if _selector else None
+            for _label in dict(_labels if _labels else {}).items():
+                _index['label'][_label].append(_config)
+        if self._index_depth > 0:
+            self._config_indexes[(namespace, object_type)] = _index
+        return _index
+
+    def _get_config_hosts(self, spec):
+        """ Returns hosts of config spec: host, hosts and route destination hosts """
+        _hosts = []
+        if not spec:
+            return _hosts
+        if spec.host:
+            _hosts.append(spec.host)
+        if spec.hosts:
+            _hosts.extend(spec.hosts)
+        for _protocol in ('http', 'tcp', 'tls'):
+            for _rule in (spec[_protocol] or []):
+                for _route in (_rule.route or []):
+                    if _route.destination and _route.destination.host:
+                        _hosts.append(_route.destination.host)
+        return _hosts
 
     def application_details(self, namespace, application_name):
         """ Returns the details of Application
@@ -538,6 +682,10 @@ class OpenshiftExtendedClient(object):
             namespace: Namespace of the service
             service_name: Service name
         """
+        with self.index_scope():
+            return self._service_details(namespace, service_name, skip_workloads)
+
+    def _service_details(self, namespace, service_name, skip_workloads):
         _response = self._service.get(namespace=namespace, name=service_name)
         _ports = ''
         for _port in _response.spec.ports:
@@ -595,14 +743,8 @@ class OpenshiftExtendedClient(object):
             namespace: Namespace where service is located
             app_label: app label value
         """
-        endpoints = []
-        _workloads = self.workload_list(namespaces=[namespace])
-        for _workload in _workloads:
-            if dict_contains(_workload.labels, ['app:{}'.format(app_label)]):
-                _pods = self.get_workload_pods(namespace, _workload.name)
-                for _pod in _pods:
-                    endpoints.append(_pod.podIP)
-        return endpoints
+        # pods carry the app label of their workload template
+        return [_pod.podIP for _pod in self.get_label_pods(namespace, 'app', app_label)]
 
     def get_service_configs(self, namespace, service_name):
         """ Returns the list of istio config pages for particular service
@@ -611,34 +753,17 @@ class OpenshiftExtendedClient(object):
             service_name: Name of service
         """
         istio_configs = []
-        _all_vs_list = self._resource_list(
-            attribute_name=CONFIG_TYPES[IstioConfigObjectType.VIRTUAL_SERVICE.text],
-            resource_type=CONFIG_TYPES[IstioConfigObjectType.VIRTUAL_SERVICE.text],
-            namespaces=[namespace])
-        for _vs_item in _all_vs_list:
-            if self._is_host_in_config(namespace, service_name, to_linear_string(
-                self.istio_config_details(
-                    namespace=namespace,
-                    object_name=_vs_item.name,
-                    object_type=IstioConfigObjectType.VIRTUAL_SERVICE.text).text)):
-                istio_configs.append(_vs_item)
-        _all_dr_list = self._resource_list(
-            attribute_name=CONFIG_TYPES[IstioConfigObjectType.DESTINATION_RULE.text],
-            resource_type=CONFIG_TYPES[IstioConfigObjectType.DESTINATION_RULE.text],
-            namespaces=[namespace])
-        for _dr_item in _all_dr_list:
-            if self._is_host_in_config(namespace, service_name, to_linear_string(
-                self.istio_config_details(
-                    namespace=namespace,
-                    object_name=_dr_item.name,
-                    object_type=IstioConfigObjectType.DESTINATION_RULE.text).text)):
-                istio_configs.append(_dr_item)
+        _hosts = [service_name, '{}.{}.svc.cluster.local'.format(service_name, namespace)]
+        for _object_type in [IstioConfigObjectType.VIRTUAL_SERVICE.text,
+                             IstioConfigObjectType.DESTINATION_RULE.text]:
+            _index = self._get_config_index(namespace, _object_type)
+            _matched = set()
+            for _host in _hosts:
+                _matched.update([id(_i) for _i in _index['host'].get(_host, [])])
+            # keep the order of list response
+            istio_configs.extend([_i for _i in _index['items'] if id(_i) in _matched])
         return istio_configs
 
-    def _is_host_in_config(self, namespace, service_name, config):
-        return 'host {} '.format(service_name) in config or \
-            'host {}.{}.svc.cluster.local '.format(service_name, namespace) in config
-
     def workload_details(self, namespace, workload_name, workload_type):
         """ Returns the details of Workload
         Args:
@@ -646,6 +771,10 @@ class OpenshiftExtendedClient(object):
             workload_name: Workload name
             workload_type: Type of workload
         """
+        with self.index_scope():
+            return self._workload_details(namespace, workload_name, workload_type)
+
+    def _workload_details(self, namespace, workload_name, workload_type):
         _response = getattr(self,
                             WORKLOAD_TYPES[workload_type]).get(
                                 namespace=namespace,
@@ -671,19 +800,9 @@ class OpenshiftExtendedClient(object):
             namespace: Namespace where service is located
             workload: Workload object
         """
-        istio_configs = []
-        _all_peer_auth_list = self._resource_list(
-            attribute_name=CONFIG_TYPES[IstioConfigObjectType.PEER_AUTHENTICATION.text],
-            resource_type=CONFIG_TYPES[IstioConfigObjectType.PEER_AUTHENTICATION.text],
-            namespaces=[namespace])
-        for _peer_auth_item in _all_peer_auth_list:
-            if 'app {}'.format(self._get_app_name(workload)) in to_linear_string(
-                self.istio_config_details(
-                    namespace=namespace,
-                    object_name=_peer_auth_item.name,
-                    object_type=IstioConfigObjectType.PEER_AUTHENTICATION.text).text):
-                istio_configs.append(_peer_auth_item)
-        return istio_configs
+        _index = self._get_config_index(namespace,
+                                        IstioConfigObjectType.PEER_AUTHENTICATION.text)
+        return list(_index['label'].get(('app', self._get_app_name(workload)), []))
 
     def istio_config_details(self, namespace, object_name, object_type):
         """ Returns the details of Istio Config
@@ -705,19 +824,64 @@ class OpenshiftExtendedClient(object):
 
     def delete_istio_config(self, name, namespace, kind, api_version):
         logger.debug('Deleting istio config: {}, from namespace: {}'.format(name, namespace))
+        self.invalidate_pod_index(namespace)
+        self.invalidate_config_index(namespace)
         try:
             self._istio_config(kind=kind, api_version=api_version).delete(name=name,
                                                                           namespace=namespace)
         except NotFoundError:
             pass
 
+    def delete_istio_configs(self, configs):
+        """Deletes istio configs, missing ones are ignored.
+        Args:
+            configs: list of IstioConfig, see istio_config_list
+        """
+        for _config in configs:
+            logger.debug('Deleting istio config: {}, from namespace: {}'.format(
+                _config.name, _config.namespace))
+            self.invalidate_pod_index(_config.namespace)
+            self.invalidate_config_index(_config.namespace)
+            try:
+                getattr(self, CONFIG_TYPES[_config.object_type]).delete(
+                    name=_config.name, namespace=_config.namespace)
+            except NotFoundError:
+                pass
+
     def create_istio_config(self, body, namespace, kind, api_version):
         logger.debug('Creating istio config: {}, from namespace: {}'.
                      format(body['metadata']['name'], namespace))
+        self.invalidate_pod_index(namespace)
+        self.invalidate_config_index(namespace)
         resp = self._istio_config(kind=kind, api_version=api_version).create(body=body,
                                                                              namespace=namespace)
+        self.created_configs.append((kind, body['metadata']['name'], namespace))
         return resp
 
+    def apply_yaml(self, yaml_file, namespace=None):
+        """Applies all documents of yaml file, returns list of ApplyResult.
+        Args:
+            yaml_file: path of multi-document yaml file
+            namespace: namespace of documents without one
+        """
+        self.invalidate_pod_index(namespace)
+        self.invalidate_config_index(namespace)
+        _results = ApplyEngine(self, workers=cfg.openshift.workers).apply(yaml_file, namespace)
+        self.created_configs.extend(
+            (_result.kind, _result.name, _result.namespace) for _result in _results
+            if _result.action == CREATED and _result.kind in CONFIG_TYPES)
+        return _results
+
+    def delete_yaml(self, yaml_file, namespace=None):
+        """Deletes all documents of yaml file, returns list of ApplyResult.
+        Args:
+            yaml_file: path of multi-document yaml file
+            namespace: namespace of documents without one
+        """
+        self.invalidate_pod_index(namespace)
+        self.invalidate_config_index(namespace)
+        return ApplyEngine(self, workers=cfg.openshift.workers).delete(yaml_file, namespace)
+
     def is_auto_mtls(self):
         return 'enableAutoMtls: true' in self._configmap.get(name=cfg.kiali.configMapName,
                                                              namespace=ISTIO_SYSTEM).data.mesh
@@ -0,0 +1,310 @@
+import json
+import re
+import threading
+import time
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from kiali_qe.rest.synthetic import CONFIG_KINDS, CREATED_AT, ISTIO_CONFIG_KEYS, SyntheticMesh
+
+BASE_PATH = '/api'
+
+# (http method, swagger operationId, path) of Kiali endpoints used by KialiExtendedClient
+ROUTES = (
+    ('GET', 'getStatus', '/status'),
+    ('GET', 'namespaceList', '/namespaces'),
+    ('PATCH', 'namespaceUpdate', '/namespaces/{namespace}'),
+    ('GET', 'namespaceHealth', '/namespaces/{namespace}/health'),
+    ('GET', 'serviceList', '/namespaces/{namespace}/services'),
+    ('GET', 'serviceDetails', '/namespaces/{namespace}/services/{service}'),
+    ('GET', 'serviceHealth', '/namespaces/{namespace}/services/{service}/health'),
+    ('GET', 'appList', '/namespaces/{namespace}/apps'),
+    ('GET', 'appDetails', '/namespaces/{namespace}/apps/{app}'),
+    ('GET', 'appHealth', '/namespaces/{namespace}/apps/{app}/health'),
+    ('GET', 'workloadList', '/namespaces/{namespace}/workloads'),
+    ('GET', 'workloadDetails', '/namespaces/{namespace}/workloads/{workload}'),
+    ('PATCH', 'workloadUpdate', '/namespaces/{namespace}/workloads/{workload}'),
+    ('GET', 'workloadHealth', '/namespaces/{namespace}/workloads/{workload}/health'),
+    ('GET', 'istioConfigList', '/namespaces/{namespace}/istio'),
+    ('POST', 'istioConfigCreate', '/namespaces/{namespace}/istio/{object_type}'),
+    ('GET', 'istioConfigDetails', '/namespaces/{namespace}/istio/{object_type}/{object}'),
+    ('DELETE', 'istioConfigDelete', '/namespaces/{namespace}/istio/{object_type}/{object}'),
+)
+
+
+def get_swagger():
+    """ Returns swagger 2.0 document of ROUTES, as KialiClient reads it from swagger_address """
+    _paths = {}
+    for _method, _operation, _path in ROUTES:
+        _paths.setdefault(_path, {})[_method.lower()] = {
+            'operationId': _operation,
+            'parameters': [{'name': _name, 'in': 'path', 'required': True, 'type': 'string'}
+                           for _name in re.findall(r'{(\w+)}', _path)],
+            'responses': {'200': {'description': 'OK'}}}
+    return {'swagger': '2.0',
+            'info': {'title': 'Kiali stand-in', 'version': 'stand-in'},
+            'basePath': BASE_PATH,
+            'paths': _paths}
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'
+    # headers and body are written separately, do not let them wait for delayed ack
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _dispatch(self, method):
+        self.server.standin.count_request()
+        if self.server.standin.latency:
+            time.sleep(self.server.standin.latency)
+        _url = urlparse(self.path)
+        _params = {_k: _v[0] for _k, _v in parse_qs(_url.query).items()}
+        _length = int(self.headers.get('Content-Length') or 0)
+        _body = json.loads(self.rfile.read(_length)) if _length else None
+        _status, _data = self.server.standin.handle(method, _url.path, _params, _body)
+        _content = json.dumps(_data).encode('utf-8')
+        self.send_response(_status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(_content)))
+        self.end_headers()
+        self.wfile.write(_content)
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def do_PATCH(self):
+        self._dispatch('PATCH')
+
+    def do_DELETE(self):
+        self._dispatch('DELETE')
+
+
+class KialiStandInServer(object):
+    """
+    Local HTTP server answering the Kiali REST endpoints of ROUTES from SyntheticMesh data.
+    Istio configs created and deleted through the server are kept on top of the mesh ones.
+    Lets KialiExtendedClient run without cluster, e.g. for profiling and benchmarks.
+
+    Args:
+        mesh: SyntheticMesh instance, default one is created when None
+        latency: seconds added to every response
+        host: address to listen on
+        port: port to listen on, 0 picks a free one
+        ssl_context: server side ssl.SSLContext to serve https, None serves http
+    """
+
+    def __init__(self, mesh=None, latency=0.0, host='127.0.0.1', port=0, ssl_context=None):
+        self.mesh = mesh if mesh is not None else SyntheticMesh()
+        self.latency = float(latency or 0)
+        self.requests = 0
+        self._host = host
+        self._port = port
+        self.ssl_context = ssl_context
+        self._server = None
+        self._thread = None
+        self._lock = threading.Lock()
+        # (namespace, plural type, name): created config body, None when deleted
+        self._changed_configs = {}
+        self._routes = [(_method, _operation,
+                         re.compile('^{}{}$'.format(
+                             BASE_PATH, re.sub(r'{(\w+)}', r'(?P<\1>[^/]+)', _path))))
+                        for _method, _operation, _path in ROUTES]
+
+    def __repr__(self):
+        return "{}({}://{}, mesh={}, latency={})".format(
+            type(self).__name__, self.scheme, self.hostname, repr(self.mesh), self.latency)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    @property
+    def hostname(self):
+        """ Returns host:port, KialiClient hostname of the server """
+        return '{}:{}'.format(*self._server.server_address[:2])
+
+    @property
+    def scheme(self):
+        return 'https' if self.ssl_context is not None else 'http'
+
+    @property
+    def swagger_address(self):
+        return '{}://{}/swagger.json'.format(self.scheme, self.hostname)
+
+    def start(self):
+        self._server = ThreadingHTTPServer((self._host, self._port), _StandInHandler)
+        self._server.daemon_threads = True
+        self._server.standin = self
+        if self.ssl_context is not None:
+            # handshake runs in the request thread on first read, not in the accepting one
+            self._server.socket = self.ssl_context.wrap_socket(
+                self._server.socket, server_side=True, do_handshake_on_connect=False)
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        name='kiali-standin', daemon=True)
+        self._thread.start()
+        # not imported at module level, the synthetic data generator runs without log config
+        from kiali_qe.utils.log import logger
+        logger.debug('Kiali stand-in server started: {}'.format(self))
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            from kiali_qe.utils.log import logger
+            logger.debug('Kiali stand-in server stopped after {} requests'.format(self.requests))
+            self._server = None
+
+    def count_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def handle(self, method, path, params, body):
+        """ Returns (http status, json data) of the request """
+        if method == 'GET' and path == '/swagger.json':
+            return 200, get_swagger()
+        for _method, _operation, _pattern in self._routes:
+            _match = _pattern.match(path)
+            if _match and _method == method:
+                _path = _match.groupdict()
+                if 'namespace' in _path and not self.mesh.has_namespace(_path['namespace']):
+                    return 404, {'error': 'Namespace {} not found'.format(_path['namespace'])}
+                return getattr(self, '_{}'.format(_operation))(_path, params, body)
+        return 404, {'error': 'Not found: {} {}'.format(method, path)}
+
+    def _getStatus(self, path, params, body):
+        return 200, {'status': {'Kiali version': 'stand-in', 'Kiali state': 'running'},
+                     'externalServices': [{'name': 'Istio', 'version': 'stand-in'}]}
+
+    def _configs(self, namespace):
+        """ Returns istio configs of namespace by plural type, with the changed ones """
+        _configs = {_type: [] for _type in ISTIO_CONFIG_KEYS}
+        with self._lock:
+            _changed = {_key: _body for _key, _body in self._changed_configs.items()
+                        if _key[0] == namespace}
+        for _config in self.mesh.configs(namespace):
+            _key = (namespace, CONFIG_KINDS[_config['kind']][1], _config['metadata']['name'])
+            if _key not in _changed:
+                _configs[_key[1]].append(_config)
+        for (_namespace, _type, _name), _body in _changed.items():
+            if _body is not None:
+                _configs[_type].append(_body)
+        return _configs
+
+    def _get_config(self, namespace, object_type, name):
+        for _config in self._configs(namespace).get(object_type, []):
+            if _config['metadata']['name'] == name:
+                return _config
+        return None
+
+    def _namespaceList(self, path, params, body):
+        return 200, self.mesh.namespace_list()
+
+    def _namespaceUpdate(self, path, params, body):
+        return 200, {'name': path['namespace']}
+
+    def _namespaceHealth(self, path, params, body):
+        return 200, self.mesh.namespace_health(path['namespace'], params.get('type', 'app'))
+
+    def _serviceList(self, path, params, body):
+        return 200, self.mesh.service_list(path['namespace'])
+
+    def _serviceDetails(self, path, params, body):
+        _namespace = path['namespace']
+        _app = self.mesh.app(_namespace, path['service'])
+        if _app is None:
+            return 404, {'error': 'Service {} not found'.format(path['service'])}
+        return 200, self.mesh.service_details(_namespace, _app, self._configs(_namespace))
+
+    def _serviceHealth(self, path, params, body):
+        _app = self.mesh.app(path['namespace'], path['service'])
+        if _app is None:
+            return 404, {'error': 'Service {} not found'.format(path['service'])}
+        return 200, self.mesh.service_health(path['namespace'], _app)
+
+    def _appList(self, path, params, body):
+        return 200, self.mesh.app_list(path['namespace'])
+
+    def _appDetails(self, path, params, body):
+        _app = self.mesh.app(path['namespace'], path['app'])
+        if _app is None:
+            return 404, {'error': 'App {} not found'.format(path['app'])}
+        return 200, self.mesh.app_details(path['namespace'], _app)
+
+    def _appHealth(self, path, params, body):
+        _app = self.mesh.app(path['namespace'], path['app'])
+        if _app is None:
+            return 404, {'error': 'App {} not found'.format(path['app'])}
+        return 200, self.mesh.app_health(path['namespace'], _app)
+
+    def _workloadList(self, path, params, body):
+        return 200, self.mesh.workload_list(path['namespace'])
+
+    def _workloadDetails(self, path, params, body):
+        _app, _workload = self.mesh.workload(path['namespace'], path['workload'])
+        if _workload is None:
+            return 404, {'error': 'Workload {} not found'.format(path['workload'])}
+        return 200, self.mesh.workload_details(path['namespace'], _app, _workload)
+
+    def _workloadUpdate(self, path, params, body):
+        return 200, {'name': path['workload']}
+
+    def _workloadHealth(self, path, params, body):
+        _app, _workload = self.mesh.workload(path['namespace'], path['workload'])
+        if _workload is None:
+            return 404, {'error': 'Workload {} not found'.format(path['workload'])}
+        return 200, self.mesh.workload_health(path['namespace'], _workload)
+
+    def _istioConfigList(self, path, params, body):
+        _data = {'namespace': {'name': path['namespace']}}
+        for _type, _items in self._configs(path['namespace']).items():
+            _data[ISTIO_CONFIG_KEYS[_type][0]] = _items
+        return 200, _data
+
+    def _istioConfigCreate(self, path, params, body):
+        _type = path['object_type']
+        if _type not in ISTIO_CONFIG_KEYS:
+            return 400, {'error': 'Object type {} not supported'.format(_type)}
+        _body = dict(body)
+        _body['metadata'] = dict(_body.get('metadata', {}))
+        _body['metadata'].update({'namespace': path['namespace'],
+                                  'creationTimestamp': CREATED_AT, 'resourceVersion': '1'})
+        with self._lock:
+            self._changed_configs[
+                (path['namespace'], _type, _body['metadata']['name'])] = _body
+        return 200, _body
+
+    def _istioConfigDetails(self, path, params, body):
+        _type = path['object_type']
+        if _type not in ISTIO_CONFIG_KEYS:
+            return 404, {'error': 'Istio config {} not found'.format(path['object'])}
+        _config = self._get_config(path['namespace'], _type, path['object'])
+        if _config is None:
+            return 404, {'error': 'Istio config {} not found'.format(path['object'])}
+        _data = {_key: None for _list_key, _key in ISTIO_CONFIG_KEYS.values()}
+        _data['namespace'] = {'name': path['namespace']}
+        _data['objectType'] = _type
+        _data[ISTIO_CONFIG_KEYS[_type][1]] = _config
+        if params.get('validate') == 'true':
+            _data['validation'] = self.mesh.istio_config_validation(
+                path['namespace'], _type, path['object'])
+        return 200, _data
+
+    def _istioConfigDelete(self, path, params, body):
+        _type = path['object_type']
+        if _type not in ISTIO_CONFIG_KEYS or \
+                self._get_config(path['namespace'], _type, path['object']) is None:
+            return 404, {'error': 'Istio config {} not found'.format(path['object'])}
+        with self._lock:
+            self._changed_configs[(path['namespace'], _type, path['object'])] = None
+        return 200, {}
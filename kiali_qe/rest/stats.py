@@ -0,0 +1,220 @@
+import json
+import math
+import threading
+import time
+from collections import OrderedDict
+
+KIALI = 'kiali'
+OPENSHIFT = 'openshift'
+
+PERCENTILES = (50, 95, 99)
+
+# smallest recorded latency, histogram buckets are relative to it
+_MIN_SECONDS = 1e-6
+
+
+class LatencyHistogram(object):
+    """
+    Histogram of latencies with logarithmic buckets, memory does not grow with recorded values.
+    Percentiles are upper bounds of their bucket, at most precision above the real value.
+
+    Args:
+        precision: relative width of a bucket
+    """
+
+    def __init__(self, precision=0.05):
+        self.precision = precision
+        self._log_base = math.log(1 + precision)
+        self.buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def __repr__(self):
+        return "{}(count={}, p50={:.4f}, max={:.4f})".format(
+            type(self).__name__, self.count, self.percentile(50), self.max)
+
+    def record(self, seconds):
+        _index = int(math.log(max(seconds, _MIN_SECONDS) / _MIN_SECONDS) / self._log_base)
+        self.buckets[_index] = self.buckets.get(_index, 0) + 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, percent):
+        """ Returns latency in seconds which percent of recorded values do not exceed """
+        if not self.count:
+            return 0.0
+        _rank = max(math.ceil(self.count * percent / 100.0), 1)
+        _seen = 0
+        for _index in sorted(self.buckets):
+            _seen += self.buckets[_index]
+            if _seen >= _rank:
+                return min(_MIN_SECONDS * math.exp((_index + 1) * self._log_base), self.max)
+        return self.max
+
+
+class EndpointStats(object):
+    """
+    Calls of one REST endpoint.
+
+    Args:
+        client: kiali or openshift
+        endpoint: endpoint name, e.g. GET serviceHealth or GET pods/{name}
+    """
+
+    def __init__(self, client, endpoint):
+        self.client = client
+        self.endpoint = endpoint
+        self.calls = 0
+        self.errors = 0
+        self.cached = 0
+        self.bytes = 0
+        self.latency = LatencyHistogram()
+
+    def __repr__(self):
+        return "{}({} {}, calls={}, cached={}, bytes={})".format(
+            type(self).__name__, self.client, self.endpoint, self.calls, self.cached, self.bytes)
+
+    def to_dict(self):
+        _dict = OrderedDict([('client', self.client), ('endpoint', self.endpoint),
+                             ('calls', self.calls), ('errors', self.errors),
+                             ('cached', self.cached), ('bytes', self.bytes),
+                             ('seconds', round(self.latency.total, 6)),
+                             ('max', round(self.latency.max, 6))])
+        for _percent in PERCENTILES:
+            _dict['p{}'.format(_percent)] = round(self.latency.percentile(_percent), 6)
+        return _dict
+
+
+def k8s_endpoint(method, path):
+    """Returns endpoint of kubernetes API request without namespace and object names,
+    e.g. GET pods/{name} for GET /api/v1/namespaces/bookinfo/pods/reviews-v1-abc.
+    Args:
+        method: http method
+        path: request path
+    """
+    _parts = path.split('?', 1)[0].strip('/').split('/')
+    # /api/<version>/... and /apis/<group>/<version>/...
+    _offset = {'api': 2, 'apis': 3}.get(_parts[0])
+    _resource = _parts[_offset:] if _offset else []
+    if not _resource:
+        # discovery
+        return '{} {}'.format(method, path)
+    if _resource[0] == 'namespaces' and len(_resource) > 2:
+        _resource = _resource[2:]
+    _name = _resource[0]
+    if len(_resource) > 1:
+        _name = '/'.join([_name, '{name}'] + _resource[2:])
+    return '{} {}'.format(method, _name)
+
+
+class RestStats(object):
+    """
+    Thread safe call accounting of Kiali and OpenShift REST clients:
+    calls, errors, response cache hits, response bytes and latency percentiles per endpoint.
+    """
+
+    def __init__(self):
+        self.endpoints = OrderedDict()
+        self.started = time.time()
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return "{}(endpoints={}, calls={})".format(
+            type(self).__name__, len(self.endpoints),
+            sum(_stats.calls for _stats in self.endpoints.values()))
+
+    def _endpoint(self, client, endpoint):
+        _key = (client, endpoint)
+        if _key not in self.endpoints:
+            self.endpoints[_key] = EndpointStats(client, endpoint)
+        return self.endpoints[_key]
+
+    def record(self, client, endpoint, seconds, size=0, error=False):
+        """Records one call sent over the network.
+        Args:
+            client: kiali or openshift
+            endpoint: endpoint name
+            seconds: latency including reading the response body
+            size: response body bytes
+            error: True when the call failed or returned error status
+        """
+        with self._lock:
+            _stats = self._endpoint(client, endpoint)
+            _stats.calls += 1
+            _stats.errors += int(error)
+            _stats.bytes += size
+            _stats.latency.record(seconds)
+
+    def record_cached(self, client, endpoint):
+        """ Records call answered from the response cache, without network """
+        with self._lock:
+            self._endpoint(client, endpoint).cached += 1
+
+    def counts(self):
+        """ Returns dict of (client, endpoint) to number of calls, see calls_since """
+        with self._lock:
+            return {_key: _stats.calls for _key, _stats in self.endpoints.items()}
+
+    def calls_since(self, counts):
+        """Returns dict of (client, endpoint) to calls made after counts were taken,
+        e.g. to assert the number of calls of a test step.
+        Args:
+            counts: result of counts
+        """
+        return {_key: _calls - counts.get(_key, 0) for _key, _calls in self.counts().items()
+                if _calls - counts.get(_key, 0)}
+
+    def measure_api_client(self, api_client):
+        """Records calls of kubernetes ApiClient, which all dynamic client resources use.
+        Args:
+            api_client: kubernetes.client.ApiClient instance
+        """
+        _call_api = type(api_client).call_api.__get__(api_client)
+
+        def _measured_call_api(resource_path, method, *args, **kwargs):
+            _endpoint = k8s_endpoint(method, resource_path)
+            _start = time.perf_counter()
+            try:
+                _response = _call_api(resource_path, method, *args, **kwargs)
+                # dynamic client reads the body later, read it here to time the whole call
+                _data = getattr(_response, 'data', None)
+            except Exception:
+                self.record(OPENSHIFT, _endpoint, time.perf_counter() - _start, error=True)
+                raise
+            self.record(OPENSHIFT, _endpoint, time.perf_counter() - _start,
+                        len(_data) if isinstance(_data, (bytes, str)) else 0)
+            return _response
+
+        api_client.call_api = _measured_call_api
+
+    def rows(self):
+        """ Returns list of endpoint dicts, the ones with most total latency first """
+        with self._lock:
+            _endpoints = list(self.endpoints.values())
+        return [_stats.to_dict() for _stats in sorted(
+            _endpoints, key=lambda _stats: _stats.latency.total, reverse=True)]
+
+    def save_json(self, path):
+        with open(path, 'w') as _file:
+            json.dump({'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                       'duration': round(time.time() - self.started, 3),
+                       'endpoints': self.rows()}, _file, indent=2)
+
+    def summary(self, count=15):
+        """ Returns lines of count endpoints with most total latency """
+        _rows = self.rows()
+        _lines = ['REST calls: {}, cached: {}, bytes: {}, seconds: {:.2f}'.format(
+            sum(_row['calls'] for _row in _rows), sum(_row['cached'] for _row in _rows),
+            sum(_row['bytes'] for _row in _rows), sum(_row['seconds'] for _row in _rows))]
+        _lines.append('{:<10} {:<40} {:>7} {:>7} {:>7} {:>11} {:>9} {:>9} {:>9} {:>9}'.format(
+            'client', 'endpoint', 'calls', 'errors', 'cached', 'bytes', 'total s', 'p50 ms',
+            'p95 ms', 'p99 ms'))
+        for _row in _rows[:count]:
+            _lines.append(
+                '{:<10} {:<40} {:>7} {:>7} {:>7} {:>11} {:>9.2f} {:>9.1f} {:>9.1f} {:>9.1f}'.format(
+                    _row['client'], _row['endpoint'], _row['calls'], _row['errors'],
+                    _row['cached'], _row['bytes'], _row['seconds'], _row['p50'] * 1000,
+                    _row['p95'] * 1000, _row['p99'] * 1000))
+        return _lines
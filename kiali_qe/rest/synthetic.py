@@ -0,0 +1,535 @@
+"""
+Seeded generator of service mesh data, as Kiali REST and Kubernetes API return it.
+
+Usage: python -m kiali_qe.rest.synthetic --namespaces 1000 --apps 10 --versions 2 --output mesh/
+"""
+import argparse
+import gzip
+import json
+import os
+import random
+
+KIALI_FILE = 'kiali.jsonl.gz'
+KUBERNETES_FILE = 'kubernetes.jsonl.gz'
+
+CREATED_AT = '2021-01-01T00:00:00Z'
+
+# istio config plural type: key in istioConfigList response, key in istioConfigDetails response
+ISTIO_CONFIG_KEYS = {
+    'destinationrules': ('destinationRules', 'destinationRule'),
+    'virtualservices': ('virtualServices', 'virtualService'),
+    'peerauthentications': ('peerAuthentications', 'peerAuthentication'),
+    'requestauthentications': ('requestAuthentications', 'requestAuthentication'),
+    'gateways': ('gateways', 'gateway'),
+    'envoyfilters': ('envoyFilters', 'envoyFilter'),
+    'serviceentries': ('serviceEntries', 'serviceEntry'),
+    'workloadentries': ('workloadEntries', 'workloadEntry'),
+    'workloadgroups': ('workloadGroups', 'workloadGroup'),
+    'sidecars': ('sidecars', 'sidecar'),
+    'authorizationpolicies': ('authorizationPolicies', 'authorizationPolicy'),
+}
+
+# workload kind: api version
+WORKLOAD_KINDS = {
+    'Deployment': 'apps/v1',
+    'DeploymentConfig': 'apps.openshift.io/v1',
+    'StatefulSet': 'apps/v1',
+    'DaemonSet': 'apps/v1',
+    'ReplicaSet': 'apps/v1',
+    'ReplicationController': 'v1',
+    'CronJob': 'batch/v1beta1',
+    'Job': 'batch/v1',
+    'Pod': 'v1',
+}
+
+# workload kind: kinds of the owned objects down to the pod
+OWNED_KINDS = {
+    'Deployment': ('ReplicaSet', 'Pod'),
+    'DeploymentConfig': ('ReplicationController', 'Pod'),
+    'StatefulSet': ('Pod',),
+    'DaemonSet': ('Pod',),
+    'ReplicaSet': ('Pod',),
+    'ReplicationController': ('Pod',),
+    'CronJob': ('Job', 'Pod'),
+    'Job': ('Pod',),
+    'Pod': (),
+}
+
+# istio config kind: (api version, plural type of ISTIO_CONFIG_KEYS)
+CONFIG_KINDS = {
+    'VirtualService': ('networking.istio.io/v1alpha3', 'virtualservices'),
+    'DestinationRule': ('networking.istio.io/v1alpha3', 'destinationrules'),
+    'Gateway': ('networking.istio.io/v1alpha3', 'gateways'),
+    'ServiceEntry': ('networking.istio.io/v1alpha3', 'serviceentries'),
+    'WorkloadEntry': ('networking.istio.io/v1alpha3', 'workloadentries'),
+    'WorkloadGroup': ('networking.istio.io/v1alpha3', 'workloadgroups'),
+    'EnvoyFilter': ('networking.istio.io/v1alpha3', 'envoyfilters'),
+    'Sidecar': ('networking.istio.io/v1alpha3', 'sidecars'),
+    'PeerAuthentication': ('security.istio.io/v1beta1', 'peerauthentications'),
+    'RequestAuthentication': ('security.istio.io/v1beta1', 'requestauthentications'),
+    'AuthorizationPolicy': ('security.istio.io/v1beta1', 'authorizationpolicies'),
+}
+
+SIDECAR_ANNOTATION = 'sidecar.istio.io/status'
+
+# characters of generated kubernetes name suffixes
+NAME_SUFFIX_CHARS = 'bcdfghjklmnpqrstvwxz2456789'
+
+
+class SyntheticMesh(object):
+    """
+    Deterministic mesh of N namespaces x M apps x K versions.
+    Every app has a service, VirtualService and DestinationRule and one workload per version,
+    workload kinds rotate over all WORKLOAD_KINDS, every namespace has one config
+    of each remaining CONFIG_KINDS.
+    Each value is seeded by its own key, a namespace is generated alone and in any order,
+    so meshes of any size are streamed without holding them in memory.
+
+    Args:
+        namespaces: number of namespaces
+        apps: number of applications per namespace
+        versions: number of workload versions per application
+        pods: number of pods per workload
+        error_ratio: maximal ratio of 500 responses in generated requests
+        unavailable_ratio: ratio of workloads with unavailable pods
+        no_sidecar_ratio: ratio of applications without istio sidecar
+        invalid_ratio: ratio of istio configs with validation error or warning
+        seed: random seed
+    """
+
+    def __init__(self, namespaces=10, apps=10, versions=2, pods=1, error_ratio=0.3,
+                 unavailable_ratio=0.1, no_sidecar_ratio=0.1, invalid_ratio=0.2, seed=0):
+        self.namespace_count = namespaces
+        self.app_count = apps
+        self.version_count = versions
+        self.pods = pods
+        self.error_ratio = error_ratio
+        self.unavailable_ratio = unavailable_ratio
+        self.no_sidecar_ratio = no_sidecar_ratio
+        self.invalid_ratio = invalid_ratio
+        self.seed = seed
+        self._model = (None, None)
+
+    def __repr__(self):
+        return "{}(namespaces={}, apps={}, versions={}, seed={})".format(
+            type(self).__name__, self.namespace_count, self.app_count,
+            self.version_count, self.seed)
+
+    def _random(self, *key):
+        return random.Random('{}:{}'.format(self.seed, ':'.join(str(_k) for _k in key)))
+
+    @property
+    def namespaces(self):
+        return ['synthetic-{}'.format(_n) for _n in range(self.namespace_count)]
+
+    def has_namespace(self, namespace):
+        if not namespace.startswith('synthetic-'):
+            return False
+        _index = namespace[len('synthetic-'):]
+        return _index.isdigit() and int(_index) < self.namespace_count
+
+    def apps(self, namespace):
+        """ Returns list of app models of namespace, last generated namespace is kept """
+        # one read of the cached pair, other threads of the stand-in server replace it
+        _namespace, _cached = self._model
+        if _namespace == namespace:
+            return _cached
+        _kinds = list(WORKLOAD_KINDS)
+        _index = int(namespace.rsplit('-', 1)[1])
+        _apps = []
+        for _a in range(self.app_count):
+            _name = 'app-{}'.format(_a)
+            _sidecar = self._random(namespace, _name, 'sidecar').random() >= self.no_sidecar_ratio
+            _workloads = []
+            for _v in range(self.version_count):
+                _version = 'v{}'.format(_v + 1)
+                _kind = _kinds[(_index * self.app_count * self.version_count +
+                                _a * self.version_count + _v) % len(_kinds)]
+                _available = self.pods
+                if self._random(namespace, _name, _version, 'available').random() < \
+                        self.unavailable_ratio:
+                    _available = 0
+                _workloads.append({'name': '{}-{}'.format(_name, _version), 'kind': _kind,
+                                   'version': _version, 'sidecar': _sidecar,
+                                   'replicas': self.pods, 'available': _available})
+            _apps.append({'name': _name, 'sidecar': _sidecar, 'workloads': _workloads})
+        self._model = (namespace, _apps)
+        return _apps
+
+    def app(self, namespace, name):
+        """ Returns app model of namespace, None when there is no such app """
+        for _app in self.apps(namespace):
+            if _app['name'] == name:
+                return _app
+        return None
+
+    def workload(self, namespace, name):
+        """ Returns (app model, workload model) of namespace, (None, None) when not found """
+        for _app in self.apps(namespace):
+            for _workload in _app['workloads']:
+                if _workload['name'] == name:
+                    return _app, _workload
+        return None, None
+
+    def _requests(self, *key):
+        _ratio = self._random(*key).uniform(0, self.error_ratio)
+        return {'inbound': {'http': {'200': round(1 - _ratio, 3), '500': round(_ratio, 3)}},
+                'outbound': {}}
+
+    def _metadata(self, name, namespace, labels=None, annotations=None, owner=None):
+        _metadata = {'name': name, 'namespace': namespace, 'labels': labels or {},
+                     'creationTimestamp': CREATED_AT, 'resourceVersion': '1',
+                     'uid': '{}-{}'.format(namespace, name)}
+        if annotations:
+            _metadata['annotations'] = annotations
+        if owner is not None:
+            _metadata['ownerReferences'] = [{'apiVersion': owner['apiVersion'],
+                                             'kind': owner['kind'],
+                                             'name': owner['metadata']['name'],
+                                             'uid': owner['metadata']['uid'],
+                                             'controller': True}]
+        return _metadata
+
+    # Kiali REST payloads
+
+    def namespace_list(self):
+        return [{'name': _ns, 'labels': {'istio-injection': 'enabled'}}
+                for _ns in self.namespaces]
+
+    def service_list(self, namespace):
+        return {'namespace': {'name': namespace},
+                'services': [{'name': _app['name'], 'istioSidecar': _app['sidecar'],
+                              'labels': {'app': _app['name']}}
+                             for _app in self.apps(namespace)]}
+
+    def app_list(self, namespace):
+        return {'namespace': {'name': namespace},
+                'applications': [{'name': _app['name'], 'istioSidecar': _app['sidecar'],
+                                  'labels': {'app': _app['name'], 'version': ','.join(
+                                      _w['version'] for _w in _app['workloads'])}}
+                                 for _app in self.apps(namespace)]}
+
+    def workload_list(self, namespace):
+        return {'namespace': {'name': namespace},
+                'workloads': [self._workload_item(_app, _w)
+                              for _app in self.apps(namespace) for _w in _app['workloads']]}
+
+    def _workload_item(self, app, workload):
+        return {'name': workload['name'], 'type': workload['kind'],
+                'istioSidecar': workload['sidecar'],
+                'labels': {'app': app['name'], 'version': workload['version']},
+                'appLabel': True, 'versionLabel': True,
+                'createdAt': CREATED_AT, 'resourceVersion': '1'}
+
+    def _pods(self, namespace, app, workload):
+        return [_object for _object in self._workload_objects(namespace, app, workload)
+                if _object['kind'] == 'Pod']
+
+    def service_details(self, namespace, app, configs):
+        """Returns service details of app service.
+        Args:
+            namespace: namespace of the service
+            app: app model
+            configs: istio configs of namespace by plural type
+        """
+        _name = app['name']
+        _ips = [_pod['status']['podIP'] for _workload in app['workloads']
+                for _pod in self._pods(namespace, app, _workload)
+                if _pod['status']['phase'] == 'Running']
+        return {
+            'service': {'name': _name, 'createdAt': CREATED_AT, 'resourceVersion': '1',
+                        'type': 'ClusterIP', 'ip': '172.30.0.1', 'labels': {'app': _name},
+                        'selectors': {'app': _name},
+                        'ports': [{'name': 'http', 'port': 9080, 'protocol': 'TCP'}]},
+            'istioSidecar': app['sidecar'],
+            'workloads': [self._workload_item(app, _w) for _w in app['workloads']],
+            'virtualServices': [_config for _config in configs.get('virtualservices', [])
+                                if _config['metadata']['name'] == _name],
+            'destinationRules': [_config for _config in configs.get('destinationrules', [])
+                                 if _config['metadata']['name'] == _name],
+            'endpoints': [{'addresses': [{'ip': _ip} for _ip in _ips]}] if _ips else [],
+            'validations': {'service': {}}}
+
+    def app_details(self, namespace, app):
+        return {'name': app['name'],
+                'workloads': [{'workloadName': _w['name'], 'istioSidecar': _w['sidecar']}
+                              for _w in app['workloads']],
+                'serviceNames': [app['name']]}
+
+    def workload_details(self, namespace, app, workload):
+        _details = self._workload_item(app, workload)
+        _details.update({
+            'services': [{'name': app['name']}],
+            'pods': [{'name': _pod['metadata']['name'], 'status': _pod['status']['phase'],
+                      'versionLabel': True, 'appLabel': True}
+                     for _pod in self._pods(namespace, app, workload)]})
+        return _details
+
+    def _workload_status(self, workload):
+        return {'name': workload['name'], 'desiredReplicas': workload['replicas'],
+                'currentReplicas': workload['replicas'],
+                'availableReplicas': workload['available']}
+
+    def service_health(self, namespace, app):
+        return {'requests': self._requests(namespace, app['name'])}
+
+    def app_health(self, namespace, app):
+        return {'workloadStatuses': [self._workload_status(_w) for _w in app['workloads']],
+                'requests': self._requests(namespace, app['name'])}
+
+    def workload_health(self, namespace, workload):
+        return {'workloadStatus': self._workload_status(workload),
+                'requests': self._requests(namespace, workload['name'])}
+
+    def namespace_health(self, namespace, health_type='app'):
+        """Returns namespace health of health_type, 'app', 'service' or 'workload'"""
+        _apps = self.apps(namespace)
+        if health_type == 'service':
+            return {_app['name']: self.service_health(namespace, _app) for _app in _apps}
+        if health_type == 'workload':
+            return {_w['name']: self.workload_health(namespace, _w)
+                    for _app in _apps for _w in _app['workloads']}
+        return {_app['name']: self.app_health(namespace, _app) for _app in _apps}
+
+    def istio_config_list(self, namespace):
+        _data = {_list_key: [] for _list_key, _key in ISTIO_CONFIG_KEYS.values()}
+        _data['namespace'] = {'name': namespace}
+        for _config in self.configs(namespace):
+            _data[ISTIO_CONFIG_KEYS[CONFIG_KINDS[_config['kind']][1]][0]].append(_config)
+        return _data
+
+    def istio_config_validation(self, namespace, object_type, name):
+        """Returns validation of istio config, some of them with error or warning checks.
+        Args:
+            namespace: namespace of the config
+            object_type: plural type of ISTIO_CONFIG_KEYS, e.g. 'virtualservices'
+            name: config name
+        """
+        _random = self._random(namespace, object_type, name, 'validation')
+        _checks = []
+        if _random.random() < self.invalid_ratio:
+            _severity = _random.choice(('error', 'warning'))
+            _checks.append({'code': 'KIA0{}'.format(_random.randint(101, 1106)),
+                            'message': 'Synthetic {} of {}'.format(_severity, name),
+                            'severity': _severity,
+                            'path': 'spec'})
+        return {'name': name, 'objectType': ISTIO_CONFIG_KEYS[object_type][1].lower(),
+                'valid': not any(_c['severity'] == 'error' for _c in _checks),
+                'checks': _checks}
+
+    def kiali_payloads(self, namespace):
+        """Yields (operationId, path, params, response) of Kiali list, health and
+        validation requests of namespace."""
+        _path = {'namespace': namespace}
+        yield 'serviceList', _path, {}, self.service_list(namespace)
+        yield 'appList', _path, {}, self.app_list(namespace)
+        yield 'workloadList', _path, {}, self.workload_list(namespace)
+        for _type in ('app', 'service', 'workload'):
+            yield 'namespaceHealth', _path, {'type': _type}, \
+                self.namespace_health(namespace, _type)
+        for _app in self.apps(namespace):
+            yield 'serviceHealth', dict(_path, service=_app['name']), {}, \
+                self.service_health(namespace, _app)
+            yield 'appHealth', dict(_path, app=_app['name']), {}, \
+                self.app_health(namespace, _app)
+            for _workload in _app['workloads']:
+                yield 'workloadHealth', dict(_path, workload=_workload['name']), {}, \
+                    self.workload_health(namespace, _workload)
+        yield 'istioConfigList', _path, {}, self.istio_config_list(namespace)
+        for _config in self.configs(namespace):
+            _type = CONFIG_KINDS[_config['kind']][1]
+            yield 'istioConfigDetails', \
+                dict(_path, object_type=_type, object=_config['metadata']['name']), \
+                {'validate': 'true'}, \
+                {'validation': self.istio_config_validation(
+                    namespace, _type, _config['metadata']['name'])}
+
+    # Kubernetes objects
+
+    def _suffix(self, length, *key):
+        _random = self._random(*key)
+        return ''.join(_random.choice(NAME_SUFFIX_CHARS) for _ in range(length))
+
+    def _hash(self, *key):
+        # pod template hash, with a digit in the middle as controllers generate most of them
+        _suffix = self._suffix(8, *key)
+        return '{}{}{}'.format(_suffix[:4], self._random(*key).choice('2456789'), _suffix[4:])
+
+    def _workload_objects(self, namespace, app, workload):
+        _labels = {'app': app['name'], 'version': workload['version']}
+        _annotations = {SIDECAR_ANNOTATION: '{"version":"synthetic"}'} \
+            if workload['sidecar'] else {}
+        _template = {'metadata': {'labels': _labels, 'annotations': _annotations}}
+        _status = {'replicas': workload['replicas'],
+                   'availableReplicas': workload['available']}
+        _kind = workload['kind']
+        _objects = []
+        _owner = None
+        _name = workload['name']
+        for _index, _object_kind in enumerate((_kind,) + OWNED_KINDS[_kind]):
+            if _object_kind == 'Pod':
+                break
+            if _index > 0:
+                # owned controllers are named by their owner with a generated suffix
+                if _object_kind == 'ReplicationController':
+                    _name = '{}-1'.format(_name)
+                elif _owner['kind'] == 'CronJob':
+                    _name = '{}-{}'.format(
+                        _name, 27000000 + self._random(namespace, _name).randrange(1000000))
+                else:
+                    _name = '{}-{}'.format(_name, self._hash(namespace, _name))
+            _object = {'kind': _object_kind, 'apiVersion': WORKLOAD_KINDS[_object_kind],
+                       'metadata': self._metadata(_name, namespace, _labels, owner=_owner),
+                       'spec': {'selector': {'matchLabels': dict(_labels)},
+                                'template': _template},
+                       'status': dict(_status)}
+            _objects.append(_object)
+            _owner = _object
+        for _p in range(workload['replicas']):
+            if _kind == 'StatefulSet':
+                _pod_name = '{}-{}'.format(_name, _p)
+            elif _kind == 'Pod':
+                _pod_name = _name
+            else:
+                _pod_name = '{}-{}'.format(_name, self._suffix(5, namespace, _name, _p))
+            _objects.append({
+                'kind': 'Pod', 'apiVersion': 'v1',
+                'metadata': self._metadata(_pod_name, namespace, _labels, _annotations,
+                                           owner=_owner),
+                'spec': {'containers': [{'name': app['name'], 'image': 'synthetic/app'}]},
+                'status': {'phase': 'Running' if _p < workload['available'] else 'Pending',
+                           'podIP': '10.128.{}.{}'.format(
+                               *divmod(self._random(namespace, _pod_name).randrange(65024),
+                                       254))}})
+            if _kind == 'Pod':
+                break
+        return _objects
+
+    def _config(self, namespace, kind, name, spec):
+        return {'kind': kind, 'apiVersion': CONFIG_KINDS[kind][0],
+                'metadata': self._metadata(name, namespace), 'spec': spec}
+
+    def configs(self, namespace):
+        """ Returns istio configs of namespace """
+        _configs = []
+        for _app in self.apps(namespace):
+            _name = _app['name']
+            _versions = [_w['version'] for _w in _app['workloads']]
+            _configs.append(self._config(namespace, 'VirtualService', _name, {
+                'hosts': [_name], 'http': [{'route': [
+                    {'destination': {'host': _name, 'subset': _version},
+                     'weight': 100 // len(_versions)} for _version in _versions]}]}))
+            _configs.append(self._config(namespace, 'DestinationRule', _name, {
+                'host': '{}.{}.svc.cluster.local'.format(_name, namespace),
+                'subsets': [{'name': _version, 'labels': {'version': _version}}
+                            for _version in _versions]}))
+        _selector = {'matchLabels': {'app': 'app-0'}}
+        _configs.extend([
+            self._config(namespace, 'Gateway', 'gateway', {
+                'selector': {'istio': 'ingressgateway'},
+                'servers': [{'port': {'number': 80, 'name': 'http', 'protocol': 'HTTP'},
+                             'hosts': ['*']}]}),
+            self._config(namespace, 'ServiceEntry', 'external', {
+                'hosts': ['external.example.com'], 'location': 'MESH_EXTERNAL',
+                'ports': [{'number': 443, 'name': 'https', 'protocol': 'TLS'}]}),
+            self._config(namespace, 'WorkloadEntry', 'vm', {
+                'address': '192.168.0.1', 'labels': {'app': 'vm'}}),
+            self._config(namespace, 'WorkloadGroup', 'vm-group', {
+                'metadata': {'labels': {'app': 'vm'}}, 'template': {'ports': {}}}),
+            self._config(namespace, 'EnvoyFilter', 'filter', {
+                'workloadSelector': {'labels': {'app': 'app-0'}}, 'configPatches': []}),
+            self._config(namespace, 'Sidecar', 'default', {
+                'egress': [{'hosts': ['./*', 'istio-system/*']}]}),
+            self._config(namespace, 'PeerAuthentication', 'default', {
+                'mtls': {'mode': 'STRICT'}}),
+            self._config(namespace, 'RequestAuthentication', 'jwt', {
+                'selector': _selector,
+                'jwtRules': [{'issuer': 'issuer@example.com'}]}),
+            self._config(namespace, 'AuthorizationPolicy', 'allow', {
+                'selector': _selector, 'rules': [{}]}),
+        ])
+        return _configs
+
+    def k8s_objects(self, namespace):
+        """ Yields Kubernetes objects of namespace, Namespace first """
+        yield {'kind': 'Namespace', 'apiVersion': 'v1',
+               'metadata': {'name': namespace, 'labels': {'istio-injection': 'enabled'},
+                            'creationTimestamp': CREATED_AT, 'resourceVersion': '1',
+                            'uid': namespace}}
+        for _index, _app in enumerate(self.apps(namespace)):
+            _name = _app['name']
+            yield {'kind': 'Service', 'apiVersion': 'v1',
+                   'metadata': self._metadata(_name, namespace, {'app': _name}),
+                   'spec': {'type': 'ClusterIP',
+                            'clusterIP': '172.30.{}.{}'.format(_index // 250,
+                                                               _index % 250 + 1),
+                            'selector': {'app': _name},
+                            'ports': [{'name': 'http', 'port': 9080, 'protocol': 'TCP'}]}}
+            for _workload in _app['workloads']:
+                for _object in self._workload_objects(namespace, _app, _workload):
+                    yield _object
+        for _config in self.configs(namespace):
+            yield _config
+
+    # streaming
+
+    def write(self, directory):
+        """Writes Kiali payloads and Kubernetes objects of all namespaces as gzip compressed
+        json lines, namespace by namespace. Returns (kiali records, kubernetes objects) counts.
+        Args:
+            directory: output directory, created when missing
+        """
+        os.makedirs(directory, exist_ok=True)
+        _kiali = 0
+        _objects = 0
+        with gzip.open(os.path.join(directory, KIALI_FILE), 'wt') as _kiali_file, \
+                gzip.open(os.path.join(directory, KUBERNETES_FILE), 'wt') as _k8s_file:
+            _kiali_file.write(json.dumps({'operation': 'namespaceList', 'path': {},
+                                          'params': {}, 'response': self.namespace_list()}))
+            _kiali_file.write('\n')
+            _kiali += 1
+            for _namespace in self.namespaces:
+                for _operation, _path, _params, _response in self.kiali_payloads(_namespace):
+                    _kiali_file.write(json.dumps({'operation': _operation, 'path': _path,
+                                                  'params': _params, 'response': _response}))
+                    _kiali_file.write('\n')
+                    _kiali += 1
+                for _object in self.k8s_objects(_namespace):
+                    _k8s_file.write(json.dumps(_object))
+                    _k8s_file.write('\n')
+                    _objects += 1
+        return _kiali, _objects
+
+
+def read(path):
+    """ Yields records of json lines file written by SyntheticMesh.write """
+    with gzip.open(path, 'rt') as _file:
+        for _line in _file:
+            yield json.loads(_line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--namespaces', type=int, default=10)
+    parser.add_argument('--apps', type=int, default=10)
+    parser.add_argument('--versions', type=int, default=2)
+    parser.add_argument('--pods', type=int, default=1)
+    parser.add_argument('--error-ratio', type=float, default=0.3)
+    parser.add_argument('--unavailable-ratio', type=float, default=0.1)
+    parser.add_argument('--no-sidecar-ratio', type=float, default=0.1)
+    parser.add_argument('--invalid-ratio', type=float, default=0.2)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', required=True, help='output directory')
+    args = parser.parse_args()
+    _mesh = SyntheticMesh(namespaces=args.namespaces, apps=args.apps, versions=args.versions,
+                          pods=args.pods, error_ratio=args.error_ratio,
+                          unavailable_ratio=args.unavailable_ratio,
+                          no_sidecar_ratio=args.no_sidecar_ratio,
+                          invalid_ratio=args.invalid_ratio, seed=args.seed)
+    _kiali, _objects = _mesh.write(args.output)
+    print('{}: {} Kiali payloads, {} Kubernetes objects written to {}'.format(
+        _mesh, _kiali, _objects, args.output))
+
+
+if __name__ == '__main__':
+    main()
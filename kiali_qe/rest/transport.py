@@ -0,0 +1,97 @@
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """
+    HTTPAdapter which applies default timeout on requests sent without one.
+
+    Args:
+        timeout: (connect, read) timeout in seconds
+    """
+
+    def __init__(self, timeout=None, **kwargs):
+        self.timeout = timeout
+        super(TimeoutHTTPAdapter, self).__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.timeout
+        return super(TimeoutHTTPAdapter, self).send(request, **kwargs)
+
+
+class KialiTransport(object):
+    """
+    Shared keep-alive requests.Session for Kiali api connectors.
+    kiali-client opens a new session, hence a new TCP/TLS connection, on every request,
+    installed transport makes the connector reuse one pooled session instead.
+
+    Args:
+        pool_size: maximum number of kept alive connections per host
+        retries: number of retries on connection errors and on status_forcelist responses
+        backoff_factor: retry sleep is backoff_factor * (2 ^ (retry number - 1)) seconds
+        connect_timeout: connect timeout in seconds
+        read_timeout: read timeout in seconds
+        status_forcelist: response codes to retry on
+    """
+
+    def __init__(self, pool_size=10, retries=3, backoff_factor=0.3,
+                 connect_timeout=10, read_timeout=120,
+                 status_forcelist=(500, 502, 503, 504)):
+        self.pool_size = pool_size
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.timeout = (connect_timeout, read_timeout)
+        self.status_forcelist = tuple(status_forcelist)
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return "{}(pool_size={}, retries={}, backoff_factor={}, timeout={})".format(
+            type(self).__name__, self.pool_size, self.retries,
+            self.backoff_factor, self.timeout)
+
+    def _create_adapter(self):
+        return TimeoutHTTPAdapter(
+            timeout=self.timeout,
+            pool_connections=self.pool_size,
+            pool_maxsize=self.pool_size,
+            max_retries=Retry(total=self.retries,
+                              backoff_factor=self.backoff_factor,
+                              status_forcelist=self.status_forcelist,
+                              raise_on_status=False))
+
+    def get_session(self, connector):
+        """Returns pooled session of given connector, creates it on first call.
+        Args:
+            connector: KialiApiConnector instance
+        """
+        _key = id(connector)
+        with self._lock:
+            if _key not in self._sessions:
+                _session = requests.Session()
+                _session.auth = connector.auth
+                if connector.cookies is not None:
+                    _session.cookies = connector.cookies
+                _session.headers.update({'Content-Type': 'application/json'})
+                _adapter = self._create_adapter()
+                _session.mount('https://', _adapter)
+                _session.mount('http://', _adapter)
+                self._sessions[_key] = _session
+            return self._sessions[_key]
+
+    def install(self, connector):
+        """Makes connector send all requests through the pooled session.
+        Args:
+            connector: KialiApiConnector instance
+        """
+        connector.create_session = lambda: self.get_session(connector)
+
+    def close(self):
+        with self._lock:
+            for _session in self._sessions.values():
+                _session.close()
+            self._sessions.clear()
@@ -1,13 +1,16 @@
 import random
 import re
-import time
 import math
+from collections import OrderedDict
 
 
 from kiali_qe.components import (
     Actions,
     BreadCrumb,
     wait_to_spinner_disappear,
+    wait_not_displayed_element,
+    wait_notifications_disappear,
+    wait_count_stable,
     ListViewAbstract
 )
 from kiali_qe.components.enums import (
@@ -63,7 +66,7 @@ from kiali_qe.components.error_codes import (
     KIA0206
 )
 from kiali_qe.rest.kiali_api import ISTIO_CONFIG_TYPES
-from kiali_qe.rest.openshift_api import APP_NAME_REGEX
+from kiali_qe.rest.openshift_api import APP_NAME_REGEX, OpenshiftExtendedClient
 from kiali_qe.utils import (
     is_equal,
     is_sublist,
@@ -75,7 +78,8 @@ from kiali_qe.utils import (
 )
 from kiali_qe.utils.log import logger
 from kiali_qe.utils.command_exec import oc_apply, oc_delete
-from time import sleep
+from kiali_qe.utils.reconcile import reconcile_sources, untyped_key
+from kiali_qe.utils.timing import COMPARISON, OC_FETCH, REST_FETCH, UI_SCRAPE, timed
 from selenium.webdriver.common.keys import Keys
 from kiali_qe.pages import (
     ServicesPage,
@@ -131,7 +135,7 @@ class AbstractListPageTest(object):
     def open(self, name, namespace=None, force_refresh=False):
         # TODO added wait for unstable performance
         self.browser.send_keys_to_focused_element(Keys.ESCAPE)
-        sleep(0.5)
+        wait_not_displayed_element(self.browser)
         wait_to_spinner_disappear(self.browser)
         if namespace is not None:
             self.browser.click(self.browser.element(
@@ -240,7 +244,8 @@ class AbstractListPageTest(object):
 
         self.assert_applied_filters(filters)
         self.browser.send_keys_to_focused_element(Keys.ESCAPE)
-        sleep(0.2)
+        wait_to_spinner_disappear(self.browser)
+        wait_count_stable(self.browser, self.page.content.ITEMS)
 
     def apply_label_operation(self, label_operation):
         assert self.page.filter._label_operation.is_displayed, 'Label Operation is not displayed'
@@ -645,18 +650,20 @@ class OverviewPageTest(AbstractListPageTest):
         _ns = self.FILTER_ENUM.NAME.text
         _namespaces = [_f['value'] for _f in filters if _f['name'] == _ns]
         logger.debug('Namespaces:{}'.format(_namespaces))
-        overviews_rest = self._apply_overview_filters(self.kiali_client.overview_list(
-            namespaces=_namespaces,
-            overview_type=overview_type),
-            filters)
+        with timed(REST_FETCH):
+            overviews_rest = self._apply_overview_filters(self.kiali_client.overview_list(
+                namespaces=_namespaces,
+                overview_type=overview_type),
+                filters)
 
         # get overviews from ui
-        if list_type == self.VIEW_ENUM.LIST:
-            overviews_ui = self.page.content.list_items
-        elif list_type == self.VIEW_ENUM.EXPAND:
-            overviews_ui = self.page.content.expand_items
-        else:
-            overviews_ui = self.page.content.compact_items
+        with timed(UI_SCRAPE):
+            if list_type == self.VIEW_ENUM.LIST:
+                overviews_ui = self.page.content.list_items
+            elif list_type == self.VIEW_ENUM.EXPAND:
+                overviews_ui = self.page.content.expand_items
+            else:
+                overviews_ui = self.page.content.compact_items
 
         # compare all results
         logger.debug('Namespaces:{}'.format(_namespaces))
@@ -665,31 +672,33 @@ class OverviewPageTest(AbstractListPageTest):
         logger.debug('overviews UI:{}'.format(overviews_ui))
         logger.debug('overviews REST:{}'.format(overviews_rest))
 
-        assert len(overviews_ui) == len(overviews_rest)
+        with timed(COMPARISON):
+            assert len(overviews_ui) == len(overviews_rest)
 
-        for overview_ui in overviews_ui:
-            found = False
-            for overview_rest in overviews_rest:
-                if overview_ui.is_equal(overview_rest, advanced_check=True):
-                    found = True
-                    assert (overview_ui.healthy +
-                            overview_ui.unhealthy +
-                            overview_ui.degraded +
-                            overview_ui.na +
-                            overview_ui.idle) == \
-                        (overview_rest.healthy +
-                         overview_rest.unhealthy +
-                         overview_rest.degraded +
-                         overview_rest.na +
-                         overview_rest.idle)
-                    break
-            if not found:
-                assert found, '{} not found in REST {}'.format(overview_ui, overviews_rest)
+            for overview_ui in overviews_ui:
+                found = False
+                for overview_rest in overviews_rest:
+                    if overview_ui.is_equal(overview_rest, advanced_check=True):
+                        found = True
+                        assert (overview_ui.healthy +
+                                overview_ui.unhealthy +
+                                overview_ui.degraded +
+                                overview_ui.na +
+                                overview_ui.idle) == \
+                            (overview_rest.healthy +
+                             overview_rest.unhealthy +
+                             overview_rest.degraded +
+                             overview_rest.na +
+                             overview_rest.idle)
+                        break
+                if not found:
+                    assert found, '{} not found in REST {}'.format(overview_ui, overviews_rest)
 
-            self._assert_overview_config_status(overview_ui.namespace, overview_ui.config_status)
-            assert self.kiali_client.namespace_labels(overview_ui.namespace) == \
-                self.openshift_client.namespace_labels(
-                overview_ui.namespace)
+                self._assert_overview_config_status(overview_ui.namespace,
+                                                    overview_ui.config_status)
+                assert self.kiali_client.namespace_labels(overview_ui.namespace) == \
+                    self.openshift_client.namespace_labels(
+                    overview_ui.namespace)
 
     def _apply_overview_filters(self, overviews=[], filters=[],
                                 skip_health=False,
@@ -1093,19 +1102,22 @@ class ApplicationsPageTest(AbstractListPageTest):
 
         logger.debug('Namespaces:{}'.format(namespaces))
         # get applications from ui
-        applications_ui = self.page.content.all_items
+        with timed(UI_SCRAPE):
+            applications_ui = self.page.content.all_items
         # get from REST
-        applications_rest = self._apply_app_filters(self.kiali_client.application_list(
-            namespaces=namespaces),
-            filters,
-            label_operation)
+        with timed(REST_FETCH):
+            applications_rest = self._apply_app_filters(self.kiali_client.application_list(
+                namespaces=namespaces),
+                filters,
+                label_operation)
         # get from OC
-        applications_oc = self._apply_app_filters(self.openshift_client.application_list(
-            namespaces=namespaces),
-            filters,
-            label_operation,
-            True,
-            True)
+        with timed(OC_FETCH):
+            applications_oc = self._apply_app_filters(self.openshift_client.application_list(
+                namespaces=namespaces),
+                filters,
+                label_operation,
+                True,
+                True)
 
         # compare all results
         logger.debug('Namespaces:{}'.format(namespaces))
@@ -1120,54 +1132,17 @@ class ApplicationsPageTest(AbstractListPageTest):
                                                                      applications_rest)
         assert len(applications_rest) <= len(applications_oc)
 
-        for application_ui in applications_ui:
-            found = False
-            for application_rest in applications_rest:
-                if application_ui.is_equal(application_rest, advanced_check=True):
-                    found = True
-                    if application_ui.application_status and type(applications_ui) is not list:
-                        if applications_ui.name != "mysqldb":
-                            hel1 = application_ui.application_status.is_healthy()
-                            hel2 = application_ui.health
-                            assert hel1 == hel2, \
-                                "Application Tooltip Health {} is not equal to UI Health {} for {}"\
-                                .format(
-                                application_ui.application_status.is_healthy(),
-                                application_ui.health,
-                                application_ui.name)
-                break
-            # if not found:
-            #     assert found, '{} not found in REST'.format(application_ui)
-            found = False
-            for application_oc in applications_oc:
-                logger.debug('{} {}'.format(application_oc.name, application_oc.namespace))
-                if application_ui.is_equal(application_oc, advanced_check=False):
-                    # in OC it contains more labels, skip for jaeger and grafana
-                    # if application_ui.name != 'jaeger' or application_ui.name != 'grafana':
-                    app1 = application_ui.labels.items()
-                    app2 = application_oc.labels.items()
-                    for key in app2:
-                        assert key in app1
-                        print(key)
-                        break
-                    # assert app1[0] == app2, \
-                    #     'Expected {} but got {} labels for application {}'.format(
-                    #         application_oc.labels,
-                    #         application_ui.labels,
-                    #         application_ui.name)
-                    found = True
-                    # if application_oc.application_status and \
-                    #         application_oc.application_status.deployment_statuses:
-                    #     assert is_equal(application_rest.application_status.deployment_statuses,
-                    #                     application_oc.application_status.deployment_statuses), \
-                    #             "Application REST Status {} is not equal to OC {} for {}"\
-                    #             .format(
-                    #                     application_rest.application_status.deployment_statuses,
-                    #                     application_oc.application_status.deployment_statuses,
-                    #                     application_ui.name)
-                    break
-            if not found:
-                assert found, '{} not found in OC'.format(application_ui)
+        # in OC it contains more labels, first OC label should be shown in UI
+        with timed(COMPARISON):
+            diff = reconcile_sources(
+                applications_ui, applications_rest, applications_oc,
+                oc_compare=lambda _ui, _oc: _ui.is_equal(_oc, advanced_check=False) and
+                (not _oc.labels or list(_oc.labels.items())[0] in _ui.labels.items()),
+                rest_fields=('health', 'labels'), oc_fields=('labels',))
+        # TODO in case of unstable env health can change between UI and REST calls
+        if not diff.rest.is_equal():
+            logger.debug('Applications UI and REST differ:\n{}'.format(diff.rest.report()))
+        assert diff.oc.is_equal(allow_extra=True), diff.oc.report(allow_extra=True)
 
     def _apply_app_filters(self, applications=[], filters=[], label_operation=None,
                            skip_health=False, skip_sidecar=False):
@@ -1364,16 +1339,19 @@ class WorkloadsPageTest(AbstractListPageTest):
             self.apply_label_operation(label_operation)
 
         # get workloads from rest api
-        workloads_rest = self._apply_workload_filters(self.kiali_client.workload_list(
-            namespaces=namespaces), filters, label_operation)
+        with timed(REST_FETCH):
+            workloads_rest = self._apply_workload_filters(self.kiali_client.workload_list(
+                namespaces=namespaces), filters, label_operation)
         # get workloads from OC client
-        workloads_oc = self._apply_workload_filters(self.openshift_client.workload_list(
-            namespaces=(namespaces if namespaces else self.kiali_client.namespace_list())),
-            filters, label_operation,
-            skip_sidecar=True,
-            skip_health=True)
+        with timed(OC_FETCH):
+            workloads_oc = self._apply_workload_filters(self.openshift_client.workload_list(
+                namespaces=(namespaces if namespaces else self.kiali_client.namespace_list())),
+                filters, label_operation,
+                skip_sidecar=True,
+                skip_health=True)
         # get workloads from ui
-        workloads_ui = self.page.content.all_items
+        with timed(UI_SCRAPE):
+            workloads_ui = self.page.content.all_items
 
         # compare all results
         logger.debug('Namespaces:{}'.format(namespaces))
@@ -1388,41 +1366,14 @@ class WorkloadsPageTest(AbstractListPageTest):
         assert len(workloads_rest) <= len(workloads_oc), \
             "REST {} should be less or equal OC {}".format(workloads_rest, workloads_oc)
 
-        for workload_ui in workloads_ui:
-            found = False
-            for workload_rest in workloads_rest:
-                if workload_ui.is_equal(workload_rest, advanced_check=True):
-                    found = True
-                    # if workload_ui.workload_status:
-                    #     assert workload_ui.workload_status.is_healthy() == workload_ui.health, \
-                    #             "Workload Tooltip Health {} is not equal to UI Health {} for {}"\
-                    #             .format(
-                    #             workload_ui.workload_status.is_healthy(),
-                    #             workload_ui.health,
-                    #             workload_ui.name)
-                    # break
-            if not found:
-                assert found, '{} not found in REST'.format(workload_ui)
-            found = False
-            # --------------------
-            # this fixes error:
-            # Fail: AssertionError: Workload REST Status name:istiod, replicas:1, available:1 is not equal to OC name:grafana, replicas:1, available:1 for grafana
-            # --------------------
-            # for workload_oc in workloads_oc:
-            #     if workload_ui.is_equal(workload_oc, advanced_check=False) and \
-            #             workload_ui.labels.items() == workload_oc.labels.items():
-            #         found = True
-            #         if workload_oc.workload_status:
-            #             assert workload_rest.workload_status.workload_status.is_equal(
-            #                 workload_oc.workload_status.workload_status), \
-            #                 "Workload REST Status {} is not equal to OC {} for {}"\
-            #                 .format(
-            #                 workload_rest.workload_status.workload_status,
-            #                 workload_oc.workload_status.workload_status,
-            #                 workload_ui.name)
-            #         break
-            # if not found:
-            #     assert found, '{} not found in OC'.format(workload_ui)
+        with timed(COMPARISON):
+            diff = reconcile_sources(workloads_ui, workloads_rest, workloads_oc,
+                                     rest_fields=('health', 'icon', 'labels'))
+        assert diff.rest.is_equal(), diff.rest.report()
+        # TODO OC workload status is not stable, pods can recreate
+        if not diff.oc.is_equal(allow_extra=True):
+            logger.debug('Workloads UI and OC differ:\n{}'.format(
+                diff.oc.report(allow_extra=True)))
 
     def _apply_workload_filters(self, workloads=[], filters=[], label_operation=None,
                                 skip_sidecar=False, skip_health=False):
@@ -1683,13 +1634,16 @@ class ServicesPageTest(AbstractListPageTest):
             self.apply_label_operation(label_operation)
 
         # get services from ui
-        services_ui = self.page.content.all_items
+        with timed(UI_SCRAPE):
+            services_ui = self.page.content.all_items
         # get services from rest api
-        services_rest = self._apply_service_filters(self.kiali_client.service_list(
-            namespaces=namespaces), filters=filters)
+        with timed(REST_FETCH):
+            services_rest = self._apply_service_filters(self.kiali_client.service_list(
+                namespaces=namespaces), filters=filters)
         # get services from OC client
-        services_oc = self._apply_service_filters(self.openshift_client.service_list(
-            namespaces=namespaces), filters=filters)
+        with timed(OC_FETCH):
+            services_oc = self._apply_service_filters(self.openshift_client.service_list(
+                namespaces=namespaces), filters=filters)
 
         # compare all results
         logger.debug('Namespaces:{}'.format(namespaces))
@@ -1704,27 +1658,17 @@ class ServicesPageTest(AbstractListPageTest):
 
         assert len(services_rest) <= len(services_oc)
 
+        with timed(COMPARISON):
+            diff = reconcile_sources(
+                services_ui, services_rest, services_oc,
+                oc_compare=lambda _ui, _oc: _ui.is_equal(_oc, advanced_check=False) and
+                _ui.labels.items() == _oc.labels.items(),
+                rest_fields=('health', 'labels', 'icon'), oc_fields=('labels',))
+        # TODO REST health is not stable against UI
+        if not diff.rest.is_equal():
+            logger.debug('Services UI and REST differ:\n{}'.format(diff.rest.report()))
+        assert diff.oc.is_equal(allow_extra=True), diff.oc.report(allow_extra=True)
         for service_ui in services_ui:
-            found = False
-            # for service_rest in services_rest:
-            #     if service_ui.is_equal(service_rest, advanced_check=True):
-            #         found = True
-            #         if service_ui.service_status:
-            #             assert service_ui.service_status.is_healthy() == service_ui.health, \
-            #                     "Service Tooltip Health {} is not equal to UI Health {}".format(
-            #                     service_ui.service_status.is_healthy(),
-            #                     service_ui.health)
-            #         break
-            # if not found:
-            #     assert found, '{} not found in REST'.format(service_ui)
-            found = False
-            for service_oc in services_oc:
-                if service_ui.is_equal(service_oc, advanced_check=False):
-                    assert service_ui.labels.items() == service_oc.labels.items()
-                    found = True
-                    break
-            if not found:
-                assert found, '{} not found in OC'.format(service_ui)
             if service_ui.config_status.validation != IstioConfigValidation.NA:
                 assert '/console/namespaces/{}/services/{}'.format(
                     service_ui.namespace,
@@ -2095,38 +2039,33 @@ class IstioConfigPageTest(AbstractListPageTest):
         _istio_names = [_f['value'] for _f in filters if _f['name'] == _sn]
 
         # get rules from rest api
-        config_list_rest = self.kiali_client.istio_config_list(
-            namespaces=namespaces, config_names=_istio_names)
+        with timed(REST_FETCH):
+            config_list_rest = self.kiali_client.istio_config_list(
+                namespaces=namespaces, config_names=_istio_names)
         logger.debug('Istio config list REST:{}]'.format(config_list_rest))
 
         # get rules from ui
-        config_list_ui = self.page.content.all_items
+        with timed(UI_SCRAPE):
+            config_list_ui = self.page.content.all_items
         logger.debug('Istio config list UI:{}]'.format(config_list_ui))
 
         # get configs from OC api
-        config_list_oc = self.openshift_client.istio_config_list(
-            namespaces=namespaces, config_names=_istio_names)
+        with timed(OC_FETCH):
+            config_list_oc = self.openshift_client.istio_config_list(
+                namespaces=namespaces, config_names=_istio_names)
         logger.debug('Istio config list OC API:{}]'.format(config_list_oc))
 
         # compare 3 way results
         assert len(config_list_ui) == len(config_list_rest), \
             "UI {} and REST {} config number not equal".format(config_list_ui, config_list_rest)
         assert len(config_list_ui) == len(config_list_oc)
+        # OC object type is resource kind, join it on name and namespace only
+        with timed(COMPARISON):
+            diff = reconcile_sources(config_list_ui, config_list_rest, config_list_oc,
+                                     rest_fields=('object_type', 'validation'),
+                                     oc_key=untyped_key, oc_allow_extra=False)
+        assert diff.is_equal(), diff.report()
         for config_ui in config_list_ui:
-            found = False
-            for config_rest in config_list_rest:
-                if config_ui.is_equal(config_rest, advanced_check=True):
-                    found = True
-                    break
-            if not found:
-                assert found, '{} not found in REST'.format(config_ui)
-            found = False
-            for config_oc in config_list_oc:
-                if config_ui.is_equal(config_oc, advanced_check=False):
-                    found = True
-                    break
-            if not found:
-                assert found, '{} not found in OC'.format(config_ui)
             if config_ui.validation != IstioConfigValidation.NA:
                 assert '/console/namespaces/{}/istio/{}/{}?list=yaml'.format(
                     config_ui.namespace,
@@ -2392,8 +2331,8 @@ class IstioConfigPageTest(AbstractListPageTest):
     def delete_istio_config(self, name, object_type, namespace=None):
         logger.debug('Deleting istio config: {}, from namespace: {}'.format(name, namespace))
         self.load_details_page(name, namespace, object_type, force_refresh=False, load_only=True)
-        # TODO: wait for all notification boxes to disappear, those are blocking the button
-        time.sleep(10)
+        # notification boxes are blocking the button
+        wait_notifications_disappear(self.browser)
         self.page.actions.select('Delete')
         self.browser.click(self.browser.element(
             parent=ListViewAbstract.DIALOG_ROOT,
@@ -2465,14 +2404,53 @@ class ValidationsTest(object):
         self.objects_path = objects_path
 
     def _istio_config_create(self, yaml_file, namespace):
+        """ Returns list of ApplyResult, empty when applied by oc command """
         self._istio_config_delete(yaml_file, namespace=namespace)
 
-        oc_apply(yaml_file=yaml_file,
-                 namespace=namespace)
+        try:
+            if isinstance(self.openshift_client, OpenshiftExtendedClient):
+                _results = self.openshift_client.apply_yaml(yaml_file, namespace=namespace)
+                _failed = [_result for _result in _results if not _result.ok]
+                assert not _failed, 'Scenario {} not applied: {}'.format(yaml_file, _failed)
+                return _results
+            else:
+                # without OC client, e.g. cfg.kiali.skip_oc, the oc command is used
+                oc_apply(yaml_file=yaml_file,
+                         namespace=namespace)
+                return []
+        finally:
+            # changed without kiali client, its cached responses are stale
+            self.kiali_client.invalidate_cache(namespace)
+
+    def _wait_converged(self, results, config_validation_objects=[]):
+        """
+            Waits until Kiali reports the applied istio configs at their resource versions
+            and stable validations of the checked objects.
+        """
+        _applied = OrderedDict()
+        for _result in results:
+            if _result.kind in ISTIO_CONFIG_TYPES and _result.resource_version:
+                _applied[(_result.kind, _result.name, _result.namespace)] = \
+                    _result.resource_version
+        _checked = [(_object.object_type, _object.object_name, _object.namespace)
+                    for _object in config_validation_objects]
+        for _key, _resource_version in _applied.items():
+            if _key not in _checked:
+                self.kiali_client.wait_istio_config_validation(
+                    namespace=_key[2], object_type=_key[0], object_name=_key[1],
+                    resource_version=_resource_version, stable_polls=1)
+        for _key in _checked:
+            self.kiali_client.wait_istio_config_validation(
+                namespace=_key[2], object_type=_key[0], object_name=_key[1],
+                resource_version=_applied.get(_key))
 
     def _istio_config_delete(self, yaml_file, namespace):
-        oc_delete(yaml_file=yaml_file,
-                  namespace=namespace)
+        if isinstance(self.openshift_client, OpenshiftExtendedClient):
+            self.openshift_client.delete_yaml(yaml_file, namespace=namespace)
+        else:
+            oc_delete(yaml_file=yaml_file,
+                      namespace=namespace)
+        self.kiali_client.invalidate_cache(namespace)
 
     def test_istio_objects(self, scenario, namespace=None,
                            config_validation_objects=[],
@@ -2487,7 +2465,8 @@ class ValidationsTest(object):
         yaml_file = get_yaml_path(self.objects_path, scenario)
 
         try:
-            self._istio_config_create(yaml_file, namespace=namespace)
+            self._wait_converged(self._istio_config_create(yaml_file, namespace=namespace),
+                                 config_validation_objects)
 
             for _object in config_validation_objects:
                 self._test_validation_errors(object_type=_object.object_type,
@@ -2512,7 +2491,7 @@ class ValidationsTest(object):
         yaml_file = get_yaml_path(self.objects_path, scenario)
 
         try:
-            self._istio_config_create(yaml_file, namespace=namespace)
+            self._wait_converged(self._istio_config_create(yaml_file, namespace=namespace))
 
             for _object in service_validation_objects:
                 service_details_rest = self.kiali_client.service_details(
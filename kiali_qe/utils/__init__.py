@@ -3,7 +3,6 @@ from dotmap import DotMap
 import operator
 import os
 from functools import reduce
-from kiali_qe.components.enums import IstioConfigValidation
 
 
 class MyDotMap(DotMap):
@@ -42,24 +41,7 @@ def dict_to_params(dictionary):
 def is_equal(object_a, object_b):
     if isinstance(object_a, list):
         if len(object_a) == len(object_b):
-            for item_a in object_a:
-                if isinstance(item_a, str) or isinstance(item_a, float)\
-                 or isinstance(item_a, int) or isinstance(item_a, bytes):
-                    if item_a not in object_b:
-                        return False
-                elif isinstance(item_a, dict):
-                    _is_in = False
-                    for item_b in object_b:
-                        if _cmp_dict(item_a, item_b):
-                            _is_in = True
-                            break
-                    if not _is_in:
-                        return False
-
-                else:
-                    if not item_a.is_in(object_b):
-                        return False
-            return True
+            return _match_items(object_a, object_b)
         else:
             return False
     elif isinstance(object_a, dict):
@@ -71,7 +53,74 @@ def _cmp_dict(a, b):
 
 
 def is_sublist(list_a, list_b):
-    return set(list_a).issubset(set(list_b))
+    return _match_items(list_a, list_b)
+
+
+_NO_FORM = object()
+
+
+def _canonical_form(item):
+    """ Returns canonical form of item, _NO_FORM when it has none """
+    if isinstance(item, (str, float, int, bytes)):
+        return item
+    if isinstance(item, dict):
+        try:
+            return frozenset(item.items())
+        except TypeError:
+            return _NO_FORM
+    if hasattr(item, 'canonical') and item.canonical() is not None:
+        return item.canonical()
+    return _NO_FORM
+
+
+def _neighbour_forms(item):
+    """ Returns list of canonical forms an item equal to given one can have """
+    _form = _canonical_form(item)
+    if _form is _NO_FORM:
+        return [_NO_FORM]
+    if hasattr(item, 'canonical_neighbours'):
+        return item.canonical_neighbours() + [_NO_FORM]
+    return [_form, _NO_FORM]
+
+
+def _cmp_items(item_a, item_b):
+    if isinstance(item_a, (str, float, int, bytes)):
+        return item_a == item_b
+    if isinstance(item_a, dict):
+        return _cmp_dict(item_a, item_b)
+    return item_a.is_equal(item_b)
+
+
+def _match_items(list_a, list_b):
+    """Returns True when each item of list_a is equal to other item of list_b.
+    list_b is bucketed by canonical form once, so each item of list_a is compared
+    only with items of its own form and with items without any form.
+    Items compared with tolerance (more neighbour forms) and matches of items without form,
+    whose is_equal may be tolerant as well, do not use up the matched item,
+    tolerance is not transitive and greedy pairing could fail on valid lists.
+    """
+    _buckets = {}
+    for _item in list_b:
+        _buckets.setdefault(_canonical_form(_item), []).append(_item)
+    for _item in list_a:
+        _forms = _neighbour_forms(_item)
+        _exact = len(_forms) <= 2  # own form and _NO_FORM
+        _found = False
+        for _form in _forms:
+            _bucket = _buckets.get(_form)
+            if not _bucket:
+                continue
+            for _index, _candidate in enumerate(_bucket):
+                if _cmp_items(_item, _candidate):
+                    if _exact and _form is not _NO_FORM:
+                        del _bucket[_index]
+                    _found = True
+                    break
+            if _found:
+                break
+        if not _found:
+            return False
+    return True
 
 
 def dict_contains(original_dict={}, given_list=[], contains_all=False):
@@ -111,6 +160,8 @@ def dict_contains(original_dict={}, given_list=[], contains_all=False):
 
 
 def get_validation(_valid, _not_valid, _warning):
+    # components import entities, which import this module
+    from kiali_qe.components.enums import IstioConfigValidation
     if _valid:
         return IstioConfigValidation.VALID
     elif _not_valid:
@@ -161,3 +212,8 @@ def remove_from_list(items_list, item_to_remove):
         items_list.remove(item_to_remove)
     except ValueError:
         pass
+
+
+def worker_id():
+    """ Returns pytest-xdist worker id, 'master' when tests are not distributed """
+    return os.environ.get('PYTEST_XDIST_WORKER', 'master')
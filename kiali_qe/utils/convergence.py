@@ -0,0 +1,49 @@
+import time
+
+from wait_for import TimedOutError
+
+from kiali_qe.utils.log import logger
+
+_NOT_POLLED = object()
+
+
+def wait_converged(func, condition=None, stable_polls=1, timeout=60,
+                   delay=0.2, max_delay=2.0, factor=2.0, message=None):
+    """Returns value of func once condition holds and the value is the same
+    in stable_polls consecutive polls, raises TimedOutError on timeout.
+    Polling backs off from delay to max_delay while the value does not change
+    and restarts from delay when it changes, so a catching up source is read often.
+    Args:
+        func: function without arguments returning the polled value
+        condition: function(value) returning True when value is acceptable, any value by default
+        stable_polls: number of consecutive polls returning the same acceptable value
+        timeout: seconds to wait
+        delay: first delay between polls in seconds
+        max_delay: maximal delay between polls in seconds
+        factor: delay multiplier of unchanged polls
+        message: description of the wait used in log and error
+    """
+    _start = time.monotonic()
+    _delay = delay
+    _last = _NOT_POLLED
+    _stable = 0
+    _polls = 0
+    while True:
+        _value = func()
+        _polls += 1
+        if condition is None or condition(_value):
+            _stable = _stable + 1 if _value == _last else 1
+        else:
+            _stable = 0
+        if _stable >= stable_polls:
+            logger.debug('Converged {} after {} polls in {:.2f}s'.format(
+                message or func, _polls, time.monotonic() - _start))
+            return _value
+        _delay = min(_delay * factor, max_delay) if _value == _last else delay
+        _last = _value
+        _left = timeout - (time.monotonic() - _start)
+        if _left <= 0:
+            raise TimedOutError(
+                'Could not converge {} in {}s after {} polls, last value: {}'.format(
+                    message or func, timeout, _polls, _value))
+        time.sleep(min(_delay, _left))
@@ -0,0 +1,172 @@
+import threading
+import time
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from wait_for import TimedOutError
+
+from kiali_qe.utils.log import logger
+
+
+def is_alive(driver):
+    """ Returns True when the WebDriver session answers a command """
+    try:
+        driver.current_url
+        return True
+    except Exception as e:
+        logger.warning('Web driver session is not alive: {}'.format(e))
+        return False
+
+
+def quit_quietly(driver):
+    """ Quits the WebDriver session, errors of already dead sessions are ignored """
+    try:
+        driver.quit()
+    except Exception as e:
+        logger.debug('Quitting web driver failed: {}'.format(e))
+
+
+class DriverPool(object):
+    """
+    Pool of WebDriver sessions of one test worker.
+    Sessions are created concurrently in background threads, spares of them ahead of demand,
+    so a test gets a ready session and a dead one is replaced without waiting for the grid.
+    Every spare holds a grid slot while it waits, keep_alive sends it a command periodically
+    so the grid does not close it as idle, a spare found dead is created again.
+
+    Args:
+        factory: function without arguments returning new ready to use driver
+        spares: number of sessions created ahead of demand
+        workers: maximal number of sessions created at once
+        health_check: function(driver) returning True when the session can be used
+        keep_alive: seconds between health checks of ready spares, None disables them
+    """
+
+    def __init__(self, factory, spares=1, workers=2, health_check=is_alive, keep_alive=None):
+        self.factory = factory
+        self.spares = max(int(spares or 0), 0)
+        self.health_check = health_check
+        self.keep_alive = keep_alive
+        self._executor = ThreadPoolExecutor(max_workers=max(int(workers or 1), 1))
+        self._pending = []
+        self._lock = threading.Lock()
+        # held while a session taken from _pending or still in it is checked
+        self._check_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._keep_alive_thread = None
+        self._closed = False
+        self.acquired = 0
+        self.replaced = 0
+
+    def __repr__(self):
+        return "{}(spares={}, pending={}, acquired={}, replaced={})".format(
+            type(self).__name__, self.spares, len(self._pending), self.acquired, self.replaced)
+
+    def _create(self):
+        _start = time.time()
+        _driver = self.factory()
+        if _driver is None:
+            raise RuntimeError('Web driver factory did not return a driver')
+        logger.debug('Web driver session created in background in {:.1f}s'.format(
+            time.time() - _start))
+        return _driver
+
+    def _fill(self, count):
+        """ Submits creation of sessions until count of them are pending """
+        with self._lock:
+            while not self._closed and len(self._pending) < count:
+                self._pending.append(self._executor.submit(self._create))
+
+    def start(self):
+        """ Starts creating the first session and the spares, returns the pool """
+        self._fill(1 + self.spares)
+        if self.keep_alive and self.spares and self._keep_alive_thread is None:
+            self._keep_alive_thread = threading.Thread(
+                target=self._keep_alive_loop, name='driver-pool-keep-alive', daemon=True)
+            self._keep_alive_thread.start()
+        return self
+
+    def _keep_alive_loop(self):
+        while not self._stopped.wait(self.keep_alive):
+            with self._lock:
+                _ready = [_future for _future in self._pending
+                          if _future.done() and _future.exception() is None]
+            for _future in _ready:
+                with self._check_lock:
+                    with self._lock:
+                        # acquired meanwhile, its user sends the commands now
+                        if _future not in self._pending:
+                            continue
+                    if self.health_check(_future.result()):
+                        continue
+                    with self._lock:
+                        if _future in self._pending:
+                            self._pending.remove(_future)
+                    quit_quietly(_future.result())
+                logger.info('Idle web driver session died, creating it again')
+                # the first session is still pending until acquired
+                self._fill(self.spares if self.acquired else 1 + self.spares)
+
+    def acquire(self, timeout=None):
+        """Returns healthy session, the earliest created one when more are ready.
+        Sessions which failed to be created or are dead are dropped and created again,
+        raises TimedOutError after timeout.
+        Args:
+            timeout: seconds to wait for a session, None waits without limit
+        """
+        _start = time.time()
+        while True:
+            self._fill(1)
+            with self._lock:
+                if self._closed:
+                    raise RuntimeError('{} is closed'.format(self))
+                _pending = list(self._pending)
+            _left = None if timeout is None else timeout - (time.time() - _start)
+            if _left is not None and _left <= 0:
+                raise TimedOutError('No web driver session in {}s from {}'.format(timeout, self))
+            _done, _ = wait(_pending, timeout=_left, return_when=FIRST_COMPLETED)
+            for _future in _pending:
+                if _future not in _done:
+                    continue
+                with self._lock:
+                    # keep alive already dropped it as dead
+                    if _future not in self._pending:
+                        continue
+                    self._pending.remove(_future)
+                if _future.exception() is not None:
+                    logger.warning('Web driver session not created: {}'.format(
+                        _future.exception()))
+                    continue
+                _driver = _future.result()
+                # spares may idle long enough for the grid to close them
+                with self._check_lock:
+                    _alive = self.health_check(_driver)
+                if not _alive:
+                    quit_quietly(_driver)
+                    continue
+                self.acquired += 1
+                self._fill(self.spares)
+                return _driver
+
+    def replace(self, driver):
+        """Returns healthy session in place of dead driver, which is quit.
+        Args:
+            driver: session which failed the health check
+        """
+        quit_quietly(driver)
+        self.replaced += 1
+        _driver = self.acquire()
+        logger.info('Web driver session replaced, {}'.format(self))
+        return _driver
+
+    def close(self):
+        """ Quits all spare sessions, sessions handed out are quit by their users """
+        self._stopped.set()
+        with self._lock:
+            self._closed = True
+            _pending = list(self._pending)
+            self._pending = []
+        for _future in _pending:
+            if not _future.cancel() and _future.exception() is None:
+                quit_quietly(_future.result())
+        self._executor.shutdown(wait=True)
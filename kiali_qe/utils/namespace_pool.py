@@ -0,0 +1,242 @@
+import errno
+import fcntl
+import hashlib
+import os
+import tempfile
+import time
+
+from wait_for import TimedOutError
+
+from kiali_qe.utils import worker_id
+from kiali_qe.utils.log import logger
+
+POOL_LOCK = 'pool.lock'
+
+
+class NamespacePoolError(Exception):
+    pass
+
+
+def default_lock_dir(key):
+    """Returns lock directory shared by all test runs of the host with the same key.
+    Args:
+        key: pool identity, e.g. Kiali hostname
+    """
+    return os.path.join(tempfile.gettempdir(), 'kiali-qe-namespaces-{}'.format(
+        hashlib.sha1(str(key).encode('utf-8')).hexdigest()[:12]))
+
+
+class NamespaceLease(object):
+    """
+    Namespace leased to one worker until released or until the worker exits,
+    exclusive lease or lease shared with other read only users.
+
+    Args:
+        namespace: leased namespace
+        lock_file: open lock file holding the lease
+        owner: description of the lease holder
+        shared: True for lease shared by read only users
+        created_from: length of the client created_configs at lease time,
+            None when not reset on release
+    """
+
+    def __init__(self, namespace, lock_file, owner, shared=False, created_from=None):
+        self.namespace = namespace
+        self.lock_file = lock_file
+        self.owner = owner
+        self.shared = shared
+        self.created_from = created_from
+        self.leased_at = time.time()
+
+    def __repr__(self):
+        return "{}({}, owner={}, {}, {})".format(
+            type(self).__name__, self.namespace, self.owner,
+            'shared' if self.shared else 'exclusive', 'released' if self.released else 'held')
+
+    @property
+    def released(self):
+        return self.lock_file is None
+
+
+class NamespacePool(object):
+    """
+    Pool of namespace clones base2, base3..., leased to parallel workers.
+    The base namespace itself is used by tests without lease and is never leased.
+    Leases are locks of files in lock_dir, so all pytest-xdist workers of the host
+    share the pool and the system releases the lease of a crashed worker.
+    Read only users share their namespace, users changing it lease it exclusively.
+    A lease is always of the requested namespace, the pool waits until it is free.
+    When template is set, exclusive lease of a busy namespace gets a clone created
+    from template instead, named above size up to max_size, which no test requests by name.
+
+    Args:
+        openshift_client: OpenshiftExtendedClient, KialiExtendedClient can not grow nor reset
+        base: namespace the clones are named by, base2, base3...
+        size: number of the existing namespaces base2 to base<size> tests request by name
+        max_size: pool grows up to base<max_size> when template is set
+        template: yaml file applied into created clones
+        lock_dir: directory of lease lock files
+        timeout: seconds to wait for a free namespace
+        delay: seconds between lease attempts
+        reset: delete istio configs created by openshift_client during exclusive lease on release
+    """
+
+    def __init__(self, openshift_client, base='bookinfo', size=3, max_size=None, template=None,
+                 lock_dir=None, timeout=600, delay=1.0, reset=True):
+        self.openshift_client = openshift_client
+        self.base = base
+        self.size = size
+        self.max_size = max(max_size or size, size)
+        self.template = template
+        self.lock_dir = lock_dir or default_lock_dir(base)
+        self.timeout = timeout
+        self.delay = delay
+        # only OpenshiftExtendedClient tracks created istio configs and deletes them
+        self.reset = reset and hasattr(openshift_client, 'created_configs')
+        self._existing = set()
+        os.makedirs(self.lock_dir, exist_ok=True)
+
+    def __repr__(self):
+        return "{}({}, size={}, max_size={}, lock_dir={})".format(
+            type(self).__name__, self.base, self.size, self.max_size, self.lock_dir)
+
+    def __contains__(self, namespace):
+        return namespace in self.names()
+
+    def names(self):
+        """ Returns names of pool namespaces tests request """
+        return ['{}{}'.format(self.base, _i) for _i in range(2, self.size + 1)]
+
+    def clone_names(self):
+        """ Returns names of clones the pool grows into, they may not exist yet """
+        return ['{}{}'.format(self.base, _i) for _i in range(self.size + 1, self.max_size + 1)]
+
+    def _exists(self, namespace):
+        # namespaces are not deleted during the run, existing ones are not checked again
+        if namespace not in self._existing and self.openshift_client.namespace_exists(namespace):
+            self._existing.add(namespace)
+        return namespace in self._existing
+
+    def _lock(self, namespace, owner, shared=False):
+        """ Returns open lock file of namespace when it can be leased, None when it is leased """
+        _file = open(os.path.join(self.lock_dir, '{}.lock'.format(namespace)), 'a+')
+        try:
+            fcntl.flock(_file, (fcntl.LOCK_SH if shared else fcntl.LOCK_EX) | fcntl.LOCK_NB)
+        except OSError as e:
+            _file.close()
+            if e.errno in (errno.EAGAIN, errno.EACCES):
+                return None
+            raise
+        if not shared:
+            # holder is written for debugging only, the lock is what counts
+            _file.seek(0)
+            _file.truncate()
+            _file.write('{} {}\n'.format(owner, os.getpid()))
+            _file.flush()
+        return _file
+
+    def _lease(self, namespace, lock_file, owner, shared=False):
+        _created_from = None
+        if self.reset and not shared:
+            _created_from = len(self.openshift_client.created_configs)
+        _lease = NamespaceLease(namespace, lock_file, owner, shared, _created_from)
+        logger.debug('Leased {}'.format(_lease))
+        return _lease
+
+    def _try_lease(self, namespaces, owner, shared=False):
+        for _namespace in namespaces:
+            if not self._exists(_namespace):
+                continue
+            _file = self._lock(_namespace, owner, shared)
+            if _file is not None:
+                return self._lease(_namespace, _file, owner, shared)
+        return None
+
+    def _grow(self, owner):
+        """ Returns lease of newly created clone, None when the pool can not grow """
+        if not self.template or not hasattr(self.openshift_client, 'apply_yaml'):
+            return None
+        # one worker at a time picks and creates the next clone
+        with open(os.path.join(self.lock_dir, POOL_LOCK), 'a+') as _pool_lock:
+            fcntl.flock(_pool_lock, fcntl.LOCK_EX)
+            for _namespace in self.clone_names():
+                if self._exists(_namespace):
+                    continue
+                _file = self._lock(_namespace, owner)
+                if _file is None:
+                    continue
+                try:
+                    self._clone(_namespace)
+                except Exception:
+                    _file.close()
+                    raise
+                self._existing.add(_namespace)
+                return self._lease(_namespace, _file, owner)
+        return None
+
+    def _clone(self, namespace):
+        logger.info('Creating namespace {} from {}'.format(namespace, self.template))
+        _results = self.openshift_client.create_namespace(
+            namespace, labels=self.openshift_client.namespace_labels(self.base))
+        _results.extend(self.openshift_client.apply_yaml(self.template, namespace=namespace))
+        _failed = [_result for _result in _results if not _result.ok]
+        if _failed:
+            raise NamespacePoolError('Namespace {} not created: {}'.format(namespace, _failed))
+
+    def lease(self, namespace, owner=None, shared=False):
+        """Returns NamespaceLease of namespace, waits until it is free.
+        Shared lease is free unless the namespace is leased exclusively.
+        Exclusive lease of busy namespace gets a free clone when the pool can grow,
+        raises TimedOutError after timeout.
+        Args:
+            namespace: pool namespace to lease
+            owner: description of the lease holder, e.g. test name
+            shared: lease for read only use, shared with other read only users
+        """
+        if namespace not in self:
+            raise NamespacePoolError('{} is not in {}'.format(namespace, self))
+        _owner = '{}:{}'.format(worker_id(), owner) if owner else worker_id()
+        _start = time.time()
+        while True:
+            _lease = self._try_lease([namespace], _owner, shared)
+            if _lease is None and not shared:
+                # clones are only created from template, no other test uses them
+                _lease = self._try_lease(self.clone_names(), _owner) or self._grow(_owner)
+                if _lease is not None:
+                    logger.debug('{} is leased by other worker, using clone {}'.format(
+                        namespace, _lease.namespace))
+            if _lease is not None:
+                return _lease
+            if time.time() - _start > self.timeout:
+                raise TimedOutError('{} not free in {} after {}s'.format(
+                    namespace, self, self.timeout))
+            time.sleep(self.delay)
+
+    def release(self, lease):
+        """Releases the lease. When reset is set, istio configs openshift_client created
+        in the namespace during exclusive lease and which still exist are deleted.
+        Configs of other users of the namespace are kept.
+        Args:
+            lease: NamespaceLease returned by lease
+        """
+        if lease.released:
+            return
+        try:
+            if lease.created_from is not None:
+                _keys = set(_key for _key in
+                            self.openshift_client.created_configs[lease.created_from:]
+                            if _key[2] == lease.namespace)
+                _created = []
+                if _keys:
+                    _created = [_config for _config in self.openshift_client.istio_config_list(
+                        namespaces=[lease.namespace])
+                        if (_config.object_type, _config.name, _config.namespace) in _keys]
+                if _created:
+                    logger.debug('Resetting {}, deleting {}'.format(lease.namespace, _created))
+                    self.openshift_client.delete_istio_configs(_created)
+        finally:
+            # closing the file releases the lock
+            lease.lock_file.close()
+            lease.lock_file = None
+            logger.debug('Released {} after {:.1f}s'.format(
+                lease, time.time() - lease.leased_at))
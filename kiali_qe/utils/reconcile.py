@@ -0,0 +1,160 @@
+from collections import OrderedDict
+
+
+def entity_key(item, typed=True):
+    """Returns canonical (name, namespace, type) key of list page entity.
+    Args:
+        item: entity with name and namespace, type is taken from object_type or workload_type
+        typed: when False type is left out of the key, for sources which name types differently
+    """
+    _type = None
+    if typed:
+        _type = getattr(item, 'object_type', None) or getattr(item, 'workload_type', None)
+    return (item.name, getattr(item, 'namespace', None), _type)
+
+
+def untyped_key(item):
+    return entity_key(item, typed=False)
+
+
+def _index(items, key):
+    _buckets = OrderedDict()
+    for _item in items:
+        _buckets.setdefault(key(_item), []).append(_item)
+    return _buckets
+
+
+def _diff_fields(left, right, fields):
+    return [_f for _f in fields if getattr(left, _f, None) != getattr(right, _f, None)]
+
+
+class ReconcileResult(object):
+    """
+    Diff of two item sources joined on canonical key.
+
+    Args:
+        left_name: name of the expected source, e.g. 'UI'
+        right_name: name of the compared source, e.g. 'REST'
+    """
+
+    def __init__(self, left_name, right_name):
+        self.left_name = left_name
+        self.right_name = right_name
+        self.matched = []
+        self.missing = []
+        self.extra = []
+        self.mismatches = []
+
+    def __repr__(self):
+        return "{}({}/{}, matched={}, missing={}, extra={}, mismatches={})".format(
+            type(self).__name__, self.left_name, self.right_name, len(self.matched),
+            len(self.missing), len(self.extra), len(self.mismatches))
+
+    def is_equal(self, allow_extra=False):
+        """Returns True when there is no missing and mismatching item.
+        Args:
+            allow_extra: do not count items found only in right source as difference
+        """
+        return not self.missing and not self.mismatches and (allow_extra or not self.extra)
+
+    def report(self, allow_extra=False):
+        """ Returns printable list of all differences, one per line """
+        _lines = []
+        for _item in self.missing:
+            _lines.append('{} not found in {}: {}'.format(
+                self.left_name, self.right_name, _item))
+        for _left, _right, _fields in self.mismatches:
+            _lines.append('{} and {} differ{}: {} != {}'.format(
+                self.left_name, self.right_name,
+                ' on {}'.format(', '.join(_fields)) if _fields else '', _left, _right))
+        if not allow_extra:
+            for _item in self.extra:
+                _lines.append('{} not found in {}: {}'.format(
+                    self.right_name, self.left_name, _item))
+        return '\n'.join(_lines)
+
+
+def reconcile(left, right, compare=None, fields=(), key=entity_key,
+              left_name='UI', right_name='REST'):
+    """Joins two item lists on key in linear time and returns ReconcileResult.
+    Items sharing a key are paired by compare first, the leftovers of a key are mismatches.
+    Args:
+        left: expected items
+        right: compared items
+        compare: function(left_item, right_item) returning True on match, default is ==
+        fields: attribute names reported on mismatch
+        key: function returning hashable key of item
+        left_name: name of left source used in report
+        right_name: name of right source used in report
+    """
+    if compare is None:
+        compare = (lambda _l, _r: _l == _r)
+    _result = ReconcileResult(left_name, right_name)
+    _right = _index(right, key)
+    for _key, _items in _index(left, key).items():
+        _candidates = _right.pop(_key, [])
+        _unmatched = []
+        for _item in _items:
+            for _index_c, _candidate in enumerate(_candidates):
+                if compare(_item, _candidate):
+                    _result.matched.append((_item, _candidates.pop(_index_c)))
+                    break
+            else:
+                _unmatched.append(_item)
+        for _item in _unmatched:
+            if _candidates:
+                _candidate = _candidates.pop(0)
+                _result.mismatches.append(
+                    (_item, _candidate, _diff_fields(_item, _candidate, fields)))
+            else:
+                _result.missing.append(_item)
+        _result.extra.extend(_candidates)
+    for _items in _right.values():
+        _result.extra.extend(_items)
+    return _result
+
+
+class ThreeWayDiff(object):
+    """
+    UI items reconciled against REST and OC items.
+
+    Args:
+        rest: ReconcileResult of UI and REST
+        oc: ReconcileResult of UI and OC
+        oc_allow_extra: OC lists more items than UI, e.g. without sidecar, do not report them
+    """
+
+    def __init__(self, rest, oc, oc_allow_extra=True):
+        self.rest = rest
+        self.oc = oc
+        self.oc_allow_extra = oc_allow_extra
+
+    def __repr__(self):
+        return "{}({}, {})".format(type(self).__name__, repr(self.rest), repr(self.oc))
+
+    def is_equal(self):
+        return self.rest.is_equal() and self.oc.is_equal(allow_extra=self.oc_allow_extra)
+
+    def report(self):
+        return '\n'.join([_r for _r in (self.rest.report(),
+                                        self.oc.report(allow_extra=self.oc_allow_extra)) if _r])
+
+
+def reconcile_sources(items_ui, items_rest, items_oc,
+                      rest_compare=None, oc_compare=None,
+                      rest_fields=(), oc_fields=(),
+                      rest_key=entity_key, oc_key=entity_key, oc_allow_extra=True):
+    """Returns ThreeWayDiff of UI items joined with REST and OC items.
+    By default UI is compared with REST by is_equal(advanced_check=True)
+    and with OC by is_equal(advanced_check=False).
+    """
+    if rest_compare is None:
+        rest_compare = (lambda _ui, _rest: _ui.is_equal(_rest, advanced_check=True))
+    if oc_compare is None:
+        oc_compare = (lambda _ui, _oc: _ui.is_equal(_oc, advanced_check=False))
+    return ThreeWayDiff(
+        rest=reconcile(items_ui, items_rest, compare=rest_compare, fields=rest_fields,
+                       key=rest_key, left_name='UI', right_name='REST'),
+        oc=reconcile(items_ui, items_oc, compare=oc_compare, fields=oc_fields,
+                     key=oc_key, left_name='UI', right_name='OC'),
+        oc_allow_extra=oc_allow_extra)
@@ -0,0 +1,147 @@
+import csv
+import json
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+PHASES = ('setup', 'call', 'teardown')
+
+# major steps of the page tests
+UI_SCRAPE = 'ui_scrape'
+REST_FETCH = 'rest_fetch'
+OC_FETCH = 'oc_fetch'
+COMPARISON = 'comparison'
+
+
+class TestTiming(object):
+    """
+    Durations of test phases and of steps inside the tests, in seconds.
+    Steps are recorded against the test started last, repeated steps are summed.
+    """
+
+    def __init__(self):
+        self.tests = OrderedDict()
+        self.current = None
+
+    def __repr__(self):
+        return "{}(tests={}, current={})".format(type(self).__name__, len(self.tests),
+                                                 self.current)
+
+    def _test(self, test):
+        if test not in self.tests:
+            self.tests[test] = {'phases': OrderedDict(), 'steps': OrderedDict()}
+        return self.tests[test]
+
+    def start(self, test):
+        """ Starts recording steps of the test """
+        self._test(test)
+        self.current = test
+
+    def stop(self):
+        self.current = None
+
+    def phase(self, test, phase, seconds):
+        """Records duration of test phase.
+        Args:
+            test: test name
+            phase: setup, call or teardown
+            seconds: duration of the phase
+        """
+        self._test(test)['phases'][phase] = seconds
+
+    def step(self, step, seconds):
+        """ Adds duration of the step to the current test, ignored outside of a test """
+        if self.current is None:
+            return
+        _steps = self._test(self.current)['steps']
+        _seconds, _count = _steps.get(step, (0.0, 0))
+        _steps[step] = (_seconds + seconds, _count + 1)
+
+    @contextmanager
+    def timed(self, step):
+        """ Records duration of the with block as the step of the current test """
+        _start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.step(step, time.perf_counter() - _start)
+
+    def total(self, test):
+        return sum(self.tests[test]['phases'].values())
+
+    def slowest_tests(self, count=10):
+        """ Returns list of (test, seconds) of count slowest tests, by sum of their phases """
+        return sorted(((_test, self.total(_test)) for _test in self.tests),
+                      key=lambda _item: _item[1], reverse=True)[:count]
+
+    def slowest_steps(self, count=10):
+        """ Returns list of (test, step, seconds, calls) of count slowest steps """
+        _steps = [(_test, _step, _seconds, _count)
+                  for _test, _timing in self.tests.items()
+                  for _step, (_seconds, _count) in _timing['steps'].items()]
+        return sorted(_steps, key=lambda _item: _item[2], reverse=True)[:count]
+
+    def step_totals(self):
+        """ Returns dict of step to (seconds, calls) summed over all tests """
+        _totals = OrderedDict()
+        for _timing in self.tests.values():
+            for _step, (_seconds, _count) in _timing['steps'].items():
+                _total_seconds, _total_count = _totals.get(_step, (0.0, 0))
+                _totals[_step] = (_total_seconds + _seconds, _total_count + _count)
+        return _totals
+
+    def save_json(self, path):
+        _tests = []
+        for _test, _timing in self.tests.items():
+            _tests.append({
+                'test': _test,
+                'total': round(self.total(_test), 6),
+                'phases': {_phase: round(_seconds, 6)
+                           for _phase, _seconds in _timing['phases'].items()},
+                'steps': {_step: {'seconds': round(_seconds, 6), 'calls': _count}
+                          for _step, (_seconds, _count) in _timing['steps'].items()}})
+        with open(path, 'w') as _file:
+            json.dump({'created': time.strftime('%Y-%m-%dT%H:%M:%S'), 'tests': _tests},
+                      _file, indent=2)
+
+    def save_csv(self, path):
+        """ Writes one row per phase and step: test, kind, name, seconds, calls """
+        with open(path, 'w', newline='') as _file:
+            _writer = csv.writer(_file)
+            _writer.writerow(['test', 'kind', 'name', 'seconds', 'calls'])
+            for _test, _timing in self.tests.items():
+                for _phase, _seconds in _timing['phases'].items():
+                    _writer.writerow([_test, 'phase', _phase, round(_seconds, 6), 1])
+                for _step, (_seconds, _count) in _timing['steps'].items():
+                    _writer.writerow([_test, 'step', _step, round(_seconds, 6), _count])
+
+    def summary(self, count=10):
+        """ Returns list of lines of count slowest tests and steps """
+        _lines = ['Slowest {} tests:'.format(count)]
+        for _test, _seconds in self.slowest_tests(count):
+            _phases = self.tests[_test]['phases']
+            _lines.append('{:>9.2f}s  {}  ({})'.format(_seconds, _test, ', '.join(
+                '{} {:.2f}s'.format(_phase, _phases[_phase])
+                for _phase in PHASES if _phase in _phases)))
+        _slowest_steps = self.slowest_steps(count)
+        if _slowest_steps:
+            _lines.append('Slowest {} steps:'.format(count))
+            for _test, _step, _seconds, _count in _slowest_steps:
+                _lines.append('{:>9.2f}s  {:<12} x{:<3} {}'.format(
+                    _seconds, _step, _count, _test))
+            _lines.append('Steps total: {}'.format(', '.join(
+                '{} {:.2f}s'.format(_step, _seconds)
+                for _step, (_seconds, _count) in self.step_totals().items())))
+        return _lines
+
+
+#: timing of this test process, filled by the LogExtraData plugin and timed blocks
+test_timing = TestTiming()
+
+
+def timed(step):
+    """Returns context manager recording duration of the with block as step of current test.
+    Args:
+        step: step name, e.g. UI_SCRAPE
+    """
+    return test_timing.timed(step)